@@ -6,20 +6,302 @@ Usuwanie i odtwarzanie struktury hurtowni danych z optymalizacjami
 
 import pyodbc
 import logging
-import os
-import sys
-from datetime import datetime, date, timedelta
-import pandas as pd
 from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+import queue
+import re
 from typing import List, Tuple, Optional
 import time
 
+# Własny pool połączeń w klasie - wyłącz wewnętrzny pooling ODBC.
+# Działa tylko, jeśli jest ustawione przed pierwszym pyodbc.connect.
+pyodbc.pooling = False
+
+# Dodatkowe atrybuty połączenia: większe pakiety TDS, MARS, nazwa aplikacji
+CONNECTION_STRING_EXTRAS = {
+    'Packet Size': '32767',
+    'MARS_Connection': 'Yes',
+    'APP': 'WarehouseBuilder',
+}
+
+# Listy tabel hurtowni - niemutowalne, współdzielone bez kopiowania między wątkami
+DIMENSION_TABLES = (
+    'dim_date', 'dim_time', 'dim_bidding_zone', 'dim_weather_zone',
+    'dim_generation_type', 'dim_weather_condition', 'dim_socioeconomic_profile'
+)
+
+SOURCE_TABLES = (
+    'src_entso_actual_load', 'src_entso_generation', 'src_entso_forecast',
+    'src_weather_data', 'src_climate_data', 'src_eurostat_integrated'
+)
+
+FACT_TABLES = ('fact_energy_weather',)
+
+# Domyślne rekordy wymiarów (ID=0 dla brakujących kluczy obcych): tabela, kolumny, wiersze
+DEFAULT_DIMENSION_ROWS = (
+    ('dim_date',
+     ('date_id', 'full_date', 'day_of_week', 'day_of_month', 'month', 'month_name', 'quarter', 'year', 'season', 'is_holiday', 'holiday_name', 'holiday_type', 'is_school_day', 'is_weekend'),
+     ((0, '1900-01-01', 'Unknown', 0, 0, 'Unknown', 0, 0, 'Unknown', 'No', 'None', 'None', 'No', 'No'),)),
+    ('dim_time',
+     ('time_id', 'hour', 'minute', 'day_period', 'is_peak_hour'),
+     ((0, 0, 0, 'Unknown', 'No'),)),
+    ('dim_bidding_zone',
+     ('bidding_zone_id', 'bidding_zone_code', 'bidding_zone_name', 'primary_country', 'secondary_countries', 'control_area', 'timezone', 'population', 'gdp_per_capita', 'energy_intensity', 'electricity_price_avg', 'year'),
+     ((0, 'UNKNOWN', 'Unknown', 'UNK', 'None', 'Unknown', 'UTC', 0, 0.0, 0.0, 0.0, 0),)),
+    ('dim_weather_zone',
+     ('weather_zone_id', 'weather_zone_name', 'bidding_zone_id', 'climate_zone', 'elevation_avg', 'coastal_proximity', 'urbanization_level'),
+     ((0, 'Unknown', 0, 'Unknown', 0.0, 'Unknown', 'Unknown'),)),
+    ('dim_generation_type',
+     ('generation_type_id', 'entso_code', 'generation_category', 'generation_type', 'is_intermittent', 'fuel_source'),
+     ((0, 'B20', 'Unknown', 'Unknown', 'No', 'Unknown'),)),
+    ('dim_weather_condition',
+     ('weather_condition_id', 'condition_type', 'condition_severity', 'is_extreme_weather', 'extreme_weather_type'),
+     ((0, 'Unknown', 'None', 'No', 'None'),)),
+    ('dim_socioeconomic_profile',
+     ('socioeconomic_profile_id', 'bidding_zone_code', 'country_code', 'country_name', 'year', 'avg_income_level', 'unemployment_rate', 'urbanization_rate', 'service_sector_percentage', 'industry_sector_percentage', 'energy_poverty_rate', 'residential_percentage', 'commercial_percentage', 'industrial_percentage', 'avg_household_size', 'primary_heating_type', 'population'),
+     ((0, 'UNKNOWN', 'UNK', 'Unknown', 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 'Unknown', 0),)),
+)
+
+# Granice adaptacyjnego rozmiaru batcha przy ładowaniu faktów
+TARGET_BATCH_BYTES = 8 * 1024 * 1024
+MIN_BATCH_SIZE = 1000
+MAX_BATCH_SIZE = 1048576
+
+# Minimalny batch trafiający do columnstore jako skompresowany rowgroup (mniejsze idą do delta store)
+COLUMNSTORE_MIN_BATCH_SIZE = 102400
+
+# Kolumny kluczy obcych tabeli faktów (NULL -> rekord domyślny ID=0)
+FACT_FK_COLUMNS = (
+    'date_id', 'time_id', 'bidding_zone_id', 'weather_zone_id',
+    'generation_type_id', 'weather_condition_id', 'socioeconomic_profile_id'
+)
+
+# Kolejność usuwania: fakty, wymiary, źródła
+DROP_ORDER = FACT_TABLES + DIMENSION_TABLES + SOURCE_TABLES
+ALL_TABLES = frozenset(DROP_ORDER)
+
+# DDL tabel wymiarowych i źródłowych - budowane raz przy imporcie
+_DIM_DDL = (
+    ('dim_date', """
+        CREATE TABLE dim_date (
+            date_id INT IDENTITY(0,1) PRIMARY KEY,
+            full_date DATE NOT NULL,
+            day_of_week VARCHAR(10),
+            day_of_month INT,
+            month INT,
+            month_name VARCHAR(20),
+            quarter INT,
+            year INT,
+            season VARCHAR(20),
+            is_holiday VARCHAR(3),
+            holiday_name VARCHAR(100),
+            holiday_type VARCHAR(50),
+            is_school_day VARCHAR(3),
+            is_weekend VARCHAR(3),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """),
+    ('dim_time', """
+        CREATE TABLE dim_time (
+            time_id INT IDENTITY(0,1) PRIMARY KEY,
+            hour INT,
+            minute INT,
+            day_period VARCHAR(10),
+            is_peak_hour VARCHAR(3),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """),
+    ('dim_bidding_zone', """
+        CREATE TABLE dim_bidding_zone (
+            bidding_zone_id INT IDENTITY(0,1) PRIMARY KEY,
+            bidding_zone_code VARCHAR(50),
+            bidding_zone_name VARCHAR(100),
+            primary_country VARCHAR(50),
+            secondary_countries VARCHAR(100),
+            control_area VARCHAR(50),
+            timezone VARCHAR(50),
+            population BIGINT,
+            gdp_per_capita DECIMAL(15, 2),
+            energy_intensity DECIMAL(15, 2),
+            electricity_price_avg DECIMAL(10, 2),
+            year INT,
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """),
+    ('dim_weather_zone', """
+        CREATE TABLE dim_weather_zone (
+            weather_zone_id INT IDENTITY(0,1) PRIMARY KEY,
+            weather_zone_name VARCHAR(100),
+            bidding_zone_id INT,
+            climate_zone VARCHAR(50),
+            elevation_avg DECIMAL(8, 2),
+            coastal_proximity VARCHAR(20),
+            urbanization_level VARCHAR(20),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """),
+    ('dim_generation_type', """
+        CREATE TABLE dim_generation_type (
+            generation_type_id INT IDENTITY(0,1) PRIMARY KEY,
+            entso_code VARCHAR(5),
+            generation_category VARCHAR(50),
+            generation_type VARCHAR(50),
+            is_intermittent VARCHAR(3),
+            fuel_source VARCHAR(50),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """),
+    ('dim_weather_condition', """
+        CREATE TABLE dim_weather_condition (
+            weather_condition_id INT IDENTITY(0,1) PRIMARY KEY,
+            condition_type VARCHAR(30),
+            condition_severity VARCHAR(20),
+            is_extreme_weather VARCHAR(3),
+            extreme_weather_type VARCHAR(30),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """),
+    ('dim_socioeconomic_profile', """
+        CREATE TABLE dim_socioeconomic_profile (
+            socioeconomic_profile_id INT IDENTITY(0,1) PRIMARY KEY,
+            bidding_zone_code VARCHAR(50),
+            country_code VARCHAR(5),
+            country_name VARCHAR(100),
+            year INT,
+            avg_income_level DECIMAL(12, 2),
+            unemployment_rate DECIMAL(5, 2),
+            urbanization_rate DECIMAL(5, 2),
+            service_sector_percentage DECIMAL(5, 2),
+            industry_sector_percentage DECIMAL(5, 2),
+            energy_poverty_rate DECIMAL(5, 2),
+            residential_percentage DECIMAL(5, 2),
+            commercial_percentage DECIMAL(5, 2),
+            industrial_percentage DECIMAL(5, 2),
+            avg_household_size DECIMAL(5, 2),
+            primary_heating_type VARCHAR(50),
+            population BIGINT,
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """),
+)
+
+_SRC_DDL = (
+    ('src_entso_actual_load', """
+        CREATE TABLE src_entso_actual_load (
+            entso_actual_load_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+            timestamp DATETIME2,
+            quantity DECIMAL(15, 2),
+            bidding_zone VARCHAR(50),
+            zone_code VARCHAR(50),
+            country VARCHAR(5),
+            data_type VARCHAR(20),
+            created_at DATETIME2 DEFAULT GETDATE()
+        ) WITH (DATA_COMPRESSION = PAGE)
+    """),
+    ('src_entso_generation', """
+        CREATE TABLE src_entso_generation (
+            entso_generation_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+            timestamp DATETIME2,
+            quantity DECIMAL(15, 2),
+            bidding_zone VARCHAR(50),
+            zone_code VARCHAR(50),
+            country VARCHAR(5),
+            generation_type VARCHAR(5),
+            data_type VARCHAR(20),
+            created_at DATETIME2 DEFAULT GETDATE()
+        ) WITH (DATA_COMPRESSION = PAGE)
+    """),
+    ('src_entso_forecast', """
+        CREATE TABLE src_entso_forecast (
+            entso_forecast_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+            timestamp DATETIME2,
+            quantity DECIMAL(15, 2),
+            bidding_zone VARCHAR(50),
+            zone_code VARCHAR(50),
+            country VARCHAR(5),
+            data_type VARCHAR(20),
+            created_at DATETIME2 DEFAULT GETDATE()
+        ) WITH (DATA_COMPRESSION = PAGE)
+    """),
+    ('src_weather_data', """
+        CREATE TABLE src_weather_data (
+            weather_data_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+            timestamp DATETIME2,
+            subzone_code VARCHAR(10),
+            subzone_name VARCHAR(100),
+            country_code VARCHAR(5),
+            zone_name VARCHAR(100),
+            temperature_avg REAL,
+            temperature_min REAL,
+            temperature_max REAL,
+            humidity REAL,
+            precipitation REAL,
+            wind_speed REAL,
+            wind_direction INT,
+            air_pressure REAL,
+            cloud_cover REAL,
+            solar_radiation REAL,
+            weather_condition VARCHAR(30),
+            latitude DECIMAL(10, 6),
+            longitude DECIMAL(10, 6),
+            created_at DATETIME2 DEFAULT GETDATE()
+        ) WITH (DATA_COMPRESSION = PAGE)
+    """),
+    ('src_climate_data', """
+        CREATE TABLE src_climate_data (
+            climate_data_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+            date DATE,
+            subzone_code VARCHAR(10),
+            subzone_name VARCHAR(100),
+            country_code VARCHAR(5),
+            zone_name VARCHAR(100),
+            heating_degree_days REAL,
+            cooling_degree_days REAL,
+            temperature_mean REAL,
+            temperature_min REAL,
+            temperature_max REAL,
+            latitude DECIMAL(10, 6),
+            longitude DECIMAL(10, 6),
+            created_at DATETIME2 DEFAULT GETDATE()
+        ) WITH (DATA_COMPRESSION = PAGE)
+    """),
+    ('src_eurostat_integrated', """
+        CREATE TABLE src_eurostat_integrated (
+            eurostat_integrated_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+            country_code VARCHAR(5),
+            country_name VARCHAR(100),
+            year INT,
+            population BIGINT,
+            gdp_per_capita DECIMAL(15, 2),
+            electricity_price_avg DECIMAL(10, 2),
+            energy_intensity DECIMAL(15, 2),
+            unemployment_rate DECIMAL(5, 2),
+            poverty_by_degree_of_urbanization DECIMAL(5, 2),
+            service_sector_percentage DECIMAL(5, 2),
+            industry_sector_percentage DECIMAL(5, 2),
+            avg_household_size DECIMAL(5, 2),
+            energy_poverty_rate DECIMAL(5, 2),
+            primary_heating_type VARCHAR(50),
+            data_quality_score INT,
+            created_at DATETIME2 DEFAULT GETDATE()
+        ) WITH (DATA_COMPRESSION = PAGE)
+    """),
+)
+
+# Te same DDL jako jeden batch T-SQL (jeden round-trip)
+_DIM_DDL_BATCH = ";\n".join(ddl for _, ddl in _DIM_DDL)
+_SRC_DDL_BATCH = ";\n".join(ddl for _, ddl in _SRC_DDL)
+
 class OptimizedWarehouseBuilder:
     """Zoptymalizowana klasa do przebudowy hurtowni danych"""
     
-    def __init__(self, connection_string: str, max_connections: int = 5, batch_size: int = 10000):
+    dimension_tables = DIMENSION_TABLES
+    source_tables = SOURCE_TABLES
+    fact_tables = FACT_TABLES
+    all_tables = DROP_ORDER
+    
+    def __init__(self, connection_string: str, max_connections: int = 5, batch_size: int = 10000,
+                 commit_size: int = 10, debug_stats: bool = False):
         """
         Inicjalizacja z pool połączeń - bez timeout dla długich operacji
         
@@ -27,37 +309,53 @@ class OptimizedWarehouseBuilder:
             connection_string: String połączenia z bazą danych
             max_connections: Maksymalna liczba połączeń w pool
             batch_size: Rozmiar batch dla operacji bulk
+            commit_size: Liczba batchy na jeden commit przy ładowaniu faktów
+            debug_stats: Logowanie statystyk serwera (SET STATISTICS IO/TIME) dla ładowania
         """
-        self.connection_string = connection_string
+        self.connection_string = self._extend_connection_string(connection_string)
         self.max_connections = max_connections
         self.batch_size = batch_size
-        self._connection_pool = []
-        self._pool_lock = threading.Lock()
+        self.commit_size = max(1, commit_size)
+        self.debug_stats = debug_stats
+        self._connection_pool = queue.SimpleQueue()
+        self._staging_stats = None
+        self._common_cols = None
+        self._identity_columns = None
+        self._load_sql = None
         
-        # Konfiguracja logowania
-        logging.basicConfig(level=logging.INFO)
+        # Konfiguracja logowania - tylko jeśli aplikacja nie skonfigurowała jej wcześniej
+        if not logging.getLogger().handlers:
+            logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
         self.logger.info("Initialized WarehouseBuilder - No timeouts (unlimited execution time)")
         
-        # Optymalizowane listy tabel
-        self.dimension_tables = [
-            'dim_date', 'dim_time', 'dim_bidding_zone', 'dim_weather_zone',
-            'dim_generation_type', 'dim_weather_condition', 'dim_socioeconomic_profile'
-        ]
-        
-        self.source_tables = [
-            'src_entso_actual_load', 'src_entso_generation', 'src_entso_forecast',
-            'src_weather_data', 'src_climate_data', 'src_eurostat_integrated'
-        ]
-        
-        self.fact_tables = ['fact_energy_weather']
-        
-        self.all_tables = self.fact_tables + self.dimension_tables + self.source_tables
-        
         # Pre-compiled SQL statements for better performance
         self._prepare_sql_statements()
     
+    @staticmethod
+    def _extend_connection_string(connection_string: str) -> str:
+        """
+        Uzupełnienie connection string o atrybuty wydajnościowe, jeśli ich brak
+        
+        Args:
+            connection_string: Oryginalny string połączenia
+            
+        Returns:
+            String połączenia z dodanymi atrybutami
+        """
+        present = {
+            part.split('=', 1)[0].strip().lower()
+            for part in connection_string.split(';') if '=' in part
+        }
+        extras = [
+            f"{key}={value}" for key, value in CONNECTION_STRING_EXTRAS.items()
+            if key.lower() not in present
+        ]
+        if not extras:
+            return connection_string
+        return connection_string.rstrip(';') + ';' + ';'.join(extras) + ';'
+    
     def _prepare_sql_statements(self):
         """Przygotowanie często używanych zapytań SQL"""
         self.sql_statements = {
@@ -65,49 +363,78 @@ class OptimizedWarehouseBuilder:
             'get_table_count': "SELECT COUNT(*) FROM {}",
             'drop_table': "IF OBJECT_ID('{}', 'U') IS NOT NULL DROP TABLE {}",
             'drop_foreign_key': "ALTER TABLE {} DROP CONSTRAINT {}",
-            'get_common_columns': """
-                SELECT c1.COLUMN_NAME 
-                FROM INFORMATION_SCHEMA.COLUMNS c1
-                INNER JOIN INFORMATION_SCHEMA.COLUMNS c2 
-                    ON c1.COLUMN_NAME = c2.COLUMN_NAME
-                WHERE c1.TABLE_NAME = ? AND c2.TABLE_NAME = ?
-                AND c1.COLUMN_NAME NOT IN ('id', 'created_at')
-                AND c2.COLUMN_NAME != 'created_at'
-                AND c2.COLUMN_NAME NOT IN (
-                    SELECT COLUMN_NAME 
-                    FROM INFORMATION_SCHEMA.COLUMNS 
-                    WHERE TABLE_NAME = ? 
-                    AND COLUMNPROPERTY(OBJECT_ID(TABLE_SCHEMA + '.' + TABLE_NAME), COLUMN_NAME, 'IsIdentity') = 1
-                )
-            """,
-            'get_common_columns_fact': """
-                SELECT c1.COLUMN_NAME 
-                FROM INFORMATION_SCHEMA.COLUMNS c1
-                INNER JOIN INFORMATION_SCHEMA.COLUMNS c2 
-                    ON c1.COLUMN_NAME = c2.COLUMN_NAME
-                WHERE c1.TABLE_NAME = ? AND c2.TABLE_NAME = ?
-                AND c1.COLUMN_NAME NOT IN ('id', 'created_at')
-                AND c2.COLUMN_NAME != 'created_at'
-                AND c2.COLUMN_NAME != 'energy_weather_id'
+            'get_table_columns': """
+                SELECT 
+                    TABLE_NAME, 
+                    COLUMN_NAME,
+                    COLUMNPROPERTY(OBJECT_ID(TABLE_SCHEMA + '.' + TABLE_NAME), COLUMN_NAME, 'IsIdentity') AS is_identity
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_NAME IN ({})
+                ORDER BY TABLE_NAME, ORDINAL_POSITION
             """
         }
     
+    def _validate_table_name(self, table: str) -> str:
+        """
+        Sprawdzenie nazwy tabeli z allowlist przed wstawieniem do SQL
+        
+        Identyfikatorów nie da się przekazać jako parametry, więc każda
+        nazwa tabeli interpolowana do DDL musi pochodzić z ALL_TABLES.
+        
+        Args:
+            table: Nazwa tabeli
+            
+        Returns:
+            Zweryfikowana nazwa tabeli
+        """
+        if table not in ALL_TABLES:
+            raise ValueError(f"Unknown warehouse table: {table}")
+        return table
+    
+    @staticmethod
+    def _quote_identifier(name: str) -> str:
+        """Bezpieczne cytowanie identyfikatora SQL Server w nawiasach kwadratowych"""
+        return f"[{name.replace(']', ']]')}]"
+    
+    def _new_connection(self):
+        """Nowe połączenie skonfigurowane raz przy utworzeniu - bez timeout"""
+        conn = pyodbc.connect(self.connection_string)
+        conn.autocommit = False
+        conn.timeout = 0  # 0 = unlimited timeout
+        
+        # Ustawienie sesji raz na połączenie - ARITHABORT jak w SSMS (ten sam
+        # bucket planów w cache). NOCOUNT nie na poziomie sesji (cursor.rowcount
+        # zwracałby -1) - włączają go tylko batche, które nie czytają liczby wierszy
+        conn.execute("SET ARITHABORT ON")
+        return conn
+    
+    @staticmethod
+    def _cursor(conn):
+        """Kursor z włączonym fast_executemany - executemany wysyła tablice parametrów w jednym RPC"""
+        cursor = conn.cursor()
+        cursor.fast_executemany = True
+        return cursor
+    
     @contextmanager
-    def get_connection(self):
-        """Context manager dla pool połączeń - bez timeout"""
+    def get_connection(self, autocommit: bool = False):
+        """
+        Context manager dla pool połączeń - bez timeout
+        
+        Args:
+            autocommit: Tryb autocommit (np. dla niezależnych DDL bez transakcji)
+        """
         conn = None
         try:
-            with self._pool_lock:
-                if self._connection_pool:
-                    conn = self._connection_pool.pop()
-                    self.logger.debug(f"Reused connection from pool. Pool size: {len(self._connection_pool)}")
-                else:
-                    conn = pyodbc.connect(self.connection_string)
-                    self.logger.debug("Created new connection")
+            try:
+                conn = self._connection_pool.get_nowait()
+                self.logger.debug("Reused connection from pool. Pool size: %d", self._connection_pool.qsize())
+            except queue.Empty:
+                conn = self._new_connection()
+                self.logger.debug("Created new connection")
             
-            # Konfiguracja połączenia - BEZ timeout (unlimited)
-            conn.autocommit = False
-            conn.timeout = 0  # 0 = unlimited timeout
+            # Przełącz tryb tylko gdy różni się od obecnego (każda zmiana to SQLSetConnectAttr)
+            if conn.autocommit != autocommit:
+                conn.autocommit = autocommit
             
             yield conn
             
@@ -121,24 +448,76 @@ class OptimizedWarehouseBuilder:
         finally:
             if conn:
                 try:
-                    conn.commit()
-                    with self._pool_lock:
-                        if len(self._connection_pool) < self.max_connections:
-                            self._connection_pool.append(conn)
-                        else:
-                            conn.close()
+                    if not conn.autocommit:
+                        conn.commit()
+                    if self._connection_pool.qsize() < self.max_connections:
+                        self._connection_pool.put(conn)
+                    else:
+                        conn.close()
                 except:
                     conn.close()
     
+    def warm_up_pool(self):
+        """Równoległe otwarcie połączeń do pool - handshake TCP/auth nakłada się w czasie"""
+        missing = self.max_connections - self._connection_pool.qsize()
+        if missing <= 0:
+            return
+        
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            futures = [executor.submit(self._new_connection) for _ in range(missing)]
+            for future in as_completed(futures):
+                try:
+                    self._connection_pool.put(future.result())
+                except Exception as e:
+                    self.logger.warning(f"Could not pre-open pooled connection: {str(e)}")
+        
+        self.logger.debug("Connection pool warmed up. Pool size: %d", self._connection_pool.qsize())
+    
     def close_connection_pool(self):
         """Zamknięcie wszystkich połączeń w pool"""
-        with self._pool_lock:
-            for conn in self._connection_pool:
-                try:
-                    conn.close()
-                except:
-                    pass
-            self._connection_pool.clear()
+        while True:
+            try:
+                conn = self._connection_pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except:
+                pass
+    
+    def _exec_ddl(self, table_name: str, ddl: str):
+        """
+        Wykonanie pojedynczego DDL na połączeniu z pool (oddawanym po zadaniu)
+        
+        Args:
+            table_name: Nazwa tworzonej tabeli
+            ddl: Instrukcja CREATE TABLE
+        """
+        with self.get_connection() as conn:
+            cursor = self._cursor(conn)
+            self.logger.debug("Creating %s", table_name)
+            cursor.execute(ddl)
+    
+    def _execute_ddl(self, ddl_statements: tuple, ddl_batch: str):
+        """
+        Wykonanie niezależnych DDL - równolegle (każdy worker ma własne połączenie)
+        lub, przy pojedynczym połączeniu, jako jeden batch
+        
+        Args:
+            ddl_statements: Krotka par (nazwa_tabeli, DDL)
+            ddl_batch: Wszystkie DDL połączone w jeden batch T-SQL
+        """
+        if self.max_connections <= 1:
+            self._exec_ddl(', '.join(name for name, _ in ddl_statements), ddl_batch)
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_connections, len(ddl_statements))) as executor:
+            futures = [
+                executor.submit(self._exec_ddl, table_name, ddl)
+                for table_name, ddl in ddl_statements
+            ]
+            for future in as_completed(futures):
+                future.result()
     
     def drop_tables(self) -> bool:
         """
@@ -150,61 +529,61 @@ class OptimizedWarehouseBuilder:
         self.logger.info("Dropping existing tables (optimized)")
         
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            with self.get_connection(autocommit=True) as conn:
+                cursor = self._cursor(conn)
                 
-                # Najpierw spróbuj usunąć ograniczenia FK
+                # Najpierw ograniczenia FK, potem tabele - wszystko w jednym batchu DDL
                 self.logger.info("Attempting to drop foreign key constraints")
                 
-                try:
-                    # Uproszczone zapytanie FK z timeout handling
-                    cursor.execute("""
-                        SELECT 
-                            CONSTRAINT_NAME, 
-                            TABLE_NAME
-                        FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS 
-                        WHERE CONSTRAINT_TYPE = 'FOREIGN KEY'
-                        AND TABLE_NAME IN ('fact_energy_weather')
-                    """)
-                    
-                    foreign_keys = cursor.fetchall()
-                    
-                    # Usuń FK constraints
-                    for fk in foreign_keys:
-                        try:
-                            drop_fk_sql = f"ALTER TABLE {fk.TABLE_NAME} DROP CONSTRAINT {fk.CONSTRAINT_NAME}"
-                            cursor.execute(drop_fk_sql)
-                            self.logger.debug(f"Dropped FK constraint {fk.CONSTRAINT_NAME}")
-                        except Exception as fk_error:
-                            self.logger.warning(f"Could not drop FK {fk.CONSTRAINT_NAME}: {fk_error}")
-                    
-                    if foreign_keys:
-                        self.logger.info(f"Processed {len(foreign_keys)} foreign key constraints")
-                    else:
-                        self.logger.info("No foreign key constraints found")
-                        
-                except Exception as fk_error:
-                    self.logger.warning(f"Could not query/drop FK constraints: {fk_error}")
-                    self.logger.info("Proceeding with table drops anyway...")
+                cursor.execute("""
+                    SELECT 
+                        CONSTRAINT_NAME, 
+                        TABLE_NAME
+                    FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS 
+                    WHERE CONSTRAINT_TYPE = 'FOREIGN KEY'
+                    AND TABLE_NAME IN ('fact_energy_weather')
+                """)
+                foreign_keys = cursor.fetchall()
                 
-                # Usuń tabele w odpowiedniej kolejności z lepszym error handling
-                drop_order = self.fact_tables + self.dimension_tables + self.source_tables
-                dropped_count = 0
+                if foreign_keys:
+                    self.logger.info(f"Processing {len(foreign_keys)} foreign key constraints")
+                else:
+                    self.logger.info("No foreign key constraints found")
+                
+                # Usuń tabele w odpowiedniej kolejności
+                drop_order = DROP_ORDER
                 
+                # Jedno zapytanie o istniejące tabele zamiast osobnego per tabela
+                qmarks = ",".join("?" * len(drop_order))
+                cursor.execute(f"SELECT name FROM sys.tables WHERE name IN ({qmarks})", *drop_order)
+                existing = {row.name for row in cursor.fetchall()}
+                
+                tables_to_drop = [table for table in drop_order if table in existing]
                 for table in drop_order:
+                    if table not in existing:
+                        self.logger.debug("Table %s does not exist, skipping", table)
+                
+                # ALTER TABLE ... DROP CONSTRAINT i DROP TABLE w jednym batchu - jeden round trip;
+                # błąd przechodzi do _alternative_drop_tables
+                ddl = [
+                    self.sql_statements['drop_foreign_key'].format(
+                        self._validate_table_name(fk.TABLE_NAME),
+                        self._quote_identifier(fk.CONSTRAINT_NAME)
+                    )
+                    for fk in foreign_keys
+                ] + [f"DROP TABLE [{table}]" for table in tables_to_drop]
+                
+                dropped_count = 0
+                if ddl:
                     try:
-                        # Sprawdź czy tabela istnieje przed usunięciem
-                        cursor.execute(f"SELECT 1 FROM sys.tables WHERE name = '{table}'")
-                        if cursor.fetchone():
-                            cursor.execute(f"DROP TABLE {table}")
-                            dropped_count += 1
-                            self.logger.debug(f"Dropped table {table}")
-                        else:
-                            self.logger.debug(f"Table {table} does not exist, skipping")
+                        cursor.execute(";\n".join(ddl))
+                        dropped_count = len(tables_to_drop)
+                        self.logger.debug("Dropped FK constraints: %s", ', '.join(fk.CONSTRAINT_NAME for fk in foreign_keys))
+                        self.logger.debug("Dropped tables: %s", ', '.join(tables_to_drop))
                     except Exception as table_error:
-                        self.logger.warning(f"Could not drop table {table}: {table_error}")
+                        self.logger.warning(f"Could not drop constraints and tables in batch: {table_error}")
+                        raise
                 
-                conn.commit()
                 self.logger.info(f"Successfully processed {dropped_count} tables")
                 return True
                 
@@ -224,49 +603,40 @@ class OptimizedWarehouseBuilder:
         
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
+                cursor = self._cursor(conn)
                 
-                # Najpierw spróbuj usunąć wszystkie FK constraints bez sprawdzania
-                fact_table = 'fact_energy_weather'
-                potential_constraints = [
-                    'FK_fact_date', 'FK_fact_time', 'FK_fact_bidding_zone', 
-                    'FK_fact_weather_zone', 'FK_fact_generation_type', 
-                    'FK_fact_weather_condition', 'FK_fact_socioeconomic_profile'
-                ]
+                qmarks = ",".join("?" * len(self.all_tables))
                 
-                for constraint_name in potential_constraints:
-                    try:
-                        cursor.execute(f"ALTER TABLE {fact_table} DROP CONSTRAINT {constraint_name}")
-                        self.logger.debug(f"Dropped constraint {constraint_name}")
-                    except:
-                        pass  # Ignore if constraint doesn't exist
+                # Jedno zapytanie o faktycznie istniejące FK zamiast zgadywania nazw
+                cursor.execute(f"""
+                    SELECT fk.name AS constraint_name, t.name AS table_name
+                    FROM sys.foreign_keys fk
+                    JOIN sys.tables t ON fk.parent_object_id = t.object_id
+                    WHERE t.name IN ({qmarks})
+                """, *self.all_tables)
+                foreign_keys = cursor.fetchall()
+                
+                if foreign_keys:
+                    drop_fk_sql = ";\n".join(
+                        self.sql_statements['drop_foreign_key'].format(
+                            self._validate_table_name(fk.table_name),
+                            self._quote_identifier(fk.constraint_name)
+                        )
+                        for fk in foreign_keys
+                    )
+                    cursor.execute(drop_fk_sql)
+                    self.logger.debug("Dropped %d foreign key constraints", len(foreign_keys))
                 
-                # Usuń tabele po jednej z IGNORE błędów
-                all_potential_tables = [
-                    'fact_energy_weather',
-                    'dim_date', 'dim_time', 'dim_bidding_zone', 'dim_weather_zone',
-                    'dim_generation_type', 'dim_weather_condition', 'dim_socioeconomic_profile',
-                    'src_entso_actual_load', 'src_entso_generation', 'src_entso_forecast',
-                    'src_weather_data', 'src_climate_data', 'src_eurostat_integrated'
-                ]
+                # Jedno zapytanie o istniejące tabele, potem jeden batch DROP
+                cursor.execute(f"SELECT name FROM sys.tables WHERE name IN ({qmarks})", *self.all_tables)
+                existing = {row.name for row in cursor.fetchall()}
+                tables_to_drop = [table for table in self.all_tables if table in existing]
                 
                 dropped_count = 0
-                for table in all_potential_tables:
-                    try:
-                        cursor.execute(f"DROP TABLE IF EXISTS {table}")
-                        dropped_count += 1
-                        self.logger.debug(f"Dropped table {table}")
-                    except Exception as e:
-                        # SQL Server może nie obsługiwać IF EXISTS, spróbuj bez tego
-                        try:
-                            cursor.execute(f"""
-                                IF OBJECT_ID('{table}', 'U') IS NOT NULL
-                                    DROP TABLE {table}
-                            """)
-                            dropped_count += 1
-                            self.logger.debug(f"Dropped table {table} (fallback method)")
-                        except:
-                            self.logger.debug(f"Table {table} could not be dropped or doesn't exist")
+                if tables_to_drop:
+                    cursor.execute(";\n".join(f"DROP TABLE [{table}]" for table in tables_to_drop))
+                    dropped_count = len(tables_to_drop)
+                    self.logger.debug("Dropped tables: %s", tables_to_drop)
                 
                 conn.commit()
                 self.logger.info(f"Alternative drop completed, processed {dropped_count} tables")
@@ -286,123 +656,10 @@ class OptimizedWarehouseBuilder:
         """
         self.logger.info("Creating dimension tables (optimized)")
         
-        # DDL statements organized for batch execution
-        ddl_statements = {
-            'dim_date': """
-                CREATE TABLE dim_date (
-                    date_id INT IDENTITY(0,1) PRIMARY KEY,
-                    full_date DATE NOT NULL,
-                    day_of_week VARCHAR(10),
-                    day_of_month INT,
-                    month INT,
-                    month_name VARCHAR(20),
-                    quarter INT,
-                    year INT,
-                    season VARCHAR(20),
-                    is_holiday VARCHAR(3),
-                    holiday_name VARCHAR(100),
-                    holiday_type VARCHAR(50),
-                    is_school_day VARCHAR(3),
-                    is_weekend VARCHAR(3),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'dim_time': """
-                CREATE TABLE dim_time (
-                    time_id INT IDENTITY(0,1) PRIMARY KEY,
-                    hour INT,
-                    minute INT,
-                    day_period VARCHAR(10),
-                    is_peak_hour VARCHAR(3),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'dim_bidding_zone': """
-                CREATE TABLE dim_bidding_zone (
-                    bidding_zone_id INT IDENTITY(0,1) PRIMARY KEY,
-                    bidding_zone_code VARCHAR(50),
-                    bidding_zone_name VARCHAR(100),
-                    primary_country VARCHAR(50),
-                    secondary_countries VARCHAR(100),
-                    control_area VARCHAR(50),
-                    timezone VARCHAR(50),
-                    population BIGINT,
-                    gdp_per_capita DECIMAL(15, 2),
-                    energy_intensity DECIMAL(15, 2),
-                    electricity_price_avg DECIMAL(10, 2),
-                    year INT,
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'dim_weather_zone': """
-                CREATE TABLE dim_weather_zone (
-                    weather_zone_id INT IDENTITY(0,1) PRIMARY KEY,
-                    weather_zone_name VARCHAR(100),
-                    bidding_zone_id INT,
-                    climate_zone VARCHAR(50),
-                    elevation_avg DECIMAL(8, 2),
-                    coastal_proximity VARCHAR(20),
-                    urbanization_level VARCHAR(20),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'dim_generation_type': """
-                CREATE TABLE dim_generation_type (
-                    generation_type_id INT IDENTITY(0,1) PRIMARY KEY,
-                    entso_code VARCHAR(5),
-                    generation_category VARCHAR(50),
-                    generation_type VARCHAR(50),
-                    is_intermittent VARCHAR(3),
-                    fuel_source VARCHAR(50),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'dim_weather_condition': """
-                CREATE TABLE dim_weather_condition (
-                    weather_condition_id INT IDENTITY(0,1) PRIMARY KEY,
-                    condition_type VARCHAR(30),
-                    condition_severity VARCHAR(20),
-                    is_extreme_weather VARCHAR(3),
-                    extreme_weather_type VARCHAR(30),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'dim_socioeconomic_profile': """
-                CREATE TABLE dim_socioeconomic_profile (
-                    socioeconomic_profile_id INT IDENTITY(0,1) PRIMARY KEY,
-                    bidding_zone_code VARCHAR(50),
-                    country_code VARCHAR(5),
-                    country_name VARCHAR(100),
-                    year INT,
-                    avg_income_level DECIMAL(12, 2),
-                    unemployment_rate DECIMAL(5, 2),
-                    urbanization_rate DECIMAL(5, 2),
-                    service_sector_percentage DECIMAL(5, 2),
-                    industry_sector_percentage DECIMAL(5, 2),
-                    energy_poverty_rate DECIMAL(5, 2),
-                    residential_percentage DECIMAL(5, 2),
-                    commercial_percentage DECIMAL(5, 2),
-                    industrial_percentage DECIMAL(5, 2),
-                    avg_household_size DECIMAL(5, 2),
-                    primary_heating_type VARCHAR(50),
-                    population BIGINT,
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """
-        }
-        
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Wykonaj wszystkie DDL w jednej transakcji
-                for table_name, ddl in ddl_statements.items():
-                    self.logger.debug(f"Creating {table_name}")
-                    cursor.execute(ddl)
-                
-                conn.commit()
-                self.logger.info(f"Successfully created {len(ddl_statements)} dimension tables")
-                return True
+            self._execute_ddl(_DIM_DDL, _DIM_DDL_BATCH)
+            self.logger.info(f"Successfully created {len(_DIM_DDL)} dimension tables")
+            return True
                 
         except Exception as e:
             self.logger.error(f"Error creating dimension tables: {str(e)}")
@@ -417,9 +674,12 @@ class OptimizedWarehouseBuilder:
         """
         self.logger.info("Creating fact table (optimized)")
         
+        # Clustered columnstore bez nieklastrowych indeksów na kolumnach FK -
+        # filtrowanie i złączenia po FK obsługuje eliminacja segmentów CCI,
+        # a rowstore indeksy trzeba by utrzymywać przy każdym ładowaniu
         fact_ddl = """
             CREATE TABLE fact_energy_weather (
-                energy_weather_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+                energy_weather_id BIGINT IDENTITY(1,1) NOT NULL,
                 date_id INT NOT NULL,
                 time_id INT NOT NULL,
                 bidding_zone_id INT NOT NULL,
@@ -434,23 +694,25 @@ class OptimizedWarehouseBuilder:
                 capacity_factor DECIMAL(5, 2),
                 renewable_percentage DECIMAL(5, 2),
                 per_capita_consumption DECIMAL(18, 6),
-                temperature_avg DECIMAL(5, 2),
-                temperature_min DECIMAL(5, 2),
-                temperature_max DECIMAL(5, 2),
-                humidity DECIMAL(5, 2),
-                precipitation DECIMAL(8, 2),
-                wind_speed DECIMAL(5, 2),
+                temperature_avg REAL,
+                temperature_min REAL,
+                temperature_max REAL,
+                humidity REAL,
+                precipitation REAL,
+                wind_speed REAL,
                 wind_direction INT,
-                cloud_cover DECIMAL(5, 2),
-                solar_radiation DECIMAL(8, 2),
-                air_pressure DECIMAL(8, 2),
-                heating_degree_days DECIMAL(5, 2),
-                cooling_degree_days DECIMAL(5, 2),
-                created_at DATETIME2 DEFAULT GETDATE()
-            )
+                cloud_cover REAL,
+                solar_radiation REAL,
+                air_pressure REAL,
+                heating_degree_days REAL,
+                cooling_degree_days REAL,
+                created_at DATETIME2 DEFAULT GETDATE(),
+                CONSTRAINT PK_fact_energy_weather PRIMARY KEY NONCLUSTERED (energy_weather_id)
+            );
+            CREATE CLUSTERED COLUMNSTORE INDEX CCI_fact_energy_weather ON fact_energy_weather
         """
         
-        # Foreign key constraints będą dodane osobno dla lepszej wydajności
+        # Foreign key constraints - wysyłane razem z CREATE w jednym batchu
         fk_constraints = [
             "ALTER TABLE fact_energy_weather ADD CONSTRAINT FK_fact_date FOREIGN KEY (date_id) REFERENCES dim_date(date_id)",
             "ALTER TABLE fact_energy_weather ADD CONSTRAINT FK_fact_time FOREIGN KEY (time_id) REFERENCES dim_time(time_id)",
@@ -463,17 +725,13 @@ class OptimizedWarehouseBuilder:
         
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Utwórz tabelę
-                cursor.execute(fact_ddl)
-                
-                # Dodaj foreign key constraints
-                for constraint in fk_constraints:
-                    cursor.execute(constraint)
+                cursor = self._cursor(conn)
                 
+                # CREATE, CCI i FK constraints jako jeden batch T-SQL
+                full_ddl = fact_ddl + ";\n" + ";\n".join(fk_constraints)
+                cursor.execute(full_ddl)
                 conn.commit()
-                self.logger.info("Successfully created fact table with constraints")
+                self.logger.info("Successfully created fact table with columnstore index and constraints")
                 return True
                 
         except Exception as e:
@@ -489,121 +747,10 @@ class OptimizedWarehouseBuilder:
         """
         self.logger.info("Creating source tables (optimized)")
         
-        source_ddl_statements = {
-            'src_entso_actual_load': """
-                CREATE TABLE src_entso_actual_load (
-                    entso_actual_load_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    timestamp DATETIME2,
-                    quantity DECIMAL(15, 2),
-                    bidding_zone VARCHAR(50),
-                    zone_code VARCHAR(50),
-                    country VARCHAR(5),
-                    data_type VARCHAR(20),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'src_entso_generation': """
-                CREATE TABLE src_entso_generation (
-                    entso_generation_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    timestamp DATETIME2,
-                    quantity DECIMAL(15, 2),
-                    bidding_zone VARCHAR(50),
-                    zone_code VARCHAR(50),
-                    country VARCHAR(5),
-                    generation_type VARCHAR(5),
-                    data_type VARCHAR(20),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'src_entso_forecast': """
-                CREATE TABLE src_entso_forecast (
-                    entso_forecast_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    timestamp DATETIME2,
-                    quantity DECIMAL(15, 2),
-                    bidding_zone VARCHAR(50),
-                    zone_code VARCHAR(50),
-                    country VARCHAR(5),
-                    data_type VARCHAR(20),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'src_weather_data': """
-                CREATE TABLE src_weather_data (
-                    weather_data_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    timestamp DATETIME2,
-                    subzone_code VARCHAR(10),
-                    subzone_name VARCHAR(100),
-                    country_code VARCHAR(5),
-                    zone_name VARCHAR(100),
-                    temperature_avg DECIMAL(5, 2),
-                    temperature_min DECIMAL(5, 2),
-                    temperature_max DECIMAL(5, 2),
-                    humidity DECIMAL(5, 2),
-                    precipitation DECIMAL(5, 2),
-                    wind_speed DECIMAL(5, 2),
-                    wind_direction INT,
-                    air_pressure DECIMAL(8, 2),
-                    cloud_cover DECIMAL(5, 2),
-                    solar_radiation DECIMAL(8, 2),
-                    weather_condition VARCHAR(30),
-                    latitude DECIMAL(10, 6),
-                    longitude DECIMAL(10, 6),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'src_climate_data': """
-                CREATE TABLE src_climate_data (
-                    climate_data_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    date DATE,
-                    subzone_code VARCHAR(10),
-                    subzone_name VARCHAR(100),
-                    country_code VARCHAR(5),
-                    zone_name VARCHAR(100),
-                    heating_degree_days DECIMAL(5, 2),
-                    cooling_degree_days DECIMAL(5, 2),
-                    temperature_mean DECIMAL(5, 2),
-                    temperature_min DECIMAL(5, 2),
-                    temperature_max DECIMAL(5, 2),
-                    latitude DECIMAL(10, 6),
-                    longitude DECIMAL(10, 6),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """,
-            'src_eurostat_integrated': """
-                CREATE TABLE src_eurostat_integrated (
-                    eurostat_integrated_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    country_code VARCHAR(5),
-                    country_name VARCHAR(100),
-                    year INT,
-                    population BIGINT,
-                    gdp_per_capita DECIMAL(15, 2),
-                    electricity_price_avg DECIMAL(10, 2),
-                    energy_intensity DECIMAL(15, 2),
-                    unemployment_rate DECIMAL(5, 2),
-                    poverty_by_degree_of_urbanization DECIMAL(5, 2),
-                    service_sector_percentage DECIMAL(5, 2),
-                    industry_sector_percentage DECIMAL(5, 2),
-                    avg_household_size DECIMAL(5, 2),
-                    energy_poverty_rate DECIMAL(5, 2),
-                    primary_heating_type VARCHAR(50),
-                    data_quality_score INT,
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """
-        }
-        
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Wykonaj wszystkie DDL w jednej transakcji
-                for table_name, ddl in source_ddl_statements.items():
-                    self.logger.debug(f"Creating {table_name}")
-                    cursor.execute(ddl)
-                
-                conn.commit()
-                self.logger.info(f"Successfully created {len(source_ddl_statements)} source tables")
-                return True
+            self._execute_ddl(_SRC_DDL, _SRC_DDL_BATCH)
+            self.logger.info(f"Successfully created {len(_SRC_DDL)} source tables")
+            return True
                 
         except Exception as e:
             self.logger.error(f"Error creating source tables: {str(e)}")
@@ -618,374 +765,250 @@ class OptimizedWarehouseBuilder:
         """
         self.logger.info("Inserting default dimension records (batch)")
         
-        # Wszystkie default inserts w jednej liście
-        default_inserts = [
-            # dim_date
-            """
-            SET IDENTITY_INSERT dim_date ON;
-            INSERT INTO dim_date (date_id, full_date, day_of_week, day_of_month, month, month_name, quarter, year, season, is_holiday, holiday_name, holiday_type, is_school_day, is_weekend)
-            VALUES (0, '1900-01-01', 'Unknown', 0, 0, 'Unknown', 0, 0, 'Unknown', 'No', 'None', 'None', 'No', 'No');
-            SET IDENTITY_INSERT dim_date OFF;
-            """,
-            # dim_time
-            """
-            SET IDENTITY_INSERT dim_time ON;
-            INSERT INTO dim_time (time_id, hour, minute, day_period, is_peak_hour)
-            VALUES (0, 0, 0, 'Unknown', 'No');
-            SET IDENTITY_INSERT dim_time OFF;
-            """,
-            # dim_bidding_zone
-            """
-            SET IDENTITY_INSERT dim_bidding_zone ON;
-            INSERT INTO dim_bidding_zone (bidding_zone_id, bidding_zone_code, bidding_zone_name, primary_country, secondary_countries, control_area, timezone, population, gdp_per_capita, energy_intensity, electricity_price_avg, year)
-            VALUES (0, 'UNKNOWN', 'Unknown', 'UNK', 'None', 'Unknown', 'UTC', 0, 0.0, 0.0, 0.0, 0);
-            SET IDENTITY_INSERT dim_bidding_zone OFF;
-            """,
-            # dim_weather_zone
-            """
-            SET IDENTITY_INSERT dim_weather_zone ON;
-            INSERT INTO dim_weather_zone (weather_zone_id, weather_zone_name, bidding_zone_id, climate_zone, elevation_avg, coastal_proximity, urbanization_level)
-            VALUES (0, 'Unknown', 0, 'Unknown', 0.0, 'Unknown', 'Unknown');
-            SET IDENTITY_INSERT dim_weather_zone OFF;
-            """,
-            # dim_generation_type
-            """
-            SET IDENTITY_INSERT dim_generation_type ON;
-            INSERT INTO dim_generation_type (generation_type_id, entso_code, generation_category, generation_type, is_intermittent, fuel_source)
-            VALUES (0, 'B20', 'Unknown', 'Unknown', 'No', 'Unknown');
-            SET IDENTITY_INSERT dim_generation_type OFF;
-            """,
-            # dim_weather_condition
-            """
-            SET IDENTITY_INSERT dim_weather_condition ON;
-            INSERT INTO dim_weather_condition (weather_condition_id, condition_type, condition_severity, is_extreme_weather, extreme_weather_type)
-            VALUES (0, 'Unknown', 'None', 'No', 'None');
-            SET IDENTITY_INSERT dim_weather_condition OFF;
-            """,
-            # dim_socioeconomic_profile
-            """
-            SET IDENTITY_INSERT dim_socioeconomic_profile ON;
-            INSERT INTO dim_socioeconomic_profile (socioeconomic_profile_id, bidding_zone_code, country_code, country_name, year, avg_income_level, unemployment_rate, urbanization_rate, service_sector_percentage, industry_sector_percentage, energy_poverty_rate, residential_percentage, commercial_percentage, industrial_percentage, avg_household_size, primary_heating_type, population)
-            VALUES (0, 'UNKNOWN', 'UNK', 'Unknown', 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 'Unknown', 0);
-            SET IDENTITY_INSERT dim_socioeconomic_profile OFF;
-            """
-        ]
-        
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
+                cursor = self._cursor(conn)
+                
+                # Wszystkie inserts jako jeden sparametryzowany skrypt - jeden round-trip i jeden commit
+                statements = []
+                params = []
+                for table, columns, rows in DEFAULT_DIMENSION_ROWS:
+                    # Jeden wielowierszowy INSERT ... VALUES (...), (...) na tabelę
+                    row_placeholder = f"({', '.join('?' * len(columns))})"
+                    statements.append(
+                        f"SET IDENTITY_INSERT {table} ON;\n"
+                        f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row_placeholder] * len(rows))};\n"
+                        f"SET IDENTITY_INSERT {table} OFF;"
+                    )
+                    for row in rows:
+                        params.extend(row)
                 
-                # Wykonaj wszystkie inserts w jednej transakcji
-                for insert_sql in default_inserts:
-                    cursor.execute(insert_sql)
+                batch_sql = "SET NOCOUNT ON;\nSET XACT_ABORT ON;\nBEGIN TRAN;\n" + "\n".join(statements) + "\nCOMMIT TRAN;\nSET NOCOUNT OFF;"
+                cursor.execute(batch_sql, *params)
                 
                 conn.commit()
-                self.logger.info(f"Successfully inserted {len(default_inserts)} default dimension records")
+                record_count = sum(len(rows) for _, _, rows in DEFAULT_DIMENSION_ROWS)
+                self.logger.info(f"Successfully inserted {record_count} default dimension records")
                 return True
                 
         except Exception as e:
             self.logger.error(f"Error inserting default dimension records: {str(e)}")
             return False
     
-    def load_data_from_staging(self) -> bool:
+    def _get_staging_stats(self) -> dict:
         """
-        Optymalizowane ładowanie danych z wykorzystaniem parallel processing
+        Liczby wierszy wszystkich tabel staging jednym zapytaniem do metadanych
+        
+        Zastępuje osobne IF OBJECT_ID + SELECT COUNT(*) (pełny skan) per tabela.
+        Wynik jest zapamiętywany na czas życia obiektu.
         
         Returns:
-            True jeśli sukces, False w przeciwnym razie
+            Słownik {nazwa_tabeli_staging: liczba_wierszy}
         """
-        self.logger.info("Loading data from staging (parallel processing)")
-        
-        try:
-            # Parallel loading of dimensions
-            with ThreadPoolExecutor(max_workers=min(4, len(self.dimension_tables))) as executor:
-                dimension_futures = {
-                    executor.submit(self._load_dimension_data, dim): dim 
-                    for dim in self.dimension_tables
-                }
-                
-                dimension_results = []
-                for future in as_completed(dimension_futures):
-                    dim = dimension_futures[future]
-                    try:
-                        result = future.result()
-                        dimension_results.append((dim, result))
-                        if result:
-                            self.logger.info(f"Successfully loaded dimension: {dim}")
-                        else:
-                            self.logger.warning(f"Failed to load dimension: {dim}")
-                    except Exception as e:
-                        self.logger.error(f"Error loading dimension {dim}: {str(e)}")
-                        dimension_results.append((dim, False))
-            
-            # Parallel loading of source tables
-            with ThreadPoolExecutor(max_workers=min(4, len(self.source_tables))) as executor:
-                source_futures = {
-                    executor.submit(self._load_source_data, src): src 
-                    for src in self.source_tables
-                }
-                
-                source_results = []
-                for future in as_completed(source_futures):
-                    src = source_futures[future]
-                    try:
-                        result = future.result()
-                        source_results.append((src, result))
-                        if result:
-                            self.logger.info(f"Successfully loaded source: {src}")
-                        else:
-                            self.logger.warning(f"Failed to load source: {src}")
-                    except Exception as e:
-                        self.logger.error(f"Error loading source {src}: {str(e)}")
-                        source_results.append((src, False))
+        if self._staging_stats is None:
+            with self.get_connection() as conn:
+                cursor = self._cursor(conn)
+                cursor.execute("""
+                    SELECT OBJECT_NAME(object_id) AS table_name, SUM(row_count) AS row_count
+                    FROM sys.dm_db_partition_stats
+                    WHERE index_id IN (0, 1)
+                    AND OBJECT_NAME(object_id) LIKE 'staging[_]%'
+                    GROUP BY object_id
+                """)
+                self._staging_stats = {row.table_name: row.row_count for row in cursor.fetchall()}
             
-            # Load fact data (sequential due to dependencies)
-            fact_result = self._load_fact_data()
+            self.logger.debug("Cached row counts for %d staging tables", len(self._staging_stats))
+        
+        return self._staging_stats
+    
+    def _get_staging_row_count(self, staging_table: str) -> int:
+        """
+        Liczba wierszy tabeli staging z cache (0 gdy tabela nie istnieje)
+        
+        Args:
+            staging_table: Nazwa tabeli staging
             
-            # Evaluate results
-            all_success = (
-                all(result for _, result in dimension_results) and
-                all(result for _, result in source_results) and
-                fact_result
-            )
+        Returns:
+            Liczba wierszy
+        """
+        return self._get_staging_stats().get(staging_table, 0)
+    
+    def _staging_to_target_pairs(self) -> List[Tuple[str, str]]:
+        """Pary (tabela_staging, tabela_docelowa) dla wszystkich ładowanych tabel"""
+        pairs = [(f"staging_{dim}", dim) for dim in self.dimension_tables]
+        pairs += [(f"staging_{src.replace('src_', '')}", src) for src in self.source_tables]
+        pairs += [(f"staging_{fact}", fact) for fact in self.fact_tables]
+        return pairs
+    
+    def _load_column_metadata(self) -> dict:
+        """
+        Kolumny wszystkich tabel staging i docelowych jednym zapytaniem
+        
+        Część wspólna liczona jest w Pythonie i zapamiętywana, zamiast osobnego
+        zapytania do INFORMATION_SCHEMA.COLUMNS per tabela.
+        
+        Returns:
+            Słownik {(tabela_staging, tabela_docelowa): [kolumny]}
+        """
+        if self._common_cols is not None:
+            return self._common_cols
+        
+        pairs = self._staging_to_target_pairs()
+        table_names = sorted({name for pair in pairs for name in pair})
+        qmarks = ",".join("?" * len(table_names))
+        
+        columns = {}
+        identity_columns = {}
+        with self.get_connection() as conn:
+            cursor = self._cursor(conn)
+            cursor.execute(self.sql_statements['get_table_columns'].format(qmarks), *table_names)
+            for row in cursor.fetchall():
+                columns.setdefault(row.TABLE_NAME, []).append(row.COLUMN_NAME)
+                if row.is_identity == 1:
+                    identity_columns.setdefault(row.TABLE_NAME, set()).add(row.COLUMN_NAME)
+        
+        common_cols = {}
+        for staging_table, target_table in pairs:
+            target_columns = set(columns.get(target_table, ())) - identity_columns.get(target_table, set())
+            common_cols[(staging_table, target_table)] = [
+                col for col in columns.get(staging_table, ())
+                if col not in ('id', 'created_at') and col in target_columns
+            ]
+        
+        self._common_cols = common_cols
+        self._identity_columns = {table: sorted(cols)[0] for table, cols in identity_columns.items()}
+        self._load_sql = self._build_load_statements(common_cols)
+        self.logger.debug("Cached common columns for %d staging/target pairs", len(common_cols))
+        return self._common_cols
+    
+    def _build_load_statements(self, common_cols: dict) -> dict:
+        """
+        Jednorazowe zbudowanie tekstów SQL ładowania dla wszystkich tabel
+        
+        Teksty są składane w treść procedury sp_load_warehouse_from_staging;
+        batch faktów używa zmiennych zakresu kolumny IDENTITY staging
+        (fact_id), więc jeden plan obsługuje wszystkie batche. Bez kolumny
+        IDENTITY fakty ładowane są jednym INSERT ... SELECT.
+        
+        Args:
+            common_cols: Słownik {(tabela_staging, tabela_docelowa): [kolumny]}
             
-            if all_success:
-                self.logger.info("All data loaded successfully")
+        Returns:
+            Słownik {tabela_docelowa: SQL}; dla faktów dodatkowo klucz '<fakty>_repair'
+        """
+        load_sql = {}
+        for (staging_table, target_table), columns in common_cols.items():
+            if not columns:
+                continue
+            if target_table in self.fact_tables:
+                key_column = self._identity_columns.get(staging_table)
+                where_clause = (
+                    f"s.{self._quote_identifier(key_column)} BETWEEN @lower_id AND @upper_id"
+                    if key_column else ""
+                )
+                load_sql[target_table] = self._build_fact_insert_sql(columns, where_clause)
+                repair_sql = self._build_fk_repair_sql(columns)
+                if repair_sql:
+                    load_sql[f"{target_table}_repair"] = repair_sql
             else:
-                self.logger.warning("Some data loading operations failed")
-            
-            return all_success
-            
-        except Exception as e:
-            self.logger.error(f"Error in parallel data loading: {str(e)}")
-            return False
+                load_sql[target_table] = (
+                    f"INSERT INTO {target_table} WITH (TABLOCK) ({', '.join(columns)}) "
+                    f"SELECT {', '.join(columns)} FROM {staging_table} WITH (NOLOCK);"
+                )
+        return load_sql
     
-    def _load_dimension_data(self, dim_table: str) -> bool:
+    def _get_load_sql(self, target_table: str) -> Optional[str]:
         """
-        Ładowanie danych wymiaru z optymalizacjami
+        Gotowy SQL ładowania tabeli docelowej z cache (None gdy brak wspólnych kolumn)
         
         Args:
-            dim_table: Nazwa tabeli wymiaru
+            target_table: Nazwa tabeli docelowej (lub '<fakty>_repair')
             
         Returns:
-            True jeśli sukces, False w przeciwnym razie
+            Tekst instrukcji SQL
         """
-        staging_table = f"staging_{dim_table}"
-        
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Sprawdź czy tabela staging istnieje i ma dane
-                cursor.execute(f"""
-                    IF OBJECT_ID('{staging_table}', 'U') IS NOT NULL
-                        SELECT COUNT(*) FROM {staging_table}
-                    ELSE
-                        SELECT 0
-                """)
-                
-                staging_count = cursor.fetchone()[0]
-                
-                if staging_count == 0:
-                    self.logger.debug(f"No data in {staging_table}, skipping {dim_table}")
-                    return True
-                
-                # Znajdź wspólne kolumny (używaj standardowego zapytania dla wymiarów)
-                cursor.execute(self.sql_statements['get_common_columns'], (staging_table, dim_table, dim_table))
-                common_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                
-                if not common_columns:
-                    self.logger.warning(f"No common columns found between {staging_table} and {dim_table}")
-                    return False
-                
-                # Bulk insert with optimized SQL
-                insert_sql = f"""
-                INSERT INTO {dim_table} ({', '.join(common_columns)})
-                SELECT {', '.join(common_columns)}
-                FROM {staging_table}
-                """
-                
-                cursor.execute(insert_sql)
-                conn.commit()
-                
-                self.logger.debug(f"Loaded {staging_count} records to {dim_table}")
-                return True
-                
-        except Exception as e:
-            self.logger.error(f"Error loading dimension {dim_table}: {str(e)}")
-            return False
+        self._load_column_metadata()
+        return self._load_sql.get(target_table)
     
-    def _load_source_data(self, src_table: str) -> bool:
+    def _get_common_columns(self, staging_table: str, target_table: str) -> List[str]:
         """
-        Ładowanie danych źródłowych z optymalizacjami
+        Wspólne kolumny staging i tabeli docelowej (bez id, created_at i kolumn IDENTITY)
         
         Args:
-            src_table: Nazwa tabeli źródłowej
+            staging_table: Nazwa tabeli staging
+            target_table: Nazwa tabeli docelowej
             
         Returns:
-            True jeśli sukces, False w przeciwnym razie
+            Lista wspólnych kolumn
         """
-        staging_table = f"staging_{src_table.replace('src_', '')}"
-        
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Sprawdź czy tabela staging istnieje i ma dane
-                cursor.execute(f"""
-                    IF OBJECT_ID('{staging_table}', 'U') IS NOT NULL
-                        SELECT COUNT(*) FROM {staging_table}
-                    ELSE
-                        SELECT 0
-                """)
-                
-                staging_count = cursor.fetchone()[0]
-                
-                if staging_count == 0:
-                    self.logger.debug(f"No data in {staging_table}, skipping {src_table}")
-                    return True
-                
-                # Znajdź wspólne kolumny (używaj standardowego zapytania dla źródeł)
-                cursor.execute(self.sql_statements['get_common_columns'], (staging_table, src_table, src_table))
-                common_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                
-                if not common_columns:
-                    self.logger.warning(f"No common columns found between {staging_table} and {src_table}")
-                    return False
-                
-                # Bulk insert
-                insert_sql = f"""
-                INSERT INTO {src_table} ({', '.join(common_columns)})
-                SELECT {', '.join(common_columns)}
-                FROM {staging_table}
-                """
-                
-                cursor.execute(insert_sql)
-                conn.commit()
-                
-                self.logger.debug(f"Loaded {staging_count} records to {src_table}")
-                return True
-                
-        except Exception as e:
-            self.logger.error(f"Error loading source {src_table}: {str(e)}")
-            return False
+        return self._load_column_metadata().get((staging_table, target_table), [])
     
-    def _load_fact_data(self) -> bool:
+    def load_data_from_staging(self) -> bool:
         """
-        Optymalizowane ładowanie danych faktów z batch processing i proper NULL handling
+        Ładowanie danych przez procedurę sp_load_warehouse_from_staging - cały
+        przepływ staging -> wymiary, źródła, fakty wykonuje się po stronie serwera
         
         Returns:
             True jeśli sukces, False w przeciwnym razie
         """
+        self.logger.info("Loading data from staging (stored procedure)")
+        
         staging_table = 'staging_fact_energy_weather'
         fact_table = 'fact_energy_weather'
         
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Sprawdź czy tabela staging istnieje i ma dane
-                cursor.execute(f"""
-                    IF OBJECT_ID('{staging_table}', 'U') IS NOT NULL
-                        SELECT COUNT(*) FROM {staging_table}
-                    ELSE
-                        SELECT 0
-                """)
-                
-                staging_count = cursor.fetchone()[0]
-                
-                if staging_count == 0:
-                    self.logger.debug(f"No data in {staging_table}, skipping {fact_table}")
-                    return True
-                
-                # Znajdź wspólne kolumny (używaj fact-specific query)
-                cursor.execute(self.sql_statements['get_common_columns_fact'], (staging_table, fact_table))
-                common_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                
-                if not common_columns:
-                    self.logger.warning(f"No common columns found between {staging_table} and {fact_table}")
-                    return False
-                
-                self.logger.info(f"Found {len(common_columns)} common columns for fact table")
-                self.logger.debug(f"Common columns: {common_columns}")
+            # Jeden odczyt metadanych staging przed ładowaniem
+            self._get_staging_stats()
+            self._load_column_metadata()
+            
+            procedure_sql, loaded_tables = self._build_load_procedure_sql()
+            if procedure_sql is None:
+                self.logger.info("No staging data to load")
+                return True
+            
+            staging_count = self._get_staging_row_count(staging_table)
+            
+            # Autocommit - procedura sama zarządza transakcjami (commit co @commit_size batchy)
+            with self.get_connection(autocommit=True) as conn:
+                cursor = self._cursor(conn)
                 
-                # Przygotuj kolumny z ISNULL dla kluczy obcych
-                fk_columns = ['date_id', 'time_id', 'bidding_zone_id', 'weather_zone_id', 
-                             'generation_type_id', 'weather_condition_id', 'socioeconomic_profile_id']
+                # Procedura odtwarzana przy każdej przebudowie - kolumny zależą od bieżącego schematu
+                cursor.execute(procedure_sql)
                 
-                select_columns = []
-                for col in common_columns:
-                    if col in fk_columns:
-                        select_columns.append(f"ISNULL({col}, 0) AS {col}")
-                        self.logger.debug(f"Applied ISNULL to foreign key column: {col}")
-                    else:
-                        select_columns.append(col)
+                # Rozmiar batcha dobrany do szerokości wiersza staging
+                batch_size = self._compute_fact_batch_size(cursor, staging_table) if staging_count else self.batch_size
                 
-                # Bulk insert z batch processing dla dużych tabel
-                if staging_count > self.batch_size:
+                if staging_count > batch_size:
                     self.logger.info(f"Large fact table detected ({staging_count} records), using batch processing")
-                    
-                    # Procesor batch
-                    total_inserted = 0
-                    offset = 0
-                    batch_num = 0
-                    start_time = time.time()  # Initialize timing
-                    
-                    while offset < staging_count:
-                        batch_num += 1
-                        current_batch_size = min(self.batch_size, staging_count - offset)
-                        
-                        self.logger.info(f"Processing batch {batch_num}: records {offset+1} to {offset+current_batch_size}")
-                        
-                        batch_sql = f"""
-                        INSERT INTO {fact_table} ({', '.join(common_columns)})
-                        SELECT {', '.join(select_columns)}
-                        FROM {staging_table}
-                        ORDER BY (SELECT NULL)
-                        OFFSET {offset} ROWS
-                        FETCH NEXT {self.batch_size} ROWS ONLY
-                        """
-                        
-                        cursor.execute(batch_sql)
-                        conn.commit()
-                        
-                        offset += self.batch_size
-                        total_inserted += current_batch_size
-                        
-                        # Progress report every 5 batches for faster feedback
-                        if batch_num % 5 == 0:
-                            elapsed_time = time.time() - start_time
-                            avg_time_per_batch = elapsed_time / batch_num
-                            remaining_batches = max(0, (staging_count - offset) // self.batch_size)
-                            estimated_remaining = remaining_batches * avg_time_per_batch
-                            
-                            self.logger.info(
-                                f"Progress: {total_inserted}/{staging_count} records "
-                                f"({(total_inserted/staging_count)*100:.1f}%) - "
-                                f"Elapsed: {elapsed_time:.0f}s, "
-                                f"Est. remaining: {estimated_remaining:.0f}s"
-                            )
-                    
-                    self.logger.info(f"Successfully loaded {total_inserted} records to {fact_table} using batch processing")
                 
-                else:
-                    # Pojedynczy insert dla mniejszych tabel
-                    insert_sql = f"""
-                    INSERT INTO {fact_table} ({', '.join(common_columns)})
-                    SELECT {', '.join(select_columns)}
-                    FROM {staging_table}
-                    """
-                    
-                    cursor.execute(insert_sql)
-                    conn.commit()
-                    
-                    self.logger.info(f"Successfully loaded {staging_count} records to {fact_table}")
+                if self.debug_stats:
+                    cursor.execute("SET STATISTICS IO ON; SET STATISTICS TIME ON")
                 
-                return True
+                load_start = time.perf_counter()
+                try:
+                    cursor.execute(
+                        "EXEC sp_load_warehouse_from_staging @batch_size = ?, @commit_size = ?",
+                        batch_size, self.commit_size
+                    )
+                    messages = list(cursor.messages)
+                    fact_rows = cursor.fetchone()[0]
+                    while cursor.nextset():
+                        messages.extend(cursor.messages)
+                finally:
+                    if self.debug_stats:
+                        cursor.execute("SET STATISTICS IO OFF; SET STATISTICS TIME OFF")
                 
+                self.logger.info(f"Load procedure finished in {time.perf_counter() - load_start:.2f} seconds")
+                if self.debug_stats:
+                    self._log_statistics_messages(messages)
+            
+            self.logger.info(f"Successfully loaded {len(loaded_tables)} dimension/source tables: {', '.join(loaded_tables)}")
+            self.logger.info(f"Successfully loaded {fact_rows} records to {fact_table}")
+            self.logger.info("All data loaded successfully")
+            return True
+            
         except Exception as e:
-            self.logger.error(f"Error loading fact data: {str(e)}")
-            self.logger.error(f"This may be due to missing dimension records or data quality issues")
+            self.logger.error(f"Error in data loading: {str(e)}")
             
             # Try to provide more specific error information
             if "Cannot insert the value NULL" in str(e):
@@ -995,6 +1018,259 @@ class OptimizedWarehouseBuilder:
             
             return False
     
+    def _log_statistics_messages(self, messages: list):
+        """
+        Podsumowanie komunikatów SET STATISTICS IO/TIME zebranych z cursor.messages
+        
+        Koszt po stronie serwera (odczyty logiczne, czas CPU) koreluje z realnym
+        kosztem ładowania lepiej niż czas zegarowy klienta.
+        
+        Args:
+            messages: Lista krotek (kod, tekst) z cursor.messages
+        """
+        logical_reads = 0
+        cpu_ms = 0
+        elapsed_ms = 0
+        for _, text in messages:
+            logical_reads += sum(int(n) for n in re.findall(r"logical reads (\d+)", text))
+            for cpu, elapsed in re.findall(r"CPU time = (\d+) ms,\s+elapsed time = (\d+) ms", text):
+                cpu_ms += int(cpu)
+                elapsed_ms += int(elapsed)
+        
+        self.logger.info(
+            f"Server statistics: {logical_reads} logical reads, "
+            f"CPU {cpu_ms} ms, elapsed {elapsed_ms} ms ({len(messages)} messages)"
+        )
+    
+    def _build_load_procedure_sql(self) -> Tuple[Optional[str], List[str]]:
+        """
+        Budowa CREATE OR ALTER PROCEDURE sp_load_warehouse_from_staging
+        
+        Procedura ładuje wymiary i źródła w jednej transakcji (INSERT ... SELECT
+        WITH (TABLOCK)), naprawia NULL w kluczach obcych staging faktów, a potem
+        ładuje fakty pętlą WHILE po zakresach kolumny IDENTITY staging, z
+        commitem co @commit_size batchy (bez kolumny IDENTITY - jednym INSERT).
+        Zwraca liczbę wstawionych faktów jednym wierszem wyniku.
+        Pomijane są tabele z pustym staging.
+        
+        Returns:
+            Krotka (SQL procedury lub None gdy nie ma czego ładować, załadowane tabele)
+            
+        Raises:
+            ValueError: Gdy tabela staging z danymi nie ma wspólnych kolumn z tabelą docelową
+        """
+        statements = []
+        loaded_tables = []
+        missing_columns = []
+        
+        for staging_table, target_table in self._staging_to_target_pairs():
+            if target_table in self.fact_tables:
+                continue
+            
+            # Sprawdź czy tabela staging istnieje i ma dane (z cache metadanych)
+            if self._get_staging_row_count(staging_table) == 0:
+                self.logger.debug("No data in %s, skipping %s", staging_table, target_table)
+                continue
+            
+            insert_sql = self._get_load_sql(target_table)
+            if not insert_sql:
+                self.logger.warning(f"No common columns found between {staging_table} and {target_table}")
+                missing_columns.append(target_table)
+                continue
+            
+            statements.append(insert_sql)
+            loaded_tables.append(target_table)
+        
+        fact_sql = None
+        if self._get_staging_row_count('staging_fact_energy_weather') > 0:
+            fact_sql = self._get_load_sql('fact_energy_weather')
+            if not fact_sql:
+                self.logger.warning("No common columns found between staging_fact_energy_weather and fact_energy_weather")
+                missing_columns.append('fact_energy_weather')
+        
+        if missing_columns:
+            raise ValueError(f"No common columns with staging for: {', '.join(missing_columns)}")
+        
+        if not statements and not fact_sql:
+            return None, loaded_tables
+        
+        body = ["SET NOCOUNT ON;", "SET XACT_ABORT ON;", "DECLARE @fact_rows BIGINT = 0;"]
+        
+        if statements:
+            body += ["BEGIN TRAN;"] + statements + ["COMMIT TRAN;"]
+        
+        if fact_sql:
+            repair_sql = self._get_load_sql('fact_energy_weather_repair')
+            if repair_sql:
+                body.append(repair_sql)
+            
+            key_column = self._identity_columns.get('staging_fact_energy_weather')
+            if key_column is None:
+                self.logger.info("staging_fact_energy_weather has no IDENTITY column, loading facts in a single INSERT")
+                body += ["BEGIN TRAN;", fact_sql.strip(), "SET @fact_rows = @@ROWCOUNT;", "COMMIT TRAN;"]
+            else:
+                key_column = self._quote_identifier(key_column)
+                body.append(f"""
+    DECLARE @lower_id BIGINT, @upper_id BIGINT, @max_id BIGINT, @batch_num INT = 0;
+    SELECT @lower_id = MIN({key_column}), @max_id = MAX({key_column}) FROM staging_fact_energy_weather;
+    
+    WHILE @lower_id <= @max_id
+    BEGIN
+        IF @@TRANCOUNT = 0 BEGIN TRAN;
+        SET @upper_id = @lower_id + @batch_size - 1;
+        {fact_sql.strip()}
+        SET @fact_rows = @fact_rows + @@ROWCOUNT;
+        SET @batch_num = @batch_num + 1;
+        SET @lower_id = @upper_id + 1;
+        IF @batch_num % @commit_size = 0 COMMIT TRAN;
+    END
+    
+    IF @@TRANCOUNT > 0 COMMIT TRAN;""")
+        
+        body.append("SELECT @fact_rows AS fact_rows;")
+        
+        procedure_sql = (
+            "CREATE OR ALTER PROCEDURE sp_load_warehouse_from_staging\n"
+            "    @batch_size INT,\n"
+            "    @commit_size INT\n"
+            "AS\nBEGIN\n    "
+            + "\n    ".join(body)
+            + "\nEND"
+        )
+        return procedure_sql, loaded_tables
+    
+    def _compute_fact_batch_size(self, cursor, staging_table: str) -> int:
+        """
+        Rozmiar batcha na podstawie średniej szerokości wiersza (cel ~8 MB na batch)
+        
+        Args:
+            cursor: Kursor bazy danych
+            staging_table: Nazwa tabeli staging
+            
+        Returns:
+            Liczba wierszy w batchu (self.batch_size gdy brak statystyk), nie mniej
+            niż COLUMNSTORE_MIN_BATCH_SIZE - tabela faktów ma clustered columnstore
+        """
+        return max(COLUMNSTORE_MIN_BATCH_SIZE, self._row_width_batch_size(cursor, staging_table))
+    
+    def _row_width_batch_size(self, cursor, staging_table: str) -> int:
+        """Liczba wierszy mieszcząca się w TARGET_BATCH_BYTES wg sys.dm_db_index_physical_stats"""
+        try:
+            cursor.execute("""
+                SELECT MAX(avg_record_size_in_bytes)
+                FROM sys.dm_db_index_physical_stats(DB_ID(), OBJECT_ID(?), NULL, NULL, 'SAMPLED')
+                WHERE index_id IN (0, 1)
+            """, staging_table)
+            row = cursor.fetchone()
+        except Exception as e:
+            self.logger.warning(f"Could not read row size statistics for {staging_table}: {str(e)}")
+            return self.batch_size
+        
+        if not row or not row[0]:
+            return self.batch_size
+        
+        row_bytes = int(row[0])
+        batch_size = max(MIN_BATCH_SIZE, min(MAX_BATCH_SIZE, TARGET_BATCH_BYTES // row_bytes))
+        self.logger.info(f"Adaptive batch size for {staging_table}: {batch_size} rows (avg row {row_bytes} bytes)")
+        return batch_size
+    
+    def _build_fk_repair_sql(self, common_columns: List[str]) -> str:
+        """
+        Zamiana NULL na 0 (rekord domyślny) w kluczach obcych staging jednym UPDATE
+        
+        Dotyka tylko wierszy z NULL, więc główne ładowanie to prosta kopia kolumn
+        bez ISNULL liczonego dla każdego wiersza każdego batcha.
+        
+        Args:
+            common_columns: Wspólne kolumny staging i tabeli faktów
+            
+        Returns:
+            Instrukcja UPDATE (pusty string gdy brak kolumn FK)
+        """
+        fk_columns = [col for col in FACT_FK_COLUMNS if col in common_columns]
+        if not fk_columns:
+            return ""
+        
+        return (
+            f"UPDATE staging_fact_energy_weather "
+            f"SET {', '.join(f'{col} = ISNULL({col}, 0)' for col in fk_columns)} "
+            f"WHERE {' OR '.join(f'{col} IS NULL' for col in fk_columns)};"
+        )
+    
+    def _build_fact_insert_sql(self, common_columns: List[str], where_clause: str = "") -> str:
+        """
+        Budowa INSERT ... SELECT staging -> fakty jako prostej kopii kolumna-do-kolumny
+        
+        Tabela faktów jest przy przebudowie zawsze tworzona od nowa (pusta), więc
+        nie ma czego pomijać - każdy wiersz staging trafia do faktów dokładnie raz.
+        W przeciwieństwie do MERGE, INSERT ... SELECT WITH (TABLOCK) do clustered
+        columnstore używa ścieżki bulk load - batch >= 102400 wierszy trafia
+        od razu do skompresowanego rowgroup zamiast do delta store. NULL w
+        kluczach obcych są naprawiane wcześniej, UPDATE z _build_fk_repair_sql.
+        Staging czytany jest z NOLOCK - w trakcie ładowania nikt do niego nie pisze.
+        
+        Args:
+            common_columns: Wspólne kolumny staging i tabeli faktów
+            where_clause: Opcjonalny warunek na tabeli staging (np. zakres batcha)
+            
+        Returns:
+            Instrukcja INSERT ... SELECT
+        """
+        where_sql = f"WHERE {where_clause}" if where_clause else ""
+        
+        return f"""
+        INSERT INTO fact_energy_weather WITH (TABLOCK) ({', '.join(common_columns)})
+        SELECT {', '.join(f"s.{col}" for col in common_columns)}
+        FROM staging_fact_energy_weather s WITH (NOLOCK)
+        {where_sql};
+        """
+    
+    def _enable_bulk_logged_recovery(self) -> Optional[str]:
+        """
+        Przełączenie bazy z FULL na BULK_LOGGED na czas przebudowy
+        
+        INSERT ... SELECT WITH (TABLOCK) do pustych tabel loguje wtedy tylko
+        alokacje stron zamiast pełnych obrazów wierszy. W modelu SIMPLE logowanie
+        minimalne działa już teraz, więc nic nie jest zmieniane.
+        
+        Returns:
+            Pierwotny model odtwarzania do przywrócenia lub None gdy bez zmian
+        """
+        try:
+            with self.get_connection(autocommit=True) as conn:
+                cursor = self._cursor(conn)
+                cursor.execute("SELECT recovery_model_desc FROM sys.databases WHERE database_id = DB_ID()")
+                recovery_model = cursor.fetchone()[0]
+                
+                if recovery_model != 'FULL':
+                    self.logger.debug("Recovery model is %s, leaving it unchanged", recovery_model)
+                    return None
+                
+                cursor.execute("ALTER DATABASE CURRENT SET RECOVERY BULK_LOGGED")
+                self.logger.info("Switched recovery model FULL -> BULK_LOGGED for the rebuild")
+                return recovery_model
+                
+        except Exception as e:
+            self.logger.warning(f"Could not switch to BULK_LOGGED recovery, loading fully logged: {str(e)}")
+            return None
+    
+    def _restore_recovery_model(self, recovery_model: Optional[str]):
+        """
+        Przywrócenie pierwotnego modelu odtwarzania po przebudowie
+        
+        Args:
+            recovery_model: Wartość zwrócona przez _enable_bulk_logged_recovery
+        """
+        if not recovery_model:
+            return
+        
+        try:
+            with self.get_connection(autocommit=True) as conn:
+                conn.execute(f"ALTER DATABASE CURRENT SET RECOVERY {recovery_model}")
+            self.logger.info(f"Restored recovery model {recovery_model}")
+        except Exception as e:
+            self.logger.error(f"Could not restore recovery model {recovery_model}: {str(e)}")
+    
     def run_full_rebuild(self) -> bool:
         """
         Optymalizowana pełna przebudowa hurtowni z miernikiem czasu
@@ -1002,8 +1278,12 @@ class OptimizedWarehouseBuilder:
         Returns:
             True jeśli sukces, False w przeciwnym razie
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.logger.info("Starting optimized full warehouse rebuild")
+        self.warm_up_pool()
+        
+        # Logowanie minimalne dla ładowania do świeżo utworzonych (pustych) tabel
+        original_recovery = self._enable_bulk_logged_recovery()
         
         steps = [
             ("Dropping existing tables", self.drop_tables),
@@ -1016,17 +1296,17 @@ class OptimizedWarehouseBuilder:
         
         try:
             for step_name, step_func in steps:
-                step_start = time.time()
+                step_start = time.perf_counter()
                 self.logger.info(f"Starting: {step_name}")
                 
                 if not step_func():
                     self.logger.error(f"Failed: {step_name}")
                     return False
                 
-                step_duration = time.time() - step_start
+                step_duration = time.perf_counter() - step_start
                 self.logger.info(f"Completed: {step_name} in {step_duration:.2f} seconds")
             
-            total_duration = time.time() - start_time
+            total_duration = time.perf_counter() - start_time
             self.logger.info(f"Optimized warehouse rebuild completed successfully in {total_duration:.2f} seconds")
             return True
             
@@ -1034,6 +1314,7 @@ class OptimizedWarehouseBuilder:
             self.logger.error(f"Fatal error during rebuild: {str(e)}")
             return False
         finally:
+            self._restore_recovery_model(original_recovery)
             # Cleanup connection pool
             self.close_connection_pool()
 
@@ -1060,8 +1341,10 @@ def main():
                                  "Driver={SQL Server};Server=localhost;Database=EnergyWeatherDW;Trusted_Connection=yes;")
     max_connections = int(os.getenv('DW_MAX_CONNECTIONS', '3'))
     batch_size = int(os.getenv('DW_BATCH_SIZE', '5000'))
+    commit_size = int(os.getenv('DW_COMMIT_SIZE', '10'))
+    debug_stats = os.getenv('DW_DEBUG_STATS', '').lower() in ('1', 'true', 'yes')
     
-    logger.info(f"Configuration - Max connections: {max_connections}, Batch size: {batch_size}")
+    logger.info(f"Configuration - Max connections: {max_connections}, Batch size: {batch_size}, Commit size: {commit_size}")
     logger.info("No timeouts configured - operations will run until completion")
     
     # Test połączenia przed rozpoczęciem (bez timeout)
@@ -1081,7 +1364,9 @@ def main():
         builder = OptimizedWarehouseBuilder(
             connection_string=connection_string,
             max_connections=max_connections,
-            batch_size=batch_size
+            batch_size=batch_size,
+            commit_size=commit_size,
+            debug_stats=debug_stats
         )
         
         # Uruchomienie pełnej przebudowy
@@ -12,13 +12,310 @@ import pyodbc
 import logging
 import traceback
 import gc
+import itertools
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple, Any
 
+# Definicja kolumny tabeli: (nazwa, typ z modyfikatorami)
+ColumnSpec = Tuple[str, str]
+
+def _qn(name: str) -> str:
+    """
+    Nazwa obiektu w nawiasach kwadratowych (odpowiednik QUOTENAME)
+    
+    Args:
+        name: Nazwa tabeli
+        
+    Returns:
+        Nazwa gotowa do wstawienia w tekst SQL
+    """
+    return f"[{name.replace(']', ']]')}]"
+
+def _render_create(table_name: str, columns: List[ColumnSpec], constraints: Tuple[str, ...] = ()) -> str:
+    """
+    Złożenie instrukcji CREATE TABLE ze specyfikacji kolumn i ograniczeń
+    
+    Args:
+        table_name: Nazwa tabeli
+        columns: Lista par (nazwa kolumny, definicja typu)
+        constraints: Dodatkowe ograniczenia (CONSTRAINT ...)
+        
+    Returns:
+        Instrukcja CREATE TABLE
+    """
+    definitions = [f"{name} {type_def}" for name, type_def in columns] + list(constraints)
+    return f"CREATE TABLE {_qn(table_name)} (\n    " + ",\n    ".join(definitions) + "\n)"
+
+# Specyfikacje tabel o stałej strukturze: kolumny i ograniczenia
+TABLE_SPECS: Dict[str, Tuple[List[ColumnSpec], Tuple[str, ...]]] = {
+    'fact_energy_weather': (
+        [
+            ('energy_weather_id', 'BIGINT IDENTITY(1,1) PRIMARY KEY'),
+            ('date_id', 'INT NOT NULL'),
+            ('time_id', 'INT NOT NULL'),
+            ('bidding_zone_id', 'INT NOT NULL'),
+            ('weather_zone_id', 'INT NOT NULL'),
+            ('generation_type_id', 'INT'),
+            ('weather_condition_id', 'INT'),
+            ('socioeconomic_profile_id', 'INT'),
+            ('actual_consumption', 'DECIMAL(18, 2)'),
+            ('forecasted_consumption', 'DECIMAL(18, 2)'),
+            ('consumption_deviation', 'DECIMAL(10, 2)'),
+            ('generation_amount', 'DECIMAL(18, 2)'),
+            ('capacity_factor', 'DECIMAL(5, 2)'),
+            ('renewable_percentage', 'DECIMAL(5, 2)'),
+            ('per_capita_consumption', 'DECIMAL(18, 6)'),
+            ('temperature_avg', 'DECIMAL(5, 2)'),
+            ('temperature_min', 'DECIMAL(5, 2)'),
+            ('temperature_max', 'DECIMAL(5, 2)'),
+            ('humidity', 'DECIMAL(5, 2)'),
+            ('precipitation', 'DECIMAL(8, 2)'),
+            ('wind_speed', 'DECIMAL(5, 2)'),
+            ('wind_direction', 'INT'),
+            ('cloud_cover', 'DECIMAL(5, 2)'),
+            ('solar_radiation', 'DECIMAL(8, 2)'),
+            ('air_pressure', 'DECIMAL(8, 2)'),
+            ('heating_degree_days', 'DECIMAL(5, 2)'),
+            ('cooling_degree_days', 'DECIMAL(5, 2)'),
+            ('created_at', 'DATETIME2 DEFAULT GETDATE()'),
+        ],
+        (
+            'CONSTRAINT FK_fact_date FOREIGN KEY (date_id) REFERENCES dim_date(date_id)',
+            'CONSTRAINT FK_fact_time FOREIGN KEY (time_id) REFERENCES dim_time(time_id)',
+            'CONSTRAINT FK_fact_bidding_zone FOREIGN KEY (bidding_zone_id) REFERENCES dim_bidding_zone(bidding_zone_id)',
+            'CONSTRAINT FK_fact_weather_zone FOREIGN KEY (weather_zone_id) REFERENCES dim_weather_zone(weather_zone_id)',
+            'CONSTRAINT FK_fact_generation_type FOREIGN KEY (generation_type_id) REFERENCES dim_generation_type(generation_type_id)',
+            'CONSTRAINT FK_fact_weather_condition FOREIGN KEY (weather_condition_id) REFERENCES dim_weather_condition(weather_condition_id)',
+            'CONSTRAINT FK_fact_socioeconomic_profile FOREIGN KEY (socioeconomic_profile_id) REFERENCES dim_socioeconomic_profile(socioeconomic_profile_id)',
+        ),
+    ),
+}
+
+# DDL tabel o stałej strukturze - budowane raz przy imporcie
+TABLE_DDL = {table: _render_create(table, columns, constraints) for table, (columns, constraints) in TABLE_SPECS.items()}
+
+# Indeksy nieklastrowe: (nazwa, kolumny klucza, kolumny INCLUDE, filtr WHERE) - indeksy
+# na kluczach obcych dla złączeń walidacji/naprawy, indeks pokrywający oraz indeksy
+# filtrowane zawierające tylko wiersze z temperaturą poza zakresem (filtr nie może
+# zawierać OR, więc dolna i górna granica to osobne indeksy)
+TABLE_INDEXES: Dict[str, List[Tuple[str, Tuple[str, ...], Tuple[str, ...], Optional[str]]]] = {
+    'fact_energy_weather': [
+        ('IX_fact_date_id', ('date_id',), (), None),
+        ('IX_fact_time_id', ('time_id',), (), None),
+        ('IX_fact_bidding_zone_id', ('bidding_zone_id',), (), None),
+        ('IX_fact_weather_zone_id', ('weather_zone_id',), (), None),
+        ('IX_fact_generation_type_id', ('generation_type_id',), (), None),
+        ('IX_fact_weather_condition_id', ('weather_condition_id',), (), None),
+        ('IX_fact_socioeconomic_profile_id', ('socioeconomic_profile_id',), (), None),
+        ('IX_fact_dimension_keys', ('date_id', 'time_id', 'bidding_zone_id', 'weather_zone_id'), ('temperature_avg',), None),
+        ('IX_fact_bad_temp_low', ('temperature_avg',), (), 'temperature_avg < -80'),
+        ('IX_fact_bad_temp_high', ('temperature_avg',), (), 'temperature_avg > 80'),
+    ],
+}
+
+def _render_create_indexes(table_name: str, available_columns: Optional[List[str]] = None) -> str:
+    """
+    Złożenie instrukcji CREATE INDEX dla tabeli, każda tylko gdy indeksu brak
+    
+    Args:
+        table_name: Nazwa tabeli
+        available_columns: Kolumny tabeli - indeksy na innych kolumnach są pomijane
+        
+    Returns:
+        Paczka SQL tworząca brakujące indeksy (pusta, gdy nie ma czego tworzyć)
+    """
+    statements = []
+    for index_name, key_columns, include_columns, filter_predicate in TABLE_INDEXES.get(table_name, []):
+        if available_columns is not None and not set(key_columns + include_columns) <= set(available_columns):
+            continue
+        statement = (
+            f"IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{index_name}' "
+            f"AND object_id = OBJECT_ID('{table_name}'))\n"
+            f"    CREATE NONCLUSTERED INDEX {_qn(index_name)} ON {_qn(table_name)} "
+            f"({', '.join(_qn(col) for col in key_columns)})"
+        )
+        if include_columns:
+            statement += f" INCLUDE ({', '.join(_qn(col) for col in include_columns)})"
+        if filter_predicate:
+            statement += f" WHERE {filter_predicate}"
+        statements.append(statement)
+    return ";\n".join(statements)
+
+# Procedury ładowania - stały tekst, więc plany zostają w cache serwera między
+# uruchomieniami ETL, a każdy wymiar to jedno wywołanie zamiast kilku zapytań.
+# Wspólne kolumny są wyznaczane z sys.columns po stronie serwera.
+ETL_PROCEDURES = {
+    'sp_etl_load_dim': """
+CREATE OR ALTER PROCEDURE sp_etl_load_dim
+    @dim NVARCHAR(128),
+    @staging NVARCHAR(128),
+    @id_column NVARCHAR(128),
+    @business_key NVARCHAR(MAX) = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    
+    DECLARE @dim_object INT = OBJECT_ID(@dim), @staging_object INT = OBJECT_ID(@staging);
+    DECLARE @cols TABLE (name SYSNAME PRIMARY KEY, column_id INT, is_key BIT);
+    DECLARE @col_list NVARCHAR(MAX), @src_list NVARCHAR(MAX), @key_list NVARCHAR(MAX),
+            @on NVARCHAR(MAX), @set NVARCHAR(MAX), @sql NVARCHAR(MAX), @rows INT;
+    
+    INSERT INTO @cols (name, column_id, is_key)
+    SELECT t.name, t.column_id, CASE WHEN k.value IS NULL THEN 0 ELSE 1 END
+    FROM sys.columns t
+    JOIN sys.columns s ON s.object_id = @staging_object AND s.name = t.name
+    LEFT JOIN STRING_SPLIT(@business_key, ',') k ON k.value = t.name
+    WHERE t.object_id = @dim_object
+      AND t.name NOT IN (@id_column, 'id', 'created_at');
+    
+    -- Brak tabeli lub wspólnych kolumn - NULL zamiast liczby wierszy
+    IF NOT EXISTS (SELECT 1 FROM @cols)
+    BEGIN
+        SELECT CAST(NULL AS INT) AS loaded_rows;
+        RETURN;
+    END;
+    
+    SELECT @col_list = STRING_AGG(CAST(QUOTENAME(name) AS NVARCHAR(MAX)), ', ') WITHIN GROUP (ORDER BY column_id),
+           @src_list = STRING_AGG(CAST('s.' + QUOTENAME(name) AS NVARCHAR(MAX)), ', ') WITHIN GROUP (ORDER BY column_id)
+    FROM @cols;
+    SELECT @key_list = STRING_AGG(CAST(QUOTENAME(name) AS NVARCHAR(MAX)), ', ') WITHIN GROUP (ORDER BY column_id),
+           @on = STRING_AGG(CAST('t.' + QUOTENAME(name) + ' = s.' + QUOTENAME(name) AS NVARCHAR(MAX)), ' AND ')
+                 WITHIN GROUP (ORDER BY column_id)
+    FROM @cols WHERE is_key = 1;
+    SELECT @set = STRING_AGG(CAST(QUOTENAME(name) + ' = s.' + QUOTENAME(name) AS NVARCHAR(MAX)), ', ')
+                  WITHIN GROUP (ORDER BY column_id)
+    FROM @cols WHERE is_key = 0;
+    
+    -- Niepełny klucz biznesowy w staging zmieniłby ziarno MERGE - wtedy DELETE + INSERT
+    IF (SELECT COUNT(*) FROM @cols WHERE is_key = 1) < (SELECT COUNT(*) FROM STRING_SPLIT(@business_key, ','))
+        SET @on = NULL;
+    
+    IF @on IS NOT NULL
+        -- MERGE po kluczu biznesowym, duplikaty klucza w staging odrzucone, ID=0 nietknięte
+        SET @sql = N'MERGE ' + QUOTENAME(@dim) + N' AS t USING (SELECT ' + @col_list
+            + N' FROM (SELECT ' + @col_list + N', ROW_NUMBER() OVER (PARTITION BY ' + @key_list
+            + N' ORDER BY (SELECT NULL)) AS rn FROM ' + QUOTENAME(@staging) + N') AS d WHERE rn = 1) AS s ON ' + @on
+            + ISNULL(N' WHEN MATCHED AND t.' + QUOTENAME(@id_column) + N' > 0 THEN UPDATE SET ' + @set, N'')
+            + N' WHEN NOT MATCHED BY TARGET THEN INSERT (' + @col_list + N') VALUES (' + @src_list + N');'
+            + N' SET @rows = @@ROWCOUNT;';
+    ELSE
+        -- Bez klucza biznesowego - wymiana wszystkich rekordów oprócz ID=0
+        SET @sql = N'DELETE FROM ' + QUOTENAME(@dim) + N' WHERE ' + QUOTENAME(@id_column) + N' > 0;'
+            + N' INSERT INTO ' + QUOTENAME(@dim) + N' (' + @col_list + N') SELECT ' + @col_list
+            + N' FROM ' + QUOTENAME(@staging) + N';'
+            + N' SET @rows = @@ROWCOUNT;';
+    
+    EXEC sp_executesql @sql, N'@rows INT OUTPUT', @rows = @rows OUTPUT;
+    SELECT @rows AS loaded_rows;
+END
+""",
+    'sp_etl_load_fact': """
+CREATE OR ALTER PROCEDURE sp_etl_load_fact
+    @fact NVARCHAR(128),
+    @staging NVARCHAR(128)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    
+    DECLARE @fact_object INT = OBJECT_ID(@fact), @staging_object INT = OBJECT_ID(@staging);
+    DECLARE @cols TABLE (name SYSNAME PRIMARY KEY, column_id INT);
+    DECLARE @col_list NVARCHAR(MAX), @fk_set NVARCHAR(MAX), @fk_where NVARCHAR(MAX),
+            @sql NVARCHAR(MAX), @repaired INT = 0, @rows INT;
+    
+    INSERT INTO @cols (name, column_id)
+    SELECT t.name, t.column_id
+    FROM sys.columns t
+    JOIN sys.columns s ON s.object_id = @staging_object AND s.name = t.name
+    WHERE t.object_id = @fact_object
+      AND t.name NOT IN ('energy_weather_id', 'fact_id', 'id', 'created_at');
+    
+    IF NOT EXISTS (SELECT 1 FROM @cols)
+    BEGIN
+        SELECT CAST(NULL AS INT) AS repaired_rows, CAST(NULL AS INT) AS loaded_rows;
+        RETURN;
+    END;
+    
+    SELECT @col_list = STRING_AGG(CAST(QUOTENAME(name) AS NVARCHAR(MAX)), ', ') WITHIN GROUP (ORDER BY column_id)
+    FROM @cols;
+    SELECT @fk_set = STRING_AGG(CAST(QUOTENAME(name) + ' = ISNULL(' + QUOTENAME(name) + ', 0)' AS NVARCHAR(MAX)), ', ')
+                     WITHIN GROUP (ORDER BY column_id),
+           @fk_where = STRING_AGG(CAST(QUOTENAME(name) + ' IS NULL' AS NVARCHAR(MAX)), ' OR ')
+                       WITHIN GROUP (ORDER BY column_id)
+    FROM @cols WHERE name LIKE '%[_]id';
+    
+    -- NULL w kluczach obcych staging -> 0 (rekord domyślny), tylko brudne wiersze
+    IF @fk_set IS NOT NULL
+    BEGIN
+        SET @sql = N'UPDATE ' + QUOTENAME(@staging) + N' SET ' + @fk_set + N' WHERE ' + @fk_where
+            + N'; SET @repaired = @@ROWCOUNT;';
+        EXEC sp_executesql @sql, N'@repaired INT OUTPUT', @repaired = @repaired OUTPUT;
+    END;
+    
+    -- TRUNCATE i INSERT WITH (TABLOCK) w transakcji wywołującego - logowanie minimalne
+    SET @sql = N'TRUNCATE TABLE ' + QUOTENAME(@fact) + N';'
+        + N' INSERT INTO ' + QUOTENAME(@fact) + N' WITH (TABLOCK) (' + @col_list + N') SELECT ' + @col_list
+        + N' FROM ' + QUOTENAME(@staging) + N';'
+        + N' SET @rows = @@ROWCOUNT;';
+    EXEC sp_executesql @sql, N'@rows INT OUTPUT', @rows = @rows OUTPUT;
+    
+    SELECT @repaired AS repaired_rows, @rows AS loaded_rows;
+END
+""",
+}
+
+# Kolumny klucza głównego znanych wymiarów (tylko do odczytu)
+_DIM_ID_MAP = MappingProxyType({
+    'dim_date': 'date_id',
+    'dim_time': 'time_id',
+    'dim_bidding_zone': 'bidding_zone_id',
+    'dim_weather_zone': 'weather_zone_id',
+    'dim_generation_type': 'generation_type_id',
+    'dim_weather_condition': 'weather_condition_id',
+    'dim_socioeconomic_profile': 'socioeconomic_profile_id',
+})
+
 class DataCleaner:
     """Klasa czyszcząca i ładująca dane do hurtowni"""
     
+    # Klucze biznesowe wymiarów - dopasowanie wierszy staging przy MERGE
+    dimension_business_keys = {
+        'dim_date': ('full_date',),
+        'dim_time': ('hour', 'minute'),
+        'dim_bidding_zone': ('bidding_zone_code', 'year'),
+        'dim_weather_zone': ('weather_zone_name',),
+        'dim_generation_type': ('entso_code',),
+        'dim_weather_condition': ('condition_type', 'condition_severity'),
+        'dim_socioeconomic_profile': ('bidding_zone_code', 'country_code', 'year'),
+    }
+    
+    # Klucze obce tabeli faktów: (kolumna, tabela wymiarów)
+    fact_foreign_keys = (
+        ('date_id', 'dim_date'),
+        ('time_id', 'dim_time'),
+        ('bidding_zone_id', 'dim_bidding_zone'),
+        ('weather_zone_id', 'dim_weather_zone'),
+        ('generation_type_id', 'dim_generation_type'),
+        ('weather_condition_id', 'dim_weather_condition'),
+        ('socioeconomic_profile_id', 'dim_socioeconomic_profile'),
+    )
+    
+    # Wymiary obowiązkowe - fakty bez nich są raportowane jako NULL/0
+    required_fact_keys = ('date_id', 'time_id', 'bidding_zone_id', 'weather_zone_id')
+    
+    # Walidacja po stronie klienta (zbiory kluczy wymiarów) do tej liczby faktów;
+    # większe tabele są walidowane jednym zapytaniem na serwerze
+    client_validation_max_rows = 500000
+    client_validation_chunk_size = 50000
+    
+    # Mapowanie kolumn ID dla wymiarów - znane wymiary bez zapytań do bazy
+    dimension_id_columns = _DIM_ID_MAP
+    
     def __init__(self, connection_string: str):
         """
         Inicjalizacja czyszczenia danych
@@ -55,16 +352,37 @@ class DataCleaner:
             'staging_eurostat_integrated': 'src_eurostat_integrated'
         }
         
-        # Mapowanie kolumn ID dla wymiarów
-        self.dimension_id_columns = {
-            'dim_date': 'date_id',
-            'dim_time': 'time_id',
-            'dim_bidding_zone': 'bidding_zone_id',
-            'dim_weather_zone': 'weather_zone_id',
-            'dim_generation_type': 'generation_type_id',
-            'dim_weather_condition': 'weather_condition_id',
-            'dim_socioeconomic_profile': 'socioeconomic_profile_id'
-        }
+        # Jedno połączenie na cały proces ETL (otwierane przy pierwszym użyciu)
+        self._conn = None
+        
+        # Cache istniejących tabel (wypełniany jednym zapytaniem do sys.tables)
+        self._known_tables: Optional[set] = None
+        
+        # Liczby wierszy staging zapisane przez check_staging_tables
+        self._staging_rowcounts: Dict[str, int] = {}
+        
+        # Kolumny tabel schematu dbo (jedno zapytanie do INFORMATION_SCHEMA.COLUMNS)
+        self._schema_cache: Optional[Dict[str, list]] = None
+        
+        # Procedury ETL tworzone raz na instancję (CREATE OR ALTER)
+        self._procedures_deployed = False
+        
+        # Teksty SQL walidacji/naprawy - zależą tylko od stałego mapowania
+        # kolumn ID, więc są budowane raz na instancję
+        self._prepared: Dict[Any, str] = {}
+        
+        # Czy istnieje sp_log_etl_process (None - jeszcze nie sprawdzono)
+        self._proc_exists: Optional[bool] = None
+        # Czy tabela etl_process_log została już sprawdzona/utworzona
+        self._log_table_ensured = False
+        
+        # Połączenia wątków roboczych (równoległe ładowanie wymiarów)
+        self._tls = threading.local()
+        self._worker_connections = []
+        self._worker_connections_lock = threading.Lock()
+        
+        # Kolumny ID wymiarów spoza _DIM_ID_MAP (wykryte z metadanych)
+        self._dim_id_cache: Dict[str, str] = {}
         
         # Domyślne wartości dla nieznanych wartości w wymiarach
         self.default_dimension_values = {
@@ -159,6 +477,107 @@ class DataCleaner:
             }
         }
     
+    def _get_conn(self):
+        """
+        Wspólne połączenie dla wszystkich kroków ETL - bez handshake TCP/auth
+        przy każdej metodzie
+        
+        Returns:
+            Otwarte połączenie z bazą danych
+        """
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+    
+    def _connect(self):
+        """
+        Nowe połączenie z ustawieniami sesji
+        
+        NOCOUNT ON - serwer nie wysyła komunikatów "n rows affected" po każdej
+        instrukcji, więc cursor.rowcount nie jest dostępny; liczby wierszy
+        są odczytywane przez SELECT @@ROWCOUNT (_execute_counted).
+        
+        Returns:
+            Otwarte połączenie z bazą danych
+        """
+        conn = pyodbc.connect(self.connection_string)
+        conn.cursor().execute("SET NOCOUNT ON; SET ARITHABORT ON; SET ANSI_WARNINGS ON")
+        return conn
+    
+    @staticmethod
+    def _cursor(conn):
+        """Kursor z włączonym fast_executemany - executemany wysyła tablice parametrów w jednym RPC"""
+        cursor = conn.cursor()
+        cursor.fast_executemany = True
+        return cursor
+    
+    @staticmethod
+    def _execute_counted(cursor, sql: str) -> int:
+        """
+        Wykonanie instrukcji i zwrócenie liczby przetworzonych wierszy (sesje mają NOCOUNT ON)
+        
+        Args:
+            cursor: Kursor bazy danych
+            sql: Instrukcja modyfikująca dane
+            
+        Returns:
+            Liczba wierszy z @@ROWCOUNT
+        """
+        cursor.execute(f"{sql};\nSELECT @@ROWCOUNT")
+        return cursor.fetchone()[0]
+    
+    def _deploy_etl_procedures(self, conn):
+        """
+        Utworzenie/aktualizacja procedur ładowania (raz na instancję)
+        
+        Args:
+            conn: Połączenie z bazą danych
+        """
+        if self._procedures_deployed:
+            return
+        
+        cursor = self._cursor(conn)
+        for procedure_name, procedure_sql in ETL_PROCEDURES.items():
+            self.logger.info(f"Deploying procedure {procedure_name}")
+            cursor.execute(procedure_sql)
+        conn.commit()
+        self._procedures_deployed = True
+    
+    def _worker_conn(self):
+        """
+        Połączenie przypięte do bieżącego wątku roboczego - otwierane przy pierwszym użyciu
+        
+        Returns:
+            Połączenie bieżącego wątku
+        """
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._tls.conn = conn
+            with self._worker_connections_lock:
+                self._worker_connections.append(conn)
+        return conn
+    
+    def _close_worker_connections(self):
+        """Zamknięcie połączeń wątków roboczych"""
+        with self._worker_connections_lock:
+            worker_connections, self._worker_connections = self._worker_connections, []
+        for conn in worker_connections:
+            try:
+                conn.close()
+            except:
+                pass
+        self._tls = threading.local()
+    
+    def close(self):
+        """Zamknięcie wspólnego połączenia"""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except:
+                pass
+            self._conn = None
+    
     def check_staging_tables(self) -> Dict[str, int]:
         """
         Sprawdzenie, które tabele staging zawierają dane
@@ -170,38 +589,186 @@ class DataCleaner:
         results = {}
         
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            conn = self._get_conn()
+            cursor = self._cursor(conn)
+            
+            # Jedno zapytanie do metadanych zamiast COUNT(*) dla każdej tabeli
+            cursor.execute("""
+                SELECT t.name, ISNULL(SUM(p.rows), 0) AS row_count
+                FROM sys.tables t
+                LEFT JOIN sys.partitions p
+                    ON p.object_id = t.object_id AND p.index_id IN (0, 1)
+                WHERE t.name LIKE 'staging[_]%'
+                GROUP BY t.name
+            """)
+            existing = {row[0]: int(row[1]) for row in cursor.fetchall()}
             
             for staging_table in self.staging_to_target_tables.keys():
-                try:
-                    cursor.execute(f"""
-                        IF OBJECT_ID('{staging_table}', 'U') IS NOT NULL
-                            SELECT COUNT(*) FROM {staging_table}
-                        ELSE
-                            SELECT -1
-                    """)
-                    
-                    row_count = cursor.fetchone()[0]
-                    
-                    if row_count >= 0:
-                        self.logger.info(f"Table {staging_table} exists with {row_count} records")
-                        results[staging_table] = row_count
-                    else:
-                        self.logger.warning(f"Table {staging_table} does not exist")
-                        results[staging_table] = 0
-                    
-                except Exception as e:
-                    self.logger.error(f"Error checking table {staging_table}: {str(e)}")
+                if staging_table in existing:
+                    row_count = existing[staging_table]
+                    self.logger.info(f"Table {staging_table} exists with {row_count} records")
+                    results[staging_table] = row_count
+                else:
+                    self.logger.warning(f"Table {staging_table} does not exist")
                     results[staging_table] = 0
             
-            conn.close()
+            self._staging_rowcounts = dict(results)
             return results
             
         except Exception as e:
             self.logger.error(f"Error connecting to database: {str(e)}")
             return {}
     
+    def _get_table_columns(self, cursor, table_name: str) -> list:
+        """
+        Kolumny tabeli z cache schematu
+        
+        Przy pierwszym użyciu pobiera kolumny wszystkich tabel schematu dbo
+        jednym zapytaniem; tabela nieobecna w cache (np. utworzona później)
+        jest doczytywana osobno.
+        
+        Args:
+            cursor: Kursor bazy danych
+            table_name: Nazwa tabeli
+            
+        Returns:
+            Lista wierszy (COLUMN_NAME, DATA_TYPE, CHARACTER_MAXIMUM_LENGTH,
+            NUMERIC_PRECISION, NUMERIC_SCALE, ORDINAL_POSITION) w kolejności kolumn
+        """
+        columns_sql = """
+            SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, CHARACTER_MAXIMUM_LENGTH,
+                   NUMERIC_PRECISION, NUMERIC_SCALE, ORDINAL_POSITION
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = 'dbo'
+        """
+        
+        if self._schema_cache is None:
+            cursor.execute(columns_sql + " ORDER BY TABLE_NAME, ORDINAL_POSITION")
+            self._schema_cache = {
+                table: list(rows)
+                for table, rows in itertools.groupby(cursor.fetchall(), key=lambda row: row.TABLE_NAME)
+            }
+        
+        if table_name not in self._schema_cache:
+            cursor.execute(columns_sql + " AND TABLE_NAME = ? ORDER BY ORDINAL_POSITION", table_name)
+            rows = cursor.fetchall()
+            if not rows:
+                return []
+            self._schema_cache[table_name] = rows
+        
+        return self._schema_cache[table_name]
+    
+    def _get_column_names(self, cursor, table_name: str, exclude: Tuple[str, ...] = ()) -> List[str]:
+        """
+        Nazwy kolumn tabeli z cache schematu, bez kolumn z listy exclude
+        
+        Args:
+            cursor: Kursor bazy danych
+            table_name: Nazwa tabeli
+            exclude: Kolumny do pominięcia
+            
+        Returns:
+            Lista nazw kolumn w kolejności ORDINAL_POSITION
+        """
+        return [
+            row.COLUMN_NAME for row in self._get_table_columns(cursor, table_name)
+            if row.COLUMN_NAME not in exclude
+        ]
+    
+    def _reset_metadata_caches(self):
+        """Wyczyszczenie cache metadanych (teksty SQL walidacji zostają)"""
+        self._schema_cache = None
+        self._known_tables = None
+        self._dim_id_cache.clear()
+        self._proc_exists = None
+        self._log_table_ensured = False
+    
+    def _invalidate_schema_cache(self, table_name: str):
+        """Usunięcie tabeli z cache schematu po zmianie jej struktury"""
+        if self._schema_cache is not None:
+            self._schema_cache.pop(table_name, None)
+    
+    def _get_existing_tables(self, cursor, refresh: bool = False) -> set:
+        """
+        Pobranie zbioru istniejących tabel użytkownika (jedno zapytanie, wynik w cache)
+        
+        Args:
+            cursor: Kursor bazy danych
+            refresh: Wymuszenie ponownego odczytu z sys.tables
+            
+        Returns:
+            Zbiór nazw istniejących tabel (małymi literami)
+        """
+        if self._known_tables is None or refresh:
+            cursor.execute("SELECT LOWER(name) FROM sys.tables")
+            self._known_tables = {row[0] for row in cursor.fetchall()}
+        return self._known_tables
+    
+    def _object_exists(self, cursor, table_name: str) -> bool:
+        """
+        Sprawdzenie istnienia tabeli jednym sparametryzowanym zapytaniem
+        
+        Nazwa idzie jako parametr, więc wszystkie sprawdzenia współdzielą
+        jeden plan w cache serwera zamiast osobnego planu ad-hoc na nazwę.
+        """
+        cursor.execute("SELECT CASE WHEN OBJECT_ID(?, 'U') IS NOT NULL THEN 1 ELSE 0 END", table_name)
+        return cursor.fetchone()[0] == 1
+    
+    def _table_exists(self, cursor, table_name: str) -> bool:
+        """
+        Sprawdzenie istnienia tabeli na podstawie cache; przy braku trafienia
+        sprawdzana jest tylko ta tabela (mogła powstać w międzyczasie)
+        """
+        table_name = table_name.lower()
+        existing = self._get_existing_tables(cursor)
+        if table_name in existing:
+            return True
+        if self._object_exists(cursor, table_name):
+            existing.add(table_name)
+            return True
+        return False
+    
+    def _get_staging_count(self, cursor, staging_table: str) -> int:
+        """
+        Liczba wierszy tabeli staging - z wyniku check_staging_tables, a gdy
+        go brak, z metadanych sys.partitions bez skanu tabeli (0 gdy tabela nie istnieje)
+        
+        Args:
+            cursor: Kursor bazy danych
+            staging_table: Nazwa tabeli staging
+            
+        Returns:
+            Liczba wierszy
+        """
+        if staging_table in self._staging_rowcounts:
+            return self._staging_rowcounts[staging_table]
+        
+        # Staging nie jest tworzony przez ten proces - wystarczy zbiór bez odświeżania
+        if staging_table.lower() not in self._get_existing_tables(cursor):
+            return 0
+        
+        return self._fast_count(cursor, staging_table)
+    
+    def _fast_count(self, cursor, table_name: str) -> int:
+        """
+        Liczba wierszy tabeli z metadanych partycji - stały czas zamiast skanu COUNT(*)
+        
+        Wartość z sys.partitions może chwilowo odbiegać od dokładnej przy
+        równoległych zapisach, więc służy do logowania i decyzji o pominięciu.
+        
+        Args:
+            cursor: Kursor bazy danych
+            table_name: Nazwa tabeli
+            
+        Returns:
+            Liczba wierszy (0 gdy tabela nie istnieje)
+        """
+        cursor.execute("""
+            SELECT ISNULL(SUM(rows), 0) FROM sys.partitions
+            WHERE object_id = OBJECT_ID(?) AND index_id IN (0, 1)
+        """, table_name)
+        return int(cursor.fetchone()[0])
+    
     def ensure_target_tables_exist(self) -> bool:
         """
         Upewnienie się, że tabele docelowe istnieją i mają właściwą strukturę
@@ -212,8 +779,11 @@ class DataCleaner:
         self.logger.info("Ensuring target tables exist")
         
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            conn = self._get_conn()
+            cursor = self._cursor(conn)
+            
+            # Jedno zapytanie o wszystkie istniejące tabele zamiast IF OBJECT_ID dla każdej
+            existing = self._get_existing_tables(cursor, refresh=True)
             
             # Upewnij się, że tabele wymiarów istnieją
             dimensions = [
@@ -224,35 +794,16 @@ class DataCleaner:
             for dim in dimensions:
                 staging_table = f"staging_{dim}"
                 
-                # Sprawdź czy tabela docelowa istnieje
-                cursor.execute(f"""
-                    IF OBJECT_ID('{dim}', 'U') IS NOT NULL
-                        SELECT 1
-                    ELSE
-                        SELECT 0
-                """)
-                
-                table_exists = cursor.fetchone()[0]
-                
-                if not table_exists:
+                if dim not in existing:
                     self.logger.info(f"Creating table {dim} from staging")
                     
-                    # Sprawdź czy tabela staging istnieje
-                    cursor.execute(f"""
-                        IF OBJECT_ID('{staging_table}', 'U') IS NOT NULL
-                            SELECT 1
-                        ELSE
-                            SELECT 0
-                    """)
-                    
-                    staging_exists = cursor.fetchone()[0]
-                    
-                    if not staging_exists:
+                    if staging_table not in existing:
                         self.logger.error(f"Staging table {staging_table} does not exist")
                         self._create_default_dimension_table(conn, dim)
                     else:
                         # Utwórz tabelę docelową na podstawie stagingu
                         self._create_target_from_staging(conn, staging_table, dim)
+                    existing.add(dim)
                 else:
                     self.logger.info(f"Table {dim} already exists")
                     
@@ -260,33 +811,16 @@ class DataCleaner:
                     self._ensure_default_dimension_record(conn, dim)
             
             # Upewnij się, że tabela faktów istnieje
-            cursor.execute("""
-                IF OBJECT_ID('fact_energy_weather', 'U') IS NOT NULL
-                    SELECT 1
-                ELSE
-                    SELECT 0
-            """)
-            
-            fact_table_exists = cursor.fetchone()[0]
-            
-            if not fact_table_exists:
+            if 'fact_energy_weather' not in existing:
                 self.logger.info("Creating fact table")
-                # Sprawdź czy tabela staging istnieje
-                cursor.execute("""
-                    IF OBJECT_ID('staging_fact_energy_weather', 'U') IS NOT NULL
-                        SELECT 1
-                    ELSE
-                        SELECT 0
-                """)
-                
-                staging_fact_exists = cursor.fetchone()[0]
                 
-                if not staging_fact_exists:
+                if 'staging_fact_energy_weather' not in existing:
                     self.logger.error("Staging fact table does not exist")
                     self._create_default_fact_table(conn)
                 else:
                     # Utwórz tabelę faktów na podstawie stagingu
                     self._create_target_from_staging(conn, 'staging_fact_energy_weather', 'fact_energy_weather')
+                existing.add('fact_energy_weather')
             else:
                 self.logger.info("Fact table already exists")
             
@@ -299,36 +833,20 @@ class DataCleaner:
             for src_table in source_tables:
                 staging_table = f"staging_{src_table.replace('src_', '')}"
                 
-                cursor.execute(f"""
-                    IF OBJECT_ID('{src_table}', 'U') IS NOT NULL
-                        SELECT 1
-                    ELSE
-                        SELECT 0
-                """)
-                
-                table_exists = cursor.fetchone()[0]
-                
-                if not table_exists:
-                    self.logger.info(f"Creating source table {src_table} from staging")
-                    
-                    cursor.execute(f"""
-                        IF OBJECT_ID('{staging_table}', 'U') IS NOT NULL
-                            SELECT 1
-                        ELSE
-                            SELECT 0
-                    """)
-                    
-                    staging_exists = cursor.fetchone()[0]
-                    
-                    if not staging_exists:
+                if src_table not in existing:
+                    if staging_table not in existing:
                         self.logger.warning(f"Staging table {staging_table} does not exist, skipping {src_table}")
+                    elif self._staging_rowcounts.get(staging_table, 0) > 0:
+                        # Tabela zostanie utworzona razem z danymi przez SELECT ... INTO
+                        self.logger.info(f"Source table {src_table} will be created from staging during load")
                     else:
+                        self.logger.info(f"Creating source table {src_table} from staging")
                         # Utwórz tabelę źródłową na podstawie stagingu
                         self._create_target_from_staging(conn, staging_table, src_table)
+                        existing.add(src_table)
                 else:
                     self.logger.info(f"Source table {src_table} already exists")
             
-            conn.close()
             return True
             
         except Exception as e:
@@ -345,40 +863,29 @@ class DataCleaner:
             target_table: Nazwa tabeli docelowej
         """
         try:
-            cursor = conn.cursor()
-            
-            # Pobierz strukturę tabeli staging
-            cursor.execute(f"""
-                SELECT COLUMN_NAME, DATA_TYPE, CHARACTER_MAXIMUM_LENGTH, 
-                       NUMERIC_PRECISION, NUMERIC_SCALE
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_NAME = '{staging_table}'
-                ORDER BY ORDINAL_POSITION
-            """)
+            cursor = self._cursor(conn)
             
-            columns = cursor.fetchall()
+            # Pobierz strukturę tabeli staging (z cache schematu)
+            columns = self._get_table_columns(cursor, staging_table)
             
             if not columns:
                 self.logger.error(f"No columns found for {staging_table}")
                 return
             
             # Przygotuj definicję kolumn
-            column_defs = []
+            column_specs: List[ColumnSpec] = []
             primary_key = None
             
             # Jeśli to tabela wymiarów, użyj odpowiedniego id
             if target_table.startswith('dim_'):
-                id_col = self.dimension_id_columns.get(target_table, f"{target_table.replace('dim_', '')}_id")
-                primary_key = id_col
-                column_defs.append(f"{primary_key} BIGINT IDENTITY(1,1) PRIMARY KEY")
+                primary_key = self.dimension_id_columns.get(target_table, f"{target_table.replace('dim_', '')}_id")
             # Jeśli to tabela faktów, użyj energy_weather_id
             elif target_table == 'fact_energy_weather':
                 primary_key = 'energy_weather_id'
-                column_defs.append(f"{primary_key} BIGINT IDENTITY(1,1) PRIMARY KEY")
             # Dla tabel źródłowych użyj standardowego formatu
             else:
                 primary_key = f"{target_table.replace('src_', '')}_id"
-                column_defs.append(f"{primary_key} BIGINT IDENTITY(1,1) PRIMARY KEY")
+            column_specs.append((primary_key, "BIGINT IDENTITY(1,1) PRIMARY KEY"))
             
             for col in columns:
                 col_name = col.COLUMN_NAME
@@ -401,22 +908,23 @@ class DataCleaner:
                     elif data_type in ['decimal', 'numeric']:
                         type_def = f"{data_type}({precision},{scale})"
                     
-                    column_defs.append(f"{col_name} {type_def}")
+                    column_specs.append((col_name, type_def))
             
             # Dodaj kolumnę created_at jeśli nie istnieje
             if not any(col.COLUMN_NAME.lower() == 'created_at' for col in columns):
-                column_defs.append("created_at DATETIME2 DEFAULT GETDATE()")
+                column_specs.append(("created_at", "DATETIME2 DEFAULT GETDATE()"))
             
             # Utwórz tabelę docelową
-            create_sql = f"""
-            CREATE TABLE {target_table} (
-                {', '.join(column_defs)}
-            )
-            """
+            create_sql = _render_create(target_table, column_specs)
             
             self.logger.info(f"Creating table {target_table}")
             cursor.execute(create_sql)
+            
+            index_sql = _render_create_indexes(target_table, [name for name, _ in column_specs])
+            if index_sql:
+                cursor.execute(index_sql)
             conn.commit()
+            self._invalidate_schema_cache(target_table)
             
             self.logger.info(f"Table {target_table} created successfully")
             
@@ -424,6 +932,50 @@ class DataCleaner:
             self.logger.error(f"Error creating target table {target_table}: {str(e)}")
             conn.rollback()
     
+    def _select_into_source_from_staging(self, conn, staging_table: str, target_table: str) -> Optional[int]:
+        """
+        Utworzenie tabeli źródłowej i załadowanie danych jednym SELECT ... INTO
+        (minimalnie logowane, jedno przejście po stagingu)
+        
+        Args:
+            conn: Połączenie z bazą danych
+            staging_table: Nazwa tabeli staging
+            target_table: Nazwa tabeli docelowej (src_*)
+            
+        Returns:
+            Liczba wstawionych rekordów lub None gdy trzeba użyć CREATE + INSERT
+        """
+        cursor = self._cursor(conn)
+        primary_key = f"{target_table.replace('src_', '')}_id"
+        columns = self._get_column_names(cursor, staging_table, exclude=('id', 'created_at'))
+        
+        if not columns:
+            return None
+        
+        select_into_sql = f"""
+            SELECT IDENTITY(BIGINT, 1, 1) AS {primary_key},
+                   {', '.join(f's.{col}' for col in columns)},
+                   CAST(GETDATE() AS DATETIME2) AS created_at
+            INTO {_qn(target_table)}
+            FROM {_qn(staging_table)} s WITH (NOLOCK)
+            OPTION (MAXDOP 0)
+        """
+        
+        try:
+            inserted_count = self._execute_counted(cursor, select_into_sql)
+            # Ta sama struktura co przy CREATE TABLE: klucz główny i domyślny created_at
+            cursor.execute(f"ALTER TABLE {_qn(target_table)} ADD PRIMARY KEY ({primary_key})")
+            cursor.execute(f"ALTER TABLE {_qn(target_table)} ADD DEFAULT GETDATE() FOR created_at")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            self.logger.warning(f"SELECT INTO {target_table} failed, falling back to CREATE + INSERT: {str(e)}")
+            return None
+        
+        self._invalidate_schema_cache(target_table)
+        self._get_existing_tables(cursor).add(target_table.lower())
+        return inserted_count
+    
     def _create_default_dimension_table(self, conn, dim_table: str):
         """
         Tworzenie domyślnej tabeli wymiarów, gdy tabela staging nie istnieje
@@ -433,7 +985,7 @@ class DataCleaner:
             dim_table: Nazwa tabeli wymiarów
         """
         try:
-            cursor = conn.cursor()
+            cursor = self._cursor(conn)
             
             # Pobierz domyślne wartości i strukture
             default_values = self.default_dimension_values.get(dim_table, {})
@@ -446,12 +998,11 @@ class DataCleaner:
             id_column = f"{dim_table.replace('dim_', '')}_id"  # np. date_id, time_id
             
             # Przygotuj definicję kolumn
-            column_defs = []
+            column_specs: List[ColumnSpec] = []
             insert_columns = []
-            insert_values = []
             
             # Dodaj klucz główny
-            column_defs.append(f"{id_column} BIGINT IDENTITY(0,1) PRIMARY KEY")
+            column_specs.append((id_column, "BIGINT IDENTITY(0,1) PRIMARY KEY"))
             
             for col_name, default_value in default_values.items():
                 if col_name == f"{dim_table}_id" or col_name == id_column:
@@ -474,45 +1025,23 @@ class DataCleaner:
                 else:
                     col_type = "NVARCHAR(100)"
                 
-                column_defs.append(f"{col_name} {col_type}")
+                column_specs.append((col_name, col_type))
                 insert_columns.append(col_name)
-                
-                # Przygotuj wartości do wstawienia
-                if isinstance(default_value, str):
-                    insert_values.append(f"'{default_value}'")
-                elif isinstance(default_value, (int, float)):
-                    insert_values.append(str(default_value))
-                elif isinstance(default_value, bool):
-                    insert_values.append('1' if default_value else '0')
-                elif isinstance(default_value, (date, datetime)):
-                    insert_values.append(f"'{default_value.isoformat()}'")
-                else:
-                    insert_values.append("NULL")
             
             # Dodaj kolumnę created_at
-            column_defs.append("created_at DATETIME2 DEFAULT GETDATE()")
+            column_specs.append(("created_at", "DATETIME2 DEFAULT GETDATE()"))
             
             # Utwórz tabelę
-            create_sql = f"""
-            CREATE TABLE {dim_table} (
-                {', '.join(column_defs)}
-            )
-            """
+            create_sql = _render_create(dim_table, column_specs)
             
             self.logger.info(f"Creating default dimension table {dim_table}")
             cursor.execute(create_sql)
+            self._invalidate_schema_cache(dim_table)
             
             # Wstaw domyślny rekord z ID=0
-            if insert_columns and insert_values:
-                insert_sql = f"""
-                SET IDENTITY_INSERT {dim_table} ON;
-                INSERT INTO {dim_table} ({id_column}, {', '.join(insert_columns)})
-                VALUES (0, {', '.join(insert_values)});
-                SET IDENTITY_INSERT {dim_table} OFF;
-                """
-                
+            if insert_columns:
                 self.logger.info(f"Inserting default record to {dim_table}")
-                cursor.execute(insert_sql)
+                self._upsert_default_row(cursor, dim_table, insert_columns)
             
             conn.commit()
             self.logger.info(f"Default dimension table {dim_table} created successfully")
@@ -529,52 +1058,13 @@ class DataCleaner:
             conn: Połączenie z bazą danych
         """
         try:
-            cursor = conn.cursor()
-            
-            # Standardowa struktura tabeli faktów
-            create_sql = """
-            CREATE TABLE fact_energy_weather (
-                fact_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                date_id INT NOT NULL,
-                time_id INT NOT NULL,
-                bidding_zone_id INT NOT NULL,
-                weather_zone_id INT NOT NULL,
-                generation_type_id INT,
-                weather_condition_id INT,
-                socioeconomic_profile_id INT,
-                actual_consumption DECIMAL(15,2),
-                forecasted_consumption DECIMAL(15,2),
-                consumption_deviation DECIMAL(10,2),
-                generation_amount DECIMAL(15,2),
-                capacity_factor DECIMAL(5,2),
-                renewable_percentage DECIMAL(5,2),
-                per_capita_consumption DECIMAL(10,5),
-                temperature_avg DECIMAL(5,2),
-                temperature_min DECIMAL(5,2),
-                temperature_max DECIMAL(5,2),
-                humidity DECIMAL(5,2),
-                precipitation DECIMAL(8,2),
-                wind_speed DECIMAL(5,2),
-                wind_direction INT,
-                cloud_cover DECIMAL(5,2),
-                solar_radiation DECIMAL(8,2),
-                air_pressure DECIMAL(8,2),
-                heating_degree_days DECIMAL(5,2),
-                cooling_degree_days DECIMAL(5,2),
-                created_at DATETIME2 DEFAULT GETDATE(),
-                CONSTRAINT FK_fact_date FOREIGN KEY (date_id) REFERENCES dim_date(date_id),
-                CONSTRAINT FK_fact_time FOREIGN KEY (time_id) REFERENCES dim_time(time_id),
-                CONSTRAINT FK_fact_bidding_zone FOREIGN KEY (bidding_zone_id) REFERENCES dim_bidding_zone(bidding_zone_id),
-                CONSTRAINT FK_fact_weather_zone FOREIGN KEY (weather_zone_id) REFERENCES dim_weather_zone(weather_zone_id),
-                CONSTRAINT FK_fact_generation_type FOREIGN KEY (generation_type_id) REFERENCES dim_generation_type(generation_type_id),
-                CONSTRAINT FK_fact_weather_condition FOREIGN KEY (weather_condition_id) REFERENCES dim_weather_condition(weather_condition_id),
-                CONSTRAINT FK_fact_socioeconomic_profile FOREIGN KEY (socioeconomic_profile_id) REFERENCES dim_socioeconomic_profile(socioeconomic_profile_id)
-            )
-            """
+            cursor = self._cursor(conn)
             
             self.logger.info("Creating default fact_energy_weather table")
-            cursor.execute(create_sql)
+            cursor.execute(TABLE_DDL['fact_energy_weather'])
+            cursor.execute(_render_create_indexes('fact_energy_weather'))
             conn.commit()
+            self._invalidate_schema_cache('fact_energy_weather')
             
             self.logger.info("Default fact table created successfully")
             
@@ -582,6 +1072,48 @@ class DataCleaner:
             self.logger.error(f"Error creating default fact table: {str(e)}")
             conn.rollback()
     
+    def _upsert_default_row(self, cursor, dim_table: str, columns: Optional[List[str]] = None) -> int:
+        """
+        Wstawienie rekordu domyślnego (ID=0) jednym MERGE, jeśli go brakuje
+        
+        Sprawdzenie istnienia i wstawienie to jedna paczka (IDENTITY_INSERT, MERGE
+        z konstruktorem VALUES), wartości z self.default_dimension_values idą jako
+        parametry (kolumny bez wartości domyślnej dostają NULL).
+        
+        Args:
+            cursor: Kursor bazy danych
+            dim_table: Nazwa tabeli wymiarów
+            columns: Kolumny do wypełnienia (domyślnie wszystkie poza kluczem i created_at)
+            
+        Returns:
+            1 jeśli rekord został dodany, 0 jeśli już istniał
+        """
+        id_column = self._get_dimension_id_column(dim_table)
+        if columns is None:
+            columns = self._get_column_names(cursor, dim_table, exclude=(id_column, 'created_at'))
+        
+        default_values = self.default_dimension_values.get(dim_table, {})
+        params = [default_values.get(col) for col in columns]
+        
+        cursor.execute(f"""
+            DECLARE @added INT;
+            SET IDENTITY_INSERT {_qn(dim_table)} ON;
+            MERGE {_qn(dim_table)} AS t
+            USING (VALUES (0)) AS s({id_column})
+            ON t.{id_column} = s.{id_column}
+            WHEN NOT MATCHED THEN
+                INSERT ({', '.join([id_column] + columns)})
+                VALUES ({', '.join(['0'] + ['?'] * len(columns))});
+            SET @added = @@ROWCOUNT;
+            SET IDENTITY_INSERT {_qn(dim_table)} OFF;
+            SELECT @added;
+        """, params)
+        
+        # Pomiń liczniki wierszy poprzedzające wynik SELECT
+        while cursor.description is None and cursor.nextset():
+            pass
+        return cursor.fetchone()[0]
+    
     def _ensure_default_dimension_record(self, conn, dim_table: str):
         """
         Upewnienie się, że tabela wymiarów ma rekord z ID=0 (domyślny/nieznany)
@@ -590,77 +1122,18 @@ class DataCleaner:
             conn: Połączenie z bazą danych
             dim_table: Nazwa tabeli wymiarów
         """
+        if not self.default_dimension_values.get(dim_table):
+            self.logger.error(f"No default values defined for {dim_table}")
+            return
+        
         try:
-            cursor = conn.cursor()
-            
-            # Znajdź nazwę kolumny ID
-            id_column = self._get_dimension_id_column(conn, dim_table)
-            
-            # Sprawdź czy rekord z ID=0 istnieje
-            cursor.execute(f"""
-                IF EXISTS (SELECT 1 FROM {dim_table} WHERE {id_column} = 0)
-                    SELECT 1
-                ELSE
-                    SELECT 0
-            """)
+            cursor = self._cursor(conn)
             
-            exists = cursor.fetchone()[0]
-            
-            if not exists:
-                self.logger.info(f"Adding default record to {dim_table}")
-                
-                # Pobierz strukturę tabeli
-                cursor.execute(f"""
-                    SELECT COLUMN_NAME
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_NAME = '{dim_table}'
-                    AND COLUMN_NAME <> '{id_column}'
-                    AND COLUMN_NAME <> 'created_at'
-                    ORDER BY ORDINAL_POSITION
-                """)
-                
-                columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                
-                # Pobierz domyślne wartości
-                default_values = self.default_dimension_values.get(dim_table, {})
-                
-                if not default_values:
-                    self.logger.error(f"No default values defined for {dim_table}")
-                    return
-                
-                # Przygotuj wartości do wstawienia
-                values = []
-                for col in columns:
-                    default_value = default_values.get(col)
-                    
-                    if default_value is None:
-                        values.append("NULL")
-                    elif isinstance(default_value, str):
-                        values.append(f"'{default_value}'")
-                    elif isinstance(default_value, (int, float)):
-                        values.append(str(default_value))
-                    elif isinstance(default_value, bool):
-                        values.append('1' if default_value else '0')
-                    elif isinstance(default_value, (date, datetime)):
-                        values.append(f"'{default_value.isoformat()}'")
-                    else:
-                        values.append("NULL")
-                
-                # Wstaw domyślny rekord z ID=0
-                insert_sql = f"""
-                SET IDENTITY_INSERT {dim_table} ON;
-                INSERT INTO {dim_table} ({id_column}, {', '.join(columns)})
-                VALUES (0, {', '.join(values)});
-                SET IDENTITY_INSERT {dim_table} OFF;
-                """
-                
-                self.logger.info(f"Inserting default record to {dim_table}")
-                cursor.execute(insert_sql)
-                conn.commit()
-                
+            if self._upsert_default_row(cursor, dim_table):
                 self.logger.info(f"Default record added to {dim_table}")
             else:
                 self.logger.info(f"Default record already exists in {dim_table}")
+            conn.commit()
             
         except Exception as e:
             self.logger.error(f"Error ensuring default record in {dim_table}: {str(e)}")
@@ -675,109 +1148,89 @@ class DataCleaner:
         """
         self.logger.info("Loading dimensions from staging")
         
+        dim_staging_tables = [t for t, target in self.staging_to_target_tables.items() if target.startswith('dim_')]
+        if all(self._staging_rowcounts.get(t, -1) == 0 for t in dim_staging_tables):
+            self.logger.warning("No dimension data in staging, using default values")
+            return True
+        
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            conn = self._get_conn()
+            cursor = self._cursor(conn)
+            
+            self._deploy_etl_procedures(conn)
             
             dimensions = [
                 'dim_date', 'dim_time', 'dim_bidding_zone', 'dim_weather_zone',
                 'dim_generation_type', 'dim_weather_condition', 'dim_socioeconomic_profile'
             ]
             
+            # Wymiary są niezależne - ładowane równolegle, każdy wątek z własnym połączeniem
+            dims_to_load = []
             for dim in dimensions:
                 staging_table = f"staging_{dim}"
                 
                 # Sprawdź czy tabela staging istnieje i ma dane
-                cursor.execute(f"""
-                    IF OBJECT_ID('{staging_table}', 'U') IS NOT NULL
-                        SELECT COUNT(*) FROM {staging_table}
-                    ELSE
-                        SELECT 0
-                """)
-                
-                staging_count = cursor.fetchone()[0]
+                staging_count = self._get_staging_count(cursor, staging_table)
                 
                 if staging_count > 0:
                     self.logger.info(f"Loading {staging_count} records from {staging_table} to {dim}")
-                    
-                    # Znajdź nazwę kolumny ID dla tabeli docelowej
-                    id_column = self._get_dimension_id_column(conn, dim)
-                    
-                    # Pobierz kolumny tabeli docelowej
-                    cursor.execute(f"""
-                        SELECT COLUMN_NAME 
-                        FROM INFORMATION_SCHEMA.COLUMNS
-                        WHERE TABLE_NAME = '{dim}'
-                        AND COLUMN_NAME <> '{id_column}'
-                        AND COLUMN_NAME <> 'created_at'
-                        ORDER BY ORDINAL_POSITION
-                    """)
-                    
-                    target_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                    
-                    # Pobierz kolumny tabeli staging
-                    cursor.execute(f"""
-                        SELECT COLUMN_NAME 
-                        FROM INFORMATION_SCHEMA.COLUMNS
-                        WHERE TABLE_NAME = '{staging_table}'
-                        AND COLUMN_NAME <> 'id'
-                        AND COLUMN_NAME <> 'created_at'
-                        ORDER BY ORDINAL_POSITION
-                    """)
-                    
-                    staging_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                    
-                    # Znajdź wspólne kolumny
-                    common_columns = [col for col in staging_columns if col in target_columns]
-                    
-                    if not common_columns:
-                        self.logger.error(f"No matching columns between {staging_table} and {dim}")
-                        continue
-                    
-                    # Podejście uproszczone - usuń wszystkie rekordy z ID>0 i wstaw ponownie
-                    # Najpierw sprawdź max ID w tabeli docelowej (dla bezpieczeństwa)
-                    cursor.execute(f"""
-                        SELECT ISNULL(MAX({id_column}), 0) FROM {dim}
-                    """)
-                    max_id = cursor.fetchone()[0]
-                    
-                    # Teraz usuń wszystkie rekordy oprócz ID=0
-                    self.logger.info(f"Removing existing records from {dim} (keeping default record with ID=0)")
-                    cursor.execute(f"""
-                        DELETE FROM {dim} WHERE {id_column} > 0
-                    """)
-                    conn.commit()
-                    
-                    # Wstaw nowe dane
-                    self.logger.info(f"Inserting {staging_count} records into {dim}")
-                    
-                    # Użyj normalnego INSERT bez sprawdzania unikalności
-                    insert_sql = f"""
-                    INSERT INTO {dim} ({', '.join(common_columns)})
-                    SELECT {', '.join(common_columns)}
-                    FROM {staging_table}
-                    """
-                    
-                    cursor.execute(insert_sql)
-                    conn.commit()
-                    
-                    # Sprawdź liczbę wstawionych rekordów
-                    cursor.execute(f"""
-                        SELECT COUNT(*) FROM {dim} WHERE {id_column} > 0
-                    """)
-                    inserted_count = cursor.fetchone()[0]
-                    
-                    self.logger.info(f"Successfully inserted {inserted_count} records into {dim}")
+                    dims_to_load.append(dim)
                 else:
                     self.logger.warning(f"No data in {staging_table}, using default values for {dim}")
             
-            conn.close()
-            return True
+            if not dims_to_load:
+                return True
+            
+            try:
+                with ThreadPoolExecutor(max_workers=min(len(dims_to_load), 4)) as pool:
+                    futures = [pool.submit(self._load_one_dim, dim) for dim in dims_to_load]
+                    results = [future.result() for future in futures]
+            finally:
+                self._close_worker_connections()
+            
+            return all(results)
             
         except Exception as e:
             self.logger.error(f"Error loading dimensions: {str(e)}")
             return False
     
+    def _load_one_dim(self, dim: str) -> bool:
+        """
+        Ładowanie jednego wymiaru ze stagingu (w wątku roboczym)
+        
+        Args:
+            dim: Nazwa tabeli wymiarów
+            
+        Returns:
+            True jeśli sukces, False w przeciwnym razie
+        """
+        staging_table = f"staging_{dim}"
+        conn = self._worker_conn()
+        
+        try:
+            cursor = self._cursor(conn)
+            
+            # MERGE po pełnym kluczu biznesowym albo wymiana wierszy (brak klucza w staging) - w procedurze
+            cursor.execute(
+                "{CALL sp_etl_load_dim(?, ?, ?, ?)}",
+                dim, staging_table, self._get_dimension_id_column(dim),
+                ','.join(self.dimension_business_keys.get(dim, ())) or None
+            )
+            loaded_count = cursor.fetchone()[0]
+            conn.commit()
+            
+            if loaded_count is None:
+                self.logger.error(f"No matching columns between {staging_table} and {dim}")
+                return True
+            
+            self.logger.info(f"Successfully loaded {loaded_count} records into {dim}")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error loading dimension {dim}: {str(e)}")
+            conn.rollback()
+            return False
+    
     def load_facts_from_staging(self) -> bool:
         """
         Ładowanie danych faktów z tabeli staging do tabeli docelowej
@@ -787,101 +1240,45 @@ class DataCleaner:
         """
         self.logger.info("Loading facts from staging")
         
+        # Pusty staging znany z check_staging_tables - bez otwierania połączenia
+        if self._staging_rowcounts.get('staging_fact_energy_weather', -1) == 0:
+            self.logger.warning("No fact data in staging, skipping")
+            return False
+        
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            conn = self._get_conn()
+            cursor = self._cursor(conn)
             
             # Sprawdź czy tabela staging istnieje i ma dane
-            cursor.execute("""
-                IF OBJECT_ID('staging_fact_energy_weather', 'U') IS NOT NULL
-                    SELECT COUNT(*) FROM staging_fact_energy_weather
-                ELSE
-                    SELECT 0
-            """)
-            
-            staging_count = cursor.fetchone()[0]
+            staging_count = self._get_staging_count(cursor, 'staging_fact_energy_weather')
             
             if staging_count > 0:
                 self.logger.info(f"Loading {staging_count} fact records from staging")
                 
-                # Pobierz kolumny tabeli docelowej
-                cursor.execute("""
-                    SELECT COLUMN_NAME 
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_NAME = 'fact_energy_weather'
-                    AND COLUMN_NAME <> 'energy_weather_id'
-                    AND COLUMN_NAME <> 'fact_id'
-                    AND COLUMN_NAME <> 'created_at'
-                    ORDER BY ORDINAL_POSITION
-                """)
-                
-                target_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                
-                # Pobierz kolumny tabeli staging
-                cursor.execute("""
-                    SELECT COLUMN_NAME 
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_NAME = 'staging_fact_energy_weather'
-                    AND COLUMN_NAME <> 'id'
-                    AND COLUMN_NAME <> 'created_at'
-                    ORDER BY ORDINAL_POSITION
-                """)
-                
-                staging_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                
-                # Znajdź wspólne kolumny
-                common_columns = [col for col in staging_columns if col in target_columns]
-                
-                if not common_columns:
-                    self.logger.error("No matching columns between staging_fact_energy_weather and fact_energy_weather")
-                    return False
-                
-                # Najpierw czyszczenie tabeli faktów
-                self.logger.info("Cleaning fact_energy_weather table")
-                cursor.execute("TRUNCATE TABLE fact_energy_weather")
-                
-                # Zliczanie wartości wymiarów z ID=0
-                self.logger.info("Checking for NULL dimension IDs in staging data")
-                for dim_column in ['date_id', 'time_id', 'bidding_zone_id', 'weather_zone_id',
-                                  'generation_type_id', 'weather_condition_id', 'socioeconomic_profile_id']:
-                    if dim_column in common_columns:
-                        cursor.execute(f"""
-                            SELECT COUNT(*) FROM staging_fact_energy_weather
-                            WHERE {dim_column} = 0 OR {dim_column} IS NULL
-                        """)
-                        null_count = cursor.fetchone()[0]
-                        if null_count > 0:
-                            self.logger.warning(f"Found {null_count} records with NULL/0 {dim_column}")
-                
                 # Upewnij się, że wymiary referencyjne mają domyślne wartości
                 self._ensure_dimension_defaults(conn)
+                self._deploy_etl_procedures(conn)
                 
-                # Wstaw dane ze stagingu, zamieniając NULL na 0 dla kluczy obcych
-                insert_columns = []
-                select_columns = []
-                
-                for col in common_columns:
-                    insert_columns.append(col)
-                    
-                    # Dla kluczy obcych zastąp NULL wartością 0
-                    if col.endswith('_id'):
-                        select_columns.append(f"ISNULL({col}, 0) AS {col}")
-                    else:
-                        select_columns.append(col)
-                
-                insert_sql = f"""
-                INSERT INTO fact_energy_weather ({', '.join(insert_columns)})
-                SELECT {', '.join(select_columns)}
-                FROM staging_fact_energy_weather
-                """
-                
-                cursor.execute(insert_sql)
-                conn.commit()
+                # Naprawa NULL w kluczach obcych, TRUNCATE i INSERT WITH (TABLOCK) - jedno
+                # wywołanie procedury w jednej transakcji; czytelnicy widzą stare albo nowe dane
+                try:
+                    cursor.execute(
+                        "{CALL sp_etl_load_fact(?, ?)}", 'fact_energy_weather', 'staging_fact_energy_weather'
+                    )
+                    repaired_count, inserted_count = cursor.fetchone()
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
                 
-                # Sprawdź liczbę wstawionych rekordów
-                cursor.execute("SELECT COUNT(*) FROM fact_energy_weather")
-                inserted_count = cursor.fetchone()[0]
+                if inserted_count is None:
+                    self.logger.error("No matching columns between staging_fact_energy_weather and fact_energy_weather")
+                    return False
                 
+                if repaired_count > 0:
+                    self.logger.warning(f"Replaced NULL foreign keys with 0 in {repaired_count} staging records")
+                if inserted_count == 0:
+                    self.logger.warning("No records inserted into fact_energy_weather")
                 self.logger.info(f"Inserted {inserted_count} records into fact_energy_weather")
                 
                 return True
@@ -908,18 +1305,26 @@ class DataCleaner:
         for dim in dimensions:
             self._ensure_default_dimension_record(conn, dim)
     
-    def clean_and_load_source_tables(self) -> bool:
+    def clean_and_load_source_tables(self, conn=None) -> bool:
         """
         Czyszczenie i ładowanie danych źródłowych z tabel staging
         
+        Args:
+            conn: Połączenie z bazą danych (domyślnie wspólne połączenie)
+            
         Returns:
             True jeśli sukces, False w przeciwnym razie
         """
         self.logger.info("Cleaning and loading source tables")
         
+        src_staging_tables = [t for t, target in self.staging_to_target_tables.items() if target.startswith('src_')]
+        if all(self._staging_rowcounts.get(t, -1) == 0 for t in src_staging_tables):
+            self.logger.warning("No source data in staging, skipping source tables")
+            return True
+        
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            conn = conn or self._get_conn()
+            cursor = self._cursor(conn)
             
             source_mapping = {
                 'staging_entso_actual_load': 'src_entso_actual_load',
@@ -930,342 +1335,523 @@ class DataCleaner:
                 'staging_eurostat_integrated': 'src_eurostat_integrated'
             }
             
+            # Cache tabel wypełniany w wątku głównym, zanim ruszą wątki robocze
+            self._get_existing_tables(cursor)
+            
+            # Tabele źródłowe są niezależne - ładowane równolegle, każdy wątek z własnym połączeniem
+            tables_to_load = []
             for staging_table, target_table in source_mapping.items():
                 # Sprawdź czy tabela staging istnieje i ma dane
-                cursor.execute(f"""
-                    IF OBJECT_ID('{staging_table}', 'U') IS NOT NULL
-                        SELECT COUNT(*) FROM {staging_table}
-                    ELSE
-                        SELECT 0
-                """)
-                
-                staging_count = cursor.fetchone()[0]
+                staging_count = self._get_staging_count(cursor, staging_table)
                 
                 if staging_count > 0:
-                    self.logger.info(f"Loading {staging_count} records from {staging_table} to {target_table}")
-                    
-                    # Sprawdź czy tabela docelowa istnieje
-                    cursor.execute(f"""
-                        IF OBJECT_ID('{target_table}', 'U') IS NOT NULL
-                            SELECT 1
-                        ELSE
-                            SELECT 0
-                    """)
-                    
-                    table_exists = cursor.fetchone()[0]
-                    
-                    if not table_exists:
-                        self.logger.info(f"Creating table {target_table} from {staging_table}")
-                        self._create_target_from_staging(conn, staging_table, target_table)
-                    
-                    # Pobierz kolumny tabeli docelowej
-                    cursor.execute(f"""
-                        SELECT COLUMN_NAME 
-                        FROM INFORMATION_SCHEMA.COLUMNS
-                        WHERE TABLE_NAME = '{target_table}'
-                        AND COLUMN_NAME <> '{target_table.replace("src_", "")}_id'
-                        AND COLUMN_NAME <> 'created_at'
-                        ORDER BY ORDINAL_POSITION
-                    """)
-                    
-                    target_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                    
-                    # Pobierz kolumny tabeli staging
-                    cursor.execute(f"""
-                        SELECT COLUMN_NAME 
-                        FROM INFORMATION_SCHEMA.COLUMNS
-                        WHERE TABLE_NAME = '{staging_table}'
-                        AND COLUMN_NAME <> 'id'
-                        AND COLUMN_NAME <> 'created_at'
-                        ORDER BY ORDINAL_POSITION
-                    """)
-                    
-                    staging_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                    
-                    # Znajdź wspólne kolumny
-                    common_columns = [col for col in staging_columns if col in target_columns]
-                    
-                    if not common_columns:
-                        self.logger.error(f"No matching columns between {staging_table} and {target_table}")
-                        continue
-                    
-                    # Czyszczenie tabeli docelowej
-                    self.logger.info(f"Cleaning {target_table}")
-                    cursor.execute(f"TRUNCATE TABLE {target_table}")
-                    
-                    # Wstaw dane ze stagingu
-                    insert_sql = f"""
-                    INSERT INTO {target_table} ({', '.join(common_columns)})
-                    SELECT {', '.join(common_columns)}
-                    FROM {staging_table}
-                    """
-                    
-                    cursor.execute(insert_sql)
-                    conn.commit()
-                    
-                    # Sprawdź liczbę wstawionych rekordów
-                    cursor.execute(f"SELECT COUNT(*) FROM {target_table}")
-                    inserted_count = cursor.fetchone()[0]
-                    
-                    self.logger.info(f"Inserted {inserted_count} records into {target_table}")
+                    # Kolumny stagingu trafiają do cache schematu jeszcze w wątku głównym
+                    self._get_table_columns(cursor, staging_table)
+                    tables_to_load.append((staging_table, target_table, staging_count))
                 else:
                     self.logger.warning(f"No data in {staging_table}, skipping {target_table}")
             
-            conn.close()
-            return True
+            if not tables_to_load:
+                return True
+            
+            try:
+                with ThreadPoolExecutor(max_workers=min(len(tables_to_load), 4)) as pool:
+                    futures = [pool.submit(self._load_one_source, *table) for table in tables_to_load]
+                    results = [future.result() for future in futures]
+            finally:
+                self._close_worker_connections()
+            
+            return all(results)
             
         except Exception as e:
             self.logger.error(f"Error loading source tables: {str(e)}")
             return False
     
-    def validate_data_relationships(self) -> Dict[str, int]:
+    def _load_one_source(self, staging_table: str, target_table: str, staging_count: int) -> bool:
         """
-        Walidacja relacji pomiędzy faktami a wymiarami
+        Czyszczenie i ładowanie jednej tabeli źródłowej ze stagingu (w wątku roboczym)
         
+        Args:
+            staging_table: Nazwa tabeli staging
+            target_table: Nazwa tabeli docelowej
+            staging_count: Liczba wierszy w stagingu
+            
         Returns:
-            Słownik z liczbą potencjalnych problemów
+            True jeśli sukces, False w przeciwnym razie
         """
-        self.logger.info("Validating data relationships")
+        conn = self._worker_conn()
         
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
-            
-            # Sprawdź czy wszystkie klucze obce w tabeli faktów są poprawne
-            validation_results = {}
-            foreign_keys = [
-                ('date_id', 'dim_date'),
-                ('time_id', 'dim_time'),
-                ('bidding_zone_id', 'dim_bidding_zone'),
-                ('weather_zone_id', 'dim_weather_zone'),
-                ('generation_type_id', 'dim_generation_type'),
-                ('weather_condition_id', 'dim_weather_condition'),
-                ('socioeconomic_profile_id', 'dim_socioeconomic_profile')
-            ]
+            cursor = self._cursor(conn)
             
-            for fk_column, dim_table in foreign_keys:
-                # Znajdź nazwę kolumny ID dla tabeli wymiarów
-                dim_id_column = self._get_dimension_id_column(conn, dim_table)
-                
-                # Sprawdź liczbę rekordów faktów z nieistniejącymi powiązaniami
-                cursor.execute(f"""
-                    SELECT COUNT(*) 
-                    FROM fact_energy_weather f
-                    LEFT JOIN {dim_table} d ON f.{fk_column} = d.{dim_id_column}
-                    WHERE d.{dim_id_column} IS NULL AND f.{fk_column} IS NOT NULL
-                """)
-                
-                invalid_count = cursor.fetchone()[0]
+            self.logger.info(f"Loading {staging_count} records from {staging_table} to {target_table}")
+            
+            # Sprawdź czy tabela docelowa istnieje (cache z sys.tables)
+            if not self._table_exists(cursor, target_table):
+                # Brak tabeli: utwórz ją razem z danymi jednym przejściem
+                inserted_count = self._select_into_source_from_staging(conn, staging_table, target_table)
+                if inserted_count is not None:
+                    self.logger.info(f"Created {target_table} with {inserted_count} records using SELECT INTO")
+                    return True
                 
-                if invalid_count > 0:
-                    self.logger.warning(f"Found {invalid_count} fact records with invalid {fk_column}")
-                    validation_results[fk_column] = invalid_count
-                else:
-                    self.logger.info(f"All {fk_column} references are valid")
-                    validation_results[fk_column] = 0
+                self.logger.info(f"Creating table {target_table} from {staging_table}")
+                self._create_target_from_staging(conn, staging_table, target_table)
+                self._known_tables.add(target_table.lower())
             
-            # Sprawdź liczbę NULL w wymiarach obowiązkowych
-            required_dims = ['date_id', 'time_id', 'bidding_zone_id', 'weather_zone_id']
+            # Pobierz kolumny tabeli docelowej i staging (z cache schematu)
+            target_columns = self._get_column_names(
+                cursor, target_table, exclude=(f'{target_table.replace("src_", "")}_id', 'created_at')
+            )
+            staging_columns = self._get_column_names(cursor, staging_table, exclude=('id', 'created_at'))
             
-            for dim in required_dims:
-                cursor.execute(f"""
-                    SELECT COUNT(*) 
-                    FROM fact_energy_weather 
-                    WHERE {dim} IS NULL OR {dim} = 0
-                """)
-                
-                null_count = cursor.fetchone()[0]
-                
-                if null_count > 0:
-                    self.logger.warning(f"Found {null_count} fact records with NULL/0 {dim}")
-                    validation_results[f"{dim}_null"] = null_count
-                else:
-                    self.logger.info(f"No NULL {dim} values found")
-                    validation_results[f"{dim}_null"] = 0
+            # Znajdź wspólne kolumny
+            common_columns = [col for col in staging_columns if col in target_columns]
             
-            # Sprawdź, czy temperatura jest w rozsądnym zakresie
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM fact_energy_weather 
-                WHERE temperature_avg < -80 OR temperature_avg > 80
-            """)
+            if not common_columns:
+                self.logger.error(f"No matching columns between {staging_table} and {target_table}")
+                return True
             
-            invalid_temp = cursor.fetchone()[0]
+            # Czyszczenie tabeli docelowej i ładowanie z TABLOCK (logowanie minimalne
+            # w SIMPLE/BULK_LOGGED); indeksy nieklastrowe wyłączone na czas ładowania
+            self.logger.info(f"Cleaning {target_table}")
+            insert_sql = f"""
+            INSERT INTO {_qn(target_table)} WITH (TABLOCK) ({', '.join(common_columns)})
+            SELECT {', '.join(common_columns)}
+            FROM {_qn(staging_table)}
+            """
             
-            if invalid_temp > 0:
-                self.logger.warning(f"Found {invalid_temp} fact records with extreme temperature values")
-                validation_results['extreme_temperature'] = invalid_temp
-            else:
-                self.logger.info("All temperature values are within reasonable range")
-                validation_results['extreme_temperature'] = 0
+            try:
+                disabled_indexes = self._disable_indexes(cursor, target_table)
+                cursor.execute(f"TRUNCATE TABLE {_qn(target_table)}")
+                inserted_count = self._execute_counted(cursor, insert_sql)
+                self._rebuild_indexes(cursor, target_table, disabled_indexes)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
             
-            conn.close()
-            return validation_results
+            self.logger.info(f"Inserted {inserted_count} records into {target_table}")
+            return True
             
         except Exception as e:
-            self.logger.error(f"Error validating data relationships: {str(e)}")
-            return {'error': 1}
-    def validate_data_relationships(self) -> Dict[str, int]:
+            self.logger.error(f"Error loading {target_table} from {staging_table}: {str(e)}")
+            return False
+    
+    def _bulk_load_csv(self, conn, table_name: str, path: str, batch_size: int = 100000) -> int:
+        """
+        Ładowanie pliku CSV do tabeli przez BULK INSERT (po stronie serwera)
+        
+        Dla dużych zbiorów, które nie są już w tabeli staging - zamiast
+        wstawiania wiersz po wierszu z Pythona. Ścieżka musi być dostępna
+        dla serwera SQL, a plik mieć nagłówek w pierwszym wierszu.
+        
+        Args:
+            conn: Połączenie z bazą danych
+            table_name: Nazwa tabeli docelowej
+            path: Ścieżka pliku widziana przez serwer
+            batch_size: Liczba wierszy na transakcję BULK INSERT
+            
+        Returns:
+            Liczba załadowanych wierszy
+        """
+        cursor = self._cursor(conn)
+        loaded_count = self._execute_counted(cursor, f"""
+            BULK INSERT {_qn(table_name)}
+            FROM '{path.replace("'", "''")}'
+            WITH (FORMAT = 'CSV', FIRSTROW = 2, TABLOCK, BATCHSIZE = {int(batch_size)})
+        """)
+        conn.commit()
+        
+        self.logger.info(f"Bulk loaded {loaded_count} records from {path} into {table_name}")
+        return loaded_count
+    
+    def _disable_indexes(self, cursor, table: str) -> List[str]:
+        """
+        Wyłączenie indeksów nieklastrowych przed ładowaniem
+        
+        Pomija indeksy PK i UNIQUE (wyłączenie ich blokuje klucze obce i unikalność).
+        
+        Args:
+            cursor: Kursor bazy danych
+            table: Nazwa tabeli
+            
+        Returns:
+            Lista nazw wyłączonych indeksów
+        """
+        cursor.execute("""
+            SELECT name
+            FROM sys.indexes
+            WHERE object_id = OBJECT_ID(?)
+            AND type_desc = 'NONCLUSTERED'
+            AND is_disabled = 0
+            AND is_primary_key = 0
+            AND is_unique_constraint = 0
+        """, table)
+        index_names = [row.name for row in cursor.fetchall()]
+        
+        if index_names:
+            cursor.execute(";\n".join(
+                f"ALTER INDEX {_qn(name)} ON {_qn(table)} DISABLE" for name in index_names
+            ))
+            self.logger.info(f"Disabled {len(index_names)} nonclustered indexes on {table}")
+        
+        return index_names
+    
+    def _rebuild_indexes(self, cursor, table: str, index_names: List[str]):
+        """
+        Przebudowa wcześniej wyłączonych indeksów - jedno sortowanie zamiast utrzymania per wiersz
+        
+        Args:
+            cursor: Kursor bazy danych
+            table: Nazwa tabeli
+            index_names: Nazwy indeksów do przebudowy
+        """
+        if not index_names:
+            return
+        
+        cursor.execute(";\n".join(
+            f"ALTER INDEX {_qn(name)} ON {_qn(table)} REBUILD" for name in index_names
+        ))
+        self.logger.info(f"Rebuilt {len(index_names)} nonclustered indexes on {table}")
+    
+    def validate_data_relationships(self, conn=None) -> Dict[str, int]:
         """
         Walidacja relacji pomiędzy faktami a wymiarami
         
+        Wszystkie liczniki są liczone jednym zapytaniem (agregacja warunkowa),
+        więc tabela faktów jest czytana raz, a każdy wymiar dołączany raz.
+        Mniejsze tabele faktów są sprawdzane po stronie klienta względem
+        zbiorów kluczy wymiarów. Przed liczeniem na serwerze EXISTS sprawdza,
+        czy jest choć jeden błędny wiersz.
+        
+        Args:
+            conn: Połączenie z bazą danych (domyślnie wspólne połączenie)
+            
         Returns:
             Słownik z liczbą potencjalnych problemów
         """
         self.logger.info("Validating data relationships")
         
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
-            
-            # Sprawdź czy wszystkie klucze obce w tabeli faktów są poprawne
-            validation_results = {}
-            foreign_keys = [
-                ('date_id', 'dim_date'),
-                ('time_id', 'dim_time'),
-                ('bidding_zone_id', 'dim_bidding_zone'),
-                ('weather_zone_id', 'dim_weather_zone'),
-                ('generation_type_id', 'dim_generation_type'),
-                ('weather_condition_id', 'dim_weather_condition'),
-                ('socioeconomic_profile_id', 'dim_socioeconomic_profile')
-            ]
-            
-            for fk_column, dim_table in foreign_keys:
-                # Sprawdź liczbę rekordów faktów z nieistniejącymi powiązaniami
-                cursor.execute(f"""
-                    SELECT COUNT(*) 
-                    FROM fact_energy_weather f
-                    LEFT JOIN {dim_table} d ON f.{fk_column} = d.{dim_table}_id
-                    WHERE d.{dim_table}_id IS NULL AND f.{fk_column} IS NOT NULL
-                """)
-                
-                invalid_count = cursor.fetchone()[0]
+            conn = conn or self._get_conn()
+            cursor = self._cursor(conn)
+            
+            if self._fast_count(cursor, 'fact_energy_weather') <= self.client_validation_max_rows:
+                validation_results = self._validate_client_side(cursor)
+            elif not cursor.execute(self._prepared_sql('validate_probe', self._build_issue_probe_sql)).fetchone()[0]:
+                # Brak jakiegokolwiek problemu - liczniki nie są potrzebne
+                validation_results = self._empty_validation_results()
+            else:
+                cursor.execute(self._prepared_sql('validate', self._build_validation_sql))
                 
-                if invalid_count > 0:
-                    self.logger.warning(f"Found {invalid_count} fact records with invalid {fk_column}")
-                    validation_results[fk_column] = invalid_count
+                row = cursor.fetchone()
+                # SUM po pustej tabeli daje NULL
+                validation_results = {
+                    column[0]: value or 0 for column, value in zip(cursor.description, row)
+                }
+            
+            for fk_column, _ in self.fact_foreign_keys:
+                if validation_results[fk_column] > 0:
+                    self.logger.warning(f"Found {validation_results[fk_column]} fact records with invalid {fk_column}")
                 else:
                     self.logger.info(f"All {fk_column} references are valid")
-                    validation_results[fk_column] = 0
-            
-            # Sprawdź liczbę NULL w wymiarach obowiązkowych
-            required_dims = ['date_id', 'time_id', 'bidding_zone_id', 'weather_zone_id']
             
-            for dim in required_dims:
-                cursor.execute(f"""
-                    SELECT COUNT(*) 
-                    FROM fact_energy_weather 
-                    WHERE {dim} IS NULL OR {dim} = 0
-                """)
-                
-                null_count = cursor.fetchone()[0]
-                
+            for dim in self.required_fact_keys:
+                null_count = validation_results[f"{dim}_null"]
                 if null_count > 0:
                     self.logger.warning(f"Found {null_count} fact records with NULL/0 {dim}")
-                    validation_results[f"{dim}_null"] = null_count
                 else:
                     self.logger.info(f"No NULL {dim} values found")
-                    validation_results[f"{dim}_null"] = 0
-            
-            # Sprawdź, czy temperatura jest w rozsądnym zakresie
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM fact_energy_weather 
-                WHERE temperature_avg < -80 OR temperature_avg > 80
-            """)
-            
-            invalid_temp = cursor.fetchone()[0]
             
-            if invalid_temp > 0:
-                self.logger.warning(f"Found {invalid_temp} fact records with extreme temperature values")
-                validation_results['extreme_temperature'] = invalid_temp
+            if validation_results['extreme_temperature'] > 0:
+                self.logger.warning(
+                    f"Found {validation_results['extreme_temperature']} fact records with extreme temperature values"
+                )
             else:
                 self.logger.info("All temperature values are within reasonable range")
-                validation_results['extreme_temperature'] = 0
             
-            conn.close()
             return validation_results
             
         except Exception as e:
             self.logger.error(f"Error validating data relationships: {str(e)}")
             return {'error': 1}
     
-    def fix_data_issues(self) -> bool:
+    def fix_data_issues(self, validation_results: Optional[Dict[str, int]] = None, conn=None) -> bool:
         """
         Naprawianie potencjalnych problemów z danymi
         
+        Wszystkie poprawki to jeden UPDATE z LEFT JOIN do wymiarów - tabela faktów
+        jest modyfikowana w jednym przejściu, a liczniki poprawek per kategoria
+        zbiera klauzula OUTPUT. Kategorie z zerowym licznikiem w validation_results
+        są pomijane.
+        
+        Args:
+            validation_results: Wynik validate_data_relationships (None - naprawa wszystkiego)
+            conn: Połączenie z bazą danych (domyślnie wspólne połączenie)
+        
         Returns:
             True jeśli sukces, False w przeciwnym razie
         """
         self.logger.info("Fixing data issues")
         
+        def has_issues(*keys):
+            return validation_results is None or any(validation_results.get(key, 0) > 0 for key in keys)
+        
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
-            
-            # Napraw nieistniejące klucze obce, ustawiając je na 0 (domyślna wartość)
-            foreign_keys = [
-                ('date_id', 'dim_date'),
-                ('time_id', 'dim_time'),
-                ('bidding_zone_id', 'dim_bidding_zone'),
-                ('weather_zone_id', 'dim_weather_zone'),
-                ('generation_type_id', 'dim_generation_type'),
-                ('weather_condition_id', 'dim_weather_condition'),
-                ('socioeconomic_profile_id', 'dim_socioeconomic_profile')
-            ]
-            
-            for fk_column, dim_table in foreign_keys:
-                # Znajdź nazwę kolumny ID dla tabeli wymiarów
-                dim_id_column = self._get_dimension_id_column(conn, dim_table)
-                
-                cursor.execute(f"""
-                    UPDATE f
-                    SET f.{fk_column} = 0
-                    FROM fact_energy_weather f
-                    LEFT JOIN {dim_table} d ON f.{fk_column} = d.{dim_id_column}
-                    WHERE d.{dim_id_column} IS NULL AND f.{fk_column} IS NOT NULL
-                """)
-                
-                rows_affected = cursor.rowcount
-                
-                if rows_affected > 0:
-                    self.logger.info(f"Fixed {rows_affected} invalid {fk_column} references")
-            
-            # Napraw NULL w wymiarach obowiązkowych
-            required_dims = ['date_id', 'time_id', 'bidding_zone_id', 'weather_zone_id']
-            
-            for dim in required_dims:
-                cursor.execute(f"""
-                    UPDATE fact_energy_weather
-                    SET {dim} = 0
-                    WHERE {dim} IS NULL OR {dim} = 0
-                """)
-                
-                rows_affected = cursor.rowcount
-                
-                if rows_affected > 0:
-                    self.logger.info(f"Fixed {rows_affected} NULL {dim} values")
+            conn = conn or self._get_conn()
+            cursor = self._cursor(conn)
             
-            # Napraw ekstremalne wartości temperatury
-            cursor.execute("""
-                UPDATE fact_energy_weather
-                SET temperature_avg = NULL
-                WHERE temperature_avg < -80 OR temperature_avg > 80
-            """)
+            # Kategorie do naprawy: klucze obce z problemami i temperatura
+            categories = tuple(
+                fk_column for fk_column, _ in self.fact_foreign_keys
+                if has_issues(fk_column, f"{fk_column}_null")
+            )
+            if has_issues('extreme_temperature'):
+                categories += ('extreme_temperature',)
             
-            rows_affected = cursor.rowcount
+            if not categories:
+                self.logger.info("No data issues to fix")
+                return True
             
-            if rows_affected > 0:
-                self.logger.info(f"Fixed {rows_affected} extreme temperature values")
+            cursor.execute(self._prepared_sql(('fix',) + categories, lambda: self._build_fix_sql(categories)))
             
+            # Pomiń licznik wierszy UPDATE poprzedzający wynik SELECT
+            while cursor.description is None and cursor.nextset():
+                pass
+            fixed_counts = {column[0]: value for column, value in zip(cursor.description, cursor.fetchone())}
             conn.commit()
-            conn.close()
+            
+            for fk_column, _ in self.fact_foreign_keys:
+                if fixed_counts.get(fk_column, 0) > 0:
+                    self.logger.info(f"Fixed {fixed_counts[fk_column]} invalid {fk_column} references")
+            
+            if fixed_counts.get('extreme_temperature', 0) > 0:
+                self.logger.info(f"Fixed {fixed_counts['extreme_temperature']} extreme temperature values")
+            
             return True
             
         except Exception as e:
             self.logger.error(f"Error fixing data issues: {str(e)}")
             return False
     
+    def _empty_validation_results(self) -> Dict[str, int]:
+        """
+        Zerowe liczniki walidacji
+        
+        Returns:
+            Słownik o kluczach jak w zapytaniu walidacyjnym
+        """
+        results = dict.fromkeys((fk_column for fk_column, _ in self.fact_foreign_keys), 0)
+        results.update(dict.fromkeys((f"{dim}_null" for dim in self.required_fact_keys), 0))
+        results['extreme_temperature'] = 0
+        return results
+    
+    def _dim_keyset(self, cursor, dim_table: str, id_column: str) -> np.ndarray:
+        """
+        Posortowany zbiór kluczy wymiaru
+        
+        Args:
+            cursor: Kursor bazy danych
+            dim_table: Nazwa tabeli wymiaru
+            id_column: Kolumna ID wymiaru
+            
+        Returns:
+            Tablica int64 z kluczami wymiaru
+        """
+        cursor.execute(f"SELECT {_qn(id_column)} FROM {_qn(dim_table)}")
+        return np.sort(np.fromiter((row[0] for row in cursor.fetchall()), dtype=np.int64))
+    
+    def _validate_client_side(self, cursor) -> Dict[str, int]:
+        """
+        Walidacja faktów strumieniowo, z kluczami wymiarów pobranymi raz
+        
+        Wymiary są małe, więc zamiast złączeń na serwerze fakty są czytane
+        porcjami, a brakujące klucze liczone przez np.isin.
+        
+        Args:
+            cursor: Kursor bazy danych
+            
+        Returns:
+            Słownik liczników o kluczach jak w zapytaniu walidacyjnym
+        """
+        fk_columns = [fk_column for fk_column, _ in self.fact_foreign_keys]
+        keysets = {
+            fk_column: self._dim_keyset(cursor, dim_table, self.dimension_id_columns[dim_table])
+            for fk_column, dim_table in self.fact_foreign_keys
+        }
+        
+        results = self._empty_validation_results()
+        
+        columns = fk_columns + ['temperature_avg']
+        cursor.execute(
+            f"SELECT {', '.join(_qn(column) for column in columns)} FROM [fact_energy_weather]"
+        )
+        
+        while True:
+            rows = cursor.fetchmany(self.client_validation_chunk_size)
+            if not rows:
+                break
+            
+            chunk = pd.DataFrame.from_records((tuple(row) for row in rows), columns=columns)
+            
+            for fk_column in fk_columns:
+                values = chunk[fk_column]
+                present = values.dropna().to_numpy(dtype=np.int64)
+                results[fk_column] += int(np.isin(present, keysets[fk_column], invert=True).sum())
+                
+                if fk_column in self.required_fact_keys:
+                    results[f"{fk_column}_null"] += int((values.isna() | (values == 0)).sum())
+            
+            temperature = pd.to_numeric(chunk['temperature_avg'], errors='coerce')
+            results['extreme_temperature'] += int(((temperature < -80) | (temperature > 80)).sum())
+        
+        return results
+    
+    def _prepared_sql(self, key, builder) -> str:
+        """
+        Tekst SQL budowany raz na instancję i używany ponownie
+        
+        Ten sam tekst przy każdym wywołaniu trafia w plan z cache serwera.
+        
+        Args:
+            key: Klucz instrukcji
+            builder: Funkcja budująca tekst SQL przy pierwszym użyciu
+            
+        Returns:
+            Tekst SQL
+        """
+        if key not in self._prepared:
+            self._prepared[key] = builder()
+        return self._prepared[key]
+    
+    def _build_validation_sql(self) -> str:
+        """
+        Zapytanie walidacyjne - wszystkie liczniki problemów jednym skanem faktów
+        
+        Returns:
+            Instrukcja SELECT z kolumnami nazwanymi jak klucze validation_results
+        """
+        counters = []
+        joins = []
+        
+        # Klucze obce wskazujące na nieistniejące rekordy wymiarów
+        for index, (fk_column, dim_table) in enumerate(self.fact_foreign_keys, start=1):
+            fk = _qn(fk_column)
+            dim_id = _qn(self.dimension_id_columns[dim_table])
+            joins.append(f"LEFT JOIN {_qn(dim_table)} d{index} ON f.{fk} = d{index}.{dim_id}")
+            counters.append(
+                f"SUM(CASE WHEN d{index}.{dim_id} IS NULL AND f.{fk} IS NOT NULL THEN 1 ELSE 0 END) AS {fk}"
+            )
+        
+        # NULL/0 w wymiarach obowiązkowych
+        for dim in self.required_fact_keys:
+            counters.append(
+                f"SUM(CASE WHEN f.{_qn(dim)} IS NULL OR f.{_qn(dim)} = 0 THEN 1 ELSE 0 END) AS {_qn(dim + '_null')}"
+            )
+        
+        # Temperatura poza rozsądnym zakresem
+        counters.append(
+            "SUM(CASE WHEN f.[temperature_avg] < -80 OR f.[temperature_avg] > 80 THEN 1 ELSE 0 END) "
+            "AS [extreme_temperature]"
+        )
+        
+        return f"""
+            SELECT {', '.join(counters)}
+            FROM [fact_energy_weather] f
+            {' '.join(joins)}
+        """
+    
+    def _build_issue_probe_sql(self) -> str:
+        """
+        Test EXISTS - czy jakikolwiek fakt ma problem
+        
+        Serwer kończy na pierwszym znalezionym wierszu; NULL/0 i temperatura
+        korzystają z indeksów na kluczach obcych i indeksów filtrowanych.
+        
+        Returns:
+            Instrukcja SELECT zwracająca 1 lub 0
+        """
+        conditions = []
+        
+        for fk_column, dim_table in self.fact_foreign_keys:
+            fk = _qn(fk_column)
+            dim_id = _qn(self.dimension_id_columns[dim_table])
+            conditions.append(
+                f"EXISTS (SELECT 1 FROM [fact_energy_weather] f WHERE f.{fk} IS NOT NULL "
+                f"AND NOT EXISTS (SELECT 1 FROM {_qn(dim_table)} d WHERE d.{dim_id} = f.{fk}))"
+            )
+        
+        for dim in self.required_fact_keys:
+            conditions.append(
+                f"EXISTS (SELECT 1 FROM [fact_energy_weather] WHERE {_qn(dim)} IS NULL OR {_qn(dim)} = 0)"
+            )
+        
+        conditions.append("EXISTS (SELECT 1 FROM [fact_energy_weather] WHERE [temperature_avg] < -80)")
+        conditions.append("EXISTS (SELECT 1 FROM [fact_energy_weather] WHERE [temperature_avg] > 80)")
+        
+        return f"SELECT CASE WHEN {' OR '.join(conditions)} THEN 1 ELSE 0 END"
+    
+    def _build_fix_sql(self, categories: Tuple[str, ...]) -> str:
+        """
+        Jeden UPDATE naprawiający wybrane kategorie problemów, z licznikami z OUTPUT
+        
+        Args:
+            categories: Kolumny kluczy obcych i/lub 'extreme_temperature'
+            
+        Returns:
+            Paczka SQL zwracająca jeden wiersz liczników poprawek per kategoria
+        """
+        assignments = []
+        conditions = []
+        joins = []
+        changed = []
+        
+        # Nieistniejące klucze obce -> 0 (domyślna wartość); w wymiarach
+        # obowiązkowych również NULL -> 0
+        for index, (fk_column, dim_table) in enumerate(self.fact_foreign_keys, start=1):
+            if fk_column not in categories:
+                continue
+            
+            fk = _qn(fk_column)
+            dim_id = _qn(self.dimension_id_columns[dim_table])
+            joins.append(f"LEFT JOIN {_qn(dim_table)} d{index} ON f.{fk} = d{index}.{dim_id}")
+            
+            if fk_column in self.required_fact_keys:
+                condition = f"d{index}.{dim_id} IS NULL"
+            else:
+                condition = f"d{index}.{dim_id} IS NULL AND f.{fk} IS NOT NULL"
+            
+            assignments.append(f"f.{fk} = IIF({condition}, 0, f.{fk})")
+            conditions.append(f"({condition})")
+            changed.append((fk, f"IIF(ISNULL(deleted.{fk}, -1) <> inserted.{fk}, 1, 0)"))
+        
+        # Ekstremalne wartości temperatury -> NULL
+        if 'extreme_temperature' in categories:
+            temperature_condition = "f.[temperature_avg] < -80 OR f.[temperature_avg] > 80"
+            assignments.append(
+                f"f.[temperature_avg] = IIF({temperature_condition}, NULL, f.[temperature_avg])"
+            )
+            conditions.append(f"({temperature_condition})")
+            changed.append((
+                '[extreme_temperature]',
+                "IIF(deleted.[temperature_avg] IS NOT NULL AND inserted.[temperature_avg] IS NULL, 1, 0)"
+            ))
+        
+        return f"""
+            DECLARE @fixed TABLE ({', '.join(f"{name} TINYINT NOT NULL" for name, _ in changed)});
+            
+            UPDATE f
+            SET {', '.join(assignments)}
+            OUTPUT {', '.join(expression for _, expression in changed)}
+            INTO @fixed
+            FROM [fact_energy_weather] f
+            {' '.join(joins)}
+            WHERE {' OR '.join(conditions)};
+            
+            SELECT {', '.join(f"ISNULL(SUM({name}), 0) AS {name}" for name, _ in changed)}
+            FROM @fixed;
+        """
+    
     def run_full_etl_process(self) -> bool:
         """
         Wykonanie pełnego procesu ETL
@@ -1275,10 +1861,15 @@ class DataCleaner:
         """
         self.logger.info("Starting full ETL process")
         
+        # Metadane mogły się zmienić od poprzedniego uruchomienia
+        self._reset_metadata_caches()
+        
         # Logowanie rozpoczęcia procesu
         self._log_process('DATA_CLEANING', 'RUNNING')
         
         try:
+            conn = self._get_conn()
+            
             # 1. Sprawdzenie dostępnych tabel staging
             staging_tables = self.check_staging_tables()
             self.logger.info(f"Found {len(staging_tables)} staging tables with data")
@@ -1287,18 +1878,18 @@ class DataCleaner:
             tables_exist = self.ensure_target_tables_exist()
             if not tables_exist:
                 self.logger.error("Failed to ensure target tables exist")
-                self._log_process('DATA_CLEANING', 'FAILED', 0, "Failed to ensure target tables exist")
+                self._log_process('DATA_CLEANING', 'FAILED', 0, "Failed to ensure target tables exist", conn)
                 return False
             
             # 3. Ładowanie wymiarów
             dimensions_loaded = self.load_dimensions_from_staging()
             if not dimensions_loaded:
                 self.logger.error("Failed to load dimensions")
-                self._log_process('DATA_CLEANING', 'FAILED', 0, "Failed to load dimensions")
+                self._log_process('DATA_CLEANING', 'FAILED', 0, "Failed to load dimensions", conn)
                 return False
             
             # 4. Ładowanie źródeł
-            sources_loaded = self.clean_and_load_source_tables()
+            sources_loaded = self.clean_and_load_source_tables(conn)
             if not sources_loaded:
                 self.logger.warning("Issues with loading source tables, but continuing")
             
@@ -1306,37 +1897,38 @@ class DataCleaner:
             facts_loaded = self.load_facts_from_staging()
             if not facts_loaded:
                 self.logger.error("Failed to load facts")
-                self._log_process('DATA_CLEANING', 'FAILED', 0, "Failed to load facts")
+                self._log_process('DATA_CLEANING', 'FAILED', 0, "Failed to load facts", conn)
                 return False
             
             # 6. Walidacja relacji
-            validation_results = self.validate_data_relationships()
+            validation_results = self.validate_data_relationships(conn)
             
             # 7. Naprawianie problemów
             if any(count > 0 for count in validation_results.values()):
-                self.logger.warning("Found data issues, attempting to fix")
-                fixed = self.fix_data_issues()
+                if 'error' in validation_results:
+                    # Walidacja nie powiodła się - brak liczników kategorii, naprawa wszystkiego
+                    self.logger.warning("Data validation failed, attempting to fix all issue categories")
+                    fixed = self.fix_data_issues(None, conn)
+                else:
+                    self.logger.warning("Found data issues, attempting to fix")
+                    fixed = self.fix_data_issues(validation_results, conn)
                 if not fixed:
                     self.logger.error("Failed to fix data issues")
-                    self._log_process('DATA_CLEANING', 'FAILED', 0, "Failed to fix data issues")
+                    self._log_process('DATA_CLEANING', 'FAILED', 0, "Failed to fix data issues", conn)
                     return False
                 
                 # Sprawdź ponownie po naprawie
-                validation_results = self.validate_data_relationships()
+                validation_results = self.validate_data_relationships(conn)
                 if any(count > 0 for count in validation_results.values()):
                     self.logger.warning("Some data issues remain after fixes, but continuing")
             
             # Podsumowanie
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            cursor = self._cursor(conn)
             
-            cursor.execute("SELECT COUNT(*) FROM fact_energy_weather")
-            fact_count = cursor.fetchone()[0]
-            
-            conn.close()
+            fact_count = self._fast_count(cursor, 'fact_energy_weather')
             
             self.logger.info(f"ETL process completed successfully with {fact_count} fact records")
-            self._log_process('DATA_CLEANING', 'SUCCESS', fact_count)
+            self._log_process('DATA_CLEANING', 'SUCCESS', fact_count, conn=conn)
             
             return True
             
@@ -1344,40 +1936,45 @@ class DataCleaner:
             self.logger.error(f"Error during ETL process: {str(e)}")
             self._log_process('DATA_CLEANING', 'FAILED', 0, str(e))
             return False
+        finally:
+            self.close()
     
-    def _log_process(self, process_name: str, status: str, records: int = 0, error_msg: str = None):
+    def _log_process(self, process_name: str, status: str, records: int = 0, error_msg: str = None, conn=None):
         """Logowanie procesu do bazy danych"""
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            conn = conn or self._get_conn()
+            cursor = self._cursor(conn)
             
-            # Sprawdź czy procedura istnieje
-            try:
-                cursor.execute("""
-                    SELECT 1 FROM sys.objects WHERE type = 'P' AND name = 'sp_log_etl_process'
-                """)
-                procedure_exists = cursor.fetchone() is not None
-            except:
-                procedure_exists = False
+            # Istnienie procedury sprawdzane raz na uruchomienie, nie przy każdym wpisie
+            if self._proc_exists is None:
+                try:
+                    cursor.execute("""
+                        SELECT 1 FROM sys.objects WHERE type = 'P' AND name = 'sp_log_etl_process'
+                    """)
+                    self._proc_exists = cursor.fetchone() is not None
+                except:
+                    self._proc_exists = False
             
-            if procedure_exists:
+            if self._proc_exists:
                 cursor.execute("""
                     EXEC sp_log_etl_process ?, ?, ?, ?
                 """, (process_name, status, records, error_msg))
             else:
-                # Jeśli procedura nie istnieje, utwórz tabelę logowania i wstaw bezpośrednio
-                cursor.execute("""
-                    IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'etl_process_log')
-                    CREATE TABLE etl_process_log (
-                        id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                        process_name NVARCHAR(100) NOT NULL,
-                        status NVARCHAR(20) NOT NULL,
-                        records_processed INT NOT NULL DEFAULT 0,
-                        error_message NVARCHAR(MAX),
-                        start_time DATETIME2 DEFAULT GETDATE(),
-                        end_time DATETIME2 DEFAULT GETDATE()
-                    )
-                """)
+                # Jeśli procedura nie istnieje, utwórz tabelę logowania (raz) i wstaw bezpośrednio
+                if not self._log_table_ensured:
+                    cursor.execute("""
+                        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'etl_process_log')
+                        CREATE TABLE etl_process_log (
+                            id BIGINT IDENTITY(1,1) PRIMARY KEY,
+                            process_name NVARCHAR(100) NOT NULL,
+                            status NVARCHAR(20) NOT NULL,
+                            records_processed INT NOT NULL DEFAULT 0,
+                            error_message NVARCHAR(MAX),
+                            start_time DATETIME2 DEFAULT GETDATE(),
+                            end_time DATETIME2 DEFAULT GETDATE()
+                        )
+                    """)
+                    self._log_table_ensured = True
                 
                 cursor.execute("""
                     INSERT INTO etl_process_log (process_name, status, records_processed, error_message)
@@ -1385,111 +1982,42 @@ class DataCleaner:
                 """, (process_name, status, records, error_msg))
             
             conn.commit()
-            conn.close()
             
         except Exception as e:
             self.logger.error(f"Error logging process: {str(e)}")
             # Nie rzucaj wyjątku aby nie przerywać głównego procesu
-    def _create_default_fact_table(self, conn):
+    
+    def _get_dimension_id_column(self, dim_table: str) -> str:
         """
-        Tworzenie domyślnej tabeli faktów, gdy tabela staging nie istnieje
+        Sprawdza i zwraca nazwę kolumny ID dla tabeli wymiarów
+        
+        Znane wymiary są brane z _DIM_ID_MAP bez zapytań do bazy i bez kursora,
+        pozostałe są wykrywane z metadanych raz i zapamiętywane w _dim_id_cache.
         
         Args:
-            conn: Połączenie z bazą danych
-        """
-        try:
-            cursor = conn.cursor()
-            
-            # Na podstawie zrzutu ekranu widzimy, że kolumna ID to energy_weather_id
-            # Standardowa struktura tabeli faktów
-            create_sql = """
-            CREATE TABLE fact_energy_weather (
-                energy_weather_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                date_id INT NOT NULL,
-                time_id INT NOT NULL,
-                bidding_zone_id INT NOT NULL,
-                weather_zone_id INT NOT NULL,
-                generation_type_id INT,
-                weather_condition_id INT,
-                socioeconomic_profile_id INT,
-                actual_consumption DECIMAL(18, 2),
-                forecasted_consumption DECIMAL(18, 2),
-                consumption_deviation DECIMAL(10, 2),
-                generation_amount DECIMAL(18, 2),
-                capacity_factor DECIMAL(5, 2),
-                renewable_percentage DECIMAL(5, 2),
-                per_capita_consumption DECIMAL(18, 6),
-                temperature_avg DECIMAL(5, 2),
-                temperature_min DECIMAL(5, 2),
-                temperature_max DECIMAL(5, 2),
-                humidity DECIMAL(5, 2),
-                precipitation DECIMAL(8, 2),
-                wind_speed DECIMAL(5, 2),
-                wind_direction INT,
-                cloud_cover DECIMAL(5, 2),
-                solar_radiation DECIMAL(8, 2),
-                air_pressure DECIMAL(8, 2),
-                heating_degree_days DECIMAL(5, 2),
-                cooling_degree_days DECIMAL(5, 2),
-                created_at DATETIME2 DEFAULT GETDATE(),
-                CONSTRAINT FK_fact_date FOREIGN KEY (date_id) REFERENCES dim_date(date_id),
-                CONSTRAINT FK_fact_time FOREIGN KEY (time_id) REFERENCES dim_time(time_id),
-                CONSTRAINT FK_fact_bidding_zone FOREIGN KEY (bidding_zone_id) REFERENCES dim_bidding_zone(bidding_zone_id),
-                CONSTRAINT FK_fact_weather_zone FOREIGN KEY (weather_zone_id) REFERENCES dim_weather_zone(weather_zone_id),
-                CONSTRAINT FK_fact_generation_type FOREIGN KEY (generation_type_id) REFERENCES dim_generation_type(generation_type_id),
-                CONSTRAINT FK_fact_weather_condition FOREIGN KEY (weather_condition_id) REFERENCES dim_weather_condition(weather_condition_id),
-                CONSTRAINT FK_fact_socioeconomic_profile FOREIGN KEY (socioeconomic_profile_id) REFERENCES dim_socioeconomic_profile(socioeconomic_profile_id)
-            )
-            """
-            
-            self.logger.info("Creating default fact_energy_weather table")
-            cursor.execute(create_sql)
-            conn.commit()
-            
-            self.logger.info("Default fact table created successfully")
+            dim_table: Nazwa tabeli wymiarów
             
-        except Exception as e:
-            self.logger.error(f"Error creating default fact table: {str(e)}")
-            conn.rollback()    
-    def _get_dimension_id_column(self, conn, dim_table: str) -> str:
+        Returns:
+            Nazwa kolumny ID
         """
-        Sprawdza i zwraca nazwę kolumny ID dla tabeli wymiarów
+        id_column = _DIM_ID_MAP.get(dim_table)
+        if id_column is not None:
+            return id_column
+        
+        if dim_table not in self._dim_id_cache:
+            self._dim_id_cache[dim_table] = self._probe_dim_id(dim_table)
+        return self._dim_id_cache[dim_table]
+    
+    def _probe_dim_id(self, dim_table: str) -> str:
+        """
+        Wykrycie kolumny ID wymiaru na podstawie kolumn tabeli
         
         Args:
-            conn: Połączenie z bazą danych
             dim_table: Nazwa tabeli wymiarów
             
         Returns:
             Nazwa kolumny ID
         """
-        cursor = conn.cursor()
-        
-        # Na podstawie zrzutów ekranu widzimy, że kolumny id to:
-        # dim_date -> date_id
-        # dim_time -> time_id
-        # dim_bidding_zone -> bidding_zone_id
-        # dim_weather_zone -> weather_zone_id
-        # dim_generation_type -> generation_type_id
-        # dim_weather_condition -> weather_condition_id
-        # dim_socioeconomic_profile -> socioeconomic_profile_id
-        
-        # Mapowanie tabel wymiarowych na kolumny klucza głównego
-        dimension_id_map = {
-            'dim_date': 'date_id',
-            'dim_time': 'time_id',
-            'dim_bidding_zone': 'bidding_zone_id',
-            'dim_weather_zone': 'weather_zone_id',
-            'dim_generation_type': 'generation_type_id',
-            'dim_weather_condition': 'weather_condition_id',
-            'dim_socioeconomic_profile': 'socioeconomic_profile_id'
-        }
-        
-        # Jeśli mamy znaną tabelę, zwróć jej kolumnę ID
-        if dim_table in dimension_id_map:
-            id_column = dimension_id_map[dim_table]
-            self.logger.info(f"Using mapped ID column for {dim_table}: {id_column}")
-            return id_column
-        
         # Spróbuj różne możliwe nazwy kolumn
         possible_id_columns = [
             f"{dim_table.replace('dim_', '')}_id",  # date_id
@@ -1497,36 +2025,21 @@ class DataCleaner:
             f"{dim_table}_id"                      # dim_date_id
         ]
         
+        try:
+            table_columns = self._get_column_names(self._cursor(self._get_conn()), dim_table)
+        except:
+            table_columns = []
+        
         for col_name in possible_id_columns:
-            try:
-                cursor.execute(f"""
-                    SELECT 1 FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_NAME = '{dim_table}'
-                    AND COLUMN_NAME = '{col_name}'
-                """)
-                
-                if cursor.fetchone():
-                    self.logger.info(f"Found ID column for {dim_table}: {col_name}")
-                    return col_name
-            except:
-                continue
+            if col_name in table_columns:
+                self.logger.info(f"Found ID column for {dim_table}: {col_name}")
+                return col_name
         
         # Ostatnia szansa - znajdź pierwszą kolumnę z 'id' w nazwie
-        try:
-            cursor.execute(f"""
-                SELECT TOP 1 COLUMN_NAME
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_NAME = '{dim_table}'
-                AND COLUMN_NAME LIKE '%id%'
-                ORDER BY ORDINAL_POSITION
-            """)
-            
-            row = cursor.fetchone()
-            if row:
-                self.logger.info(f"Found ID column for {dim_table} by pattern match: {row.COLUMN_NAME}")
-                return row.COLUMN_NAME
-        except:
-            pass
+        for col_name in table_columns:
+            if 'id' in col_name.lower():
+                self.logger.info(f"Found ID column for {dim_table} by pattern match: {col_name}")
+                return col_name
         
         # Domyślnie
         self.logger.warning(f"Could not determine ID column for {dim_table}, using default: id")
@@ -8,20 +8,391 @@ import pyodbc
 import logging
 import os
 import sys
+import tempfile
 from datetime import datetime, date, timedelta
 import pandas as pd
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+# Atrybut ODBC rozmiaru pakietu TDS (ustawiany przed połączeniem)
+SQL_ATTR_PACKET_SIZE = 112
+
+# Rozmiar pakietu TDS - maksymalny 32767 zamiast domyślnych 4096 bajtów
+# (mniej ramek dla szerokich wierszy ładowania masowego)
+DEFAULT_PACKET_SIZE = 32767
+
+# Minimalna partia trafiająca do columnstore jako skompresowany rowgroup
+# (mniejsze partie lądują w delta store)
+COLUMNSTORE_MIN_BATCH_SIZE = 102400
+
+# Definicje tabel wymiarów
+DIMENSION_TABLE_DDL = {
+    'dim_date': """
+        CREATE TABLE dim_date (
+            date_id INT IDENTITY(0,1) PRIMARY KEY,
+            full_date DATE NOT NULL,
+            day_of_week VARCHAR(10),
+            day_of_month INT,
+            month INT,
+            month_name VARCHAR(20),
+            quarter INT,
+            year INT,
+            season VARCHAR(20),
+            is_holiday BIT NOT NULL DEFAULT 0,
+            holiday_name VARCHAR(100),
+            holiday_type VARCHAR(50),
+            is_school_day BIT NOT NULL DEFAULT 0,
+            is_weekend BIT NOT NULL DEFAULT 0,
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'dim_time': """
+        CREATE TABLE dim_time (
+            time_id INT IDENTITY(0,1) PRIMARY KEY,
+            hour INT,
+            minute INT,
+            day_period VARCHAR(10),
+            is_peak_hour BIT NOT NULL DEFAULT 0,
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'dim_bidding_zone': """
+        CREATE TABLE dim_bidding_zone (
+            bidding_zone_id INT IDENTITY(0,1) PRIMARY KEY,
+            bidding_zone_code VARCHAR(50),
+            bidding_zone_name VARCHAR(100),
+            primary_country VARCHAR(50),
+            secondary_countries VARCHAR(100),
+            control_area VARCHAR(50),
+            timezone VARCHAR(50),
+            population BIGINT,
+            gdp_per_capita DECIMAL(15, 2),
+            energy_intensity DECIMAL(15, 2),
+            electricity_price_avg DECIMAL(10, 2),
+            year INT,
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'dim_weather_zone': """
+        CREATE TABLE dim_weather_zone (
+            weather_zone_id INT IDENTITY(0,1) PRIMARY KEY,
+            weather_zone_name VARCHAR(100),
+            bidding_zone_id INT,
+            climate_zone VARCHAR(50),
+            elevation_avg DECIMAL(8, 2),
+            coastal_proximity VARCHAR(20),
+            urbanization_level VARCHAR(20),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'dim_generation_type': """
+        CREATE TABLE dim_generation_type (
+            generation_type_id INT IDENTITY(0,1) PRIMARY KEY,
+            entso_code VARCHAR(5),
+            generation_category VARCHAR(50),
+            generation_type VARCHAR(50),
+            is_intermittent BIT NOT NULL DEFAULT 0,
+            fuel_source VARCHAR(50),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'dim_weather_condition': """
+        CREATE TABLE dim_weather_condition (
+            weather_condition_id INT IDENTITY(0,1) PRIMARY KEY,
+            condition_type VARCHAR(30),
+            condition_severity VARCHAR(20),
+            is_extreme_weather BIT NOT NULL DEFAULT 0,
+            extreme_weather_type VARCHAR(30),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'dim_socioeconomic_profile': """
+        CREATE TABLE dim_socioeconomic_profile (
+            socioeconomic_profile_id INT IDENTITY(0,1) PRIMARY KEY,
+            bidding_zone_code VARCHAR(50),
+            country_code VARCHAR(5),
+            country_name VARCHAR(100),
+            year INT,
+            avg_income_level DECIMAL(12, 2),
+            unemployment_rate DECIMAL(5, 2),
+            urbanization_rate DECIMAL(5, 2),
+            service_sector_percentage DECIMAL(5, 2),
+            industry_sector_percentage DECIMAL(5, 2),
+            energy_poverty_rate DECIMAL(5, 2),
+            residential_percentage DECIMAL(5, 2),
+            commercial_percentage DECIMAL(5, 2),
+            industrial_percentage DECIMAL(5, 2),
+            avg_household_size DECIMAL(5, 2),
+            primary_heating_type VARCHAR(50),
+            population BIGINT,
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+}
+
+# Definicja tabeli faktów - klastrowanie po dacie i strefie, jak filtrują zapytania analityczne
+FACT_TABLE_DDL = {
+    'fact_energy_weather': """
+        CREATE TABLE fact_energy_weather (
+            energy_weather_id BIGINT IDENTITY(1,1) NOT NULL,
+            date_id INT NOT NULL,
+            time_id INT NOT NULL,
+            bidding_zone_id INT NOT NULL,
+            weather_zone_id INT NOT NULL,
+            generation_type_id INT,
+            weather_condition_id INT,
+            socioeconomic_profile_id INT,
+            actual_consumption DECIMAL(18, 2),
+            forecasted_consumption DECIMAL(18, 2),
+            consumption_deviation DECIMAL(10, 2),
+            generation_amount DECIMAL(18, 2),
+            capacity_factor DECIMAL(5, 2),
+            renewable_percentage DECIMAL(5, 2),
+            per_capita_consumption DECIMAL(18, 6),
+            temperature_avg DECIMAL(5, 2),
+            temperature_min DECIMAL(5, 2),
+            temperature_max DECIMAL(5, 2),
+            humidity DECIMAL(5, 2),
+            precipitation DECIMAL(8, 2),
+            wind_speed DECIMAL(5, 2),
+            wind_direction SMALLINT,
+            cloud_cover DECIMAL(5, 2),
+            solar_radiation DECIMAL(8, 2),
+            air_pressure DECIMAL(8, 2),
+            heating_degree_days DECIMAL(5, 2),
+            cooling_degree_days DECIMAL(5, 2),
+            created_at DATETIME2 DEFAULT GETDATE(),
+            CONSTRAINT PK_fact PRIMARY KEY NONCLUSTERED (energy_weather_id),
+            INDEX CIX_fact CLUSTERED (date_id, bidding_zone_id, time_id),
+            CONSTRAINT FK_fact_date FOREIGN KEY (date_id) REFERENCES dim_date(date_id),
+            CONSTRAINT FK_fact_time FOREIGN KEY (time_id) REFERENCES dim_time(time_id),
+            CONSTRAINT FK_fact_bidding_zone FOREIGN KEY (bidding_zone_id) REFERENCES dim_bidding_zone(bidding_zone_id),
+            CONSTRAINT FK_fact_weather_zone FOREIGN KEY (weather_zone_id) REFERENCES dim_weather_zone(weather_zone_id),
+            CONSTRAINT FK_fact_generation_type FOREIGN KEY (generation_type_id) REFERENCES dim_generation_type(generation_type_id),
+            CONSTRAINT FK_fact_weather_condition FOREIGN KEY (weather_condition_id) REFERENCES dim_weather_condition(weather_condition_id),
+            CONSTRAINT FK_fact_socioeconomic_profile FOREIGN KEY (socioeconomic_profile_id) REFERENCES dim_socioeconomic_profile(socioeconomic_profile_id)
+        )
+    """,
+}
+
+# Definicje tabel źródłowych - klucz główny nieklastrowy, dane w columnstore
+SOURCE_TABLE_DDL = {
+    'src_entso_actual_load': """
+        CREATE TABLE src_entso_actual_load (
+            entso_actual_load_id BIGINT IDENTITY(1,1) PRIMARY KEY NONCLUSTERED,
+            timestamp DATETIME2,
+            quantity DECIMAL(15, 2),
+            bidding_zone VARCHAR(50),
+            zone_code VARCHAR(50),
+            country VARCHAR(5),
+            data_type VARCHAR(20),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'src_entso_generation': """
+        CREATE TABLE src_entso_generation (
+            entso_generation_id BIGINT IDENTITY(1,1) PRIMARY KEY NONCLUSTERED,
+            timestamp DATETIME2,
+            quantity DECIMAL(15, 2),
+            bidding_zone VARCHAR(50),
+            zone_code VARCHAR(50),
+            country VARCHAR(5),
+            generation_type VARCHAR(5),
+            data_type VARCHAR(20),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'src_entso_forecast': """
+        CREATE TABLE src_entso_forecast (
+            entso_forecast_id BIGINT IDENTITY(1,1) PRIMARY KEY NONCLUSTERED,
+            timestamp DATETIME2,
+            quantity DECIMAL(15, 2),
+            bidding_zone VARCHAR(50),
+            zone_code VARCHAR(50),
+            country VARCHAR(5),
+            data_type VARCHAR(20),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'src_weather_data': """
+        CREATE TABLE src_weather_data (
+            weather_data_id BIGINT IDENTITY(1,1) PRIMARY KEY NONCLUSTERED,
+            timestamp DATETIME2,
+            subzone_code VARCHAR(10),
+            subzone_name VARCHAR(100),
+            country_code VARCHAR(5),
+            zone_name VARCHAR(100),
+            temperature_avg DECIMAL(5, 2),
+            temperature_min DECIMAL(5, 2),
+            temperature_max DECIMAL(5, 2),
+            humidity DECIMAL(5, 2),
+            precipitation DECIMAL(5, 2),
+            wind_speed DECIMAL(5, 2),
+            wind_direction INT,
+            air_pressure DECIMAL(8, 2),
+            cloud_cover DECIMAL(5, 2),
+            solar_radiation DECIMAL(8, 2),
+            weather_condition VARCHAR(30),
+            latitude DECIMAL(10, 6),
+            longitude DECIMAL(10, 6),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'src_climate_data': """
+        CREATE TABLE src_climate_data (
+            climate_data_id BIGINT IDENTITY(1,1) PRIMARY KEY NONCLUSTERED,
+            date DATE,
+            subzone_code VARCHAR(10),
+            subzone_name VARCHAR(100),
+            country_code VARCHAR(5),
+            zone_name VARCHAR(100),
+            heating_degree_days DECIMAL(5, 2),
+            cooling_degree_days DECIMAL(5, 2),
+            temperature_mean DECIMAL(5, 2),
+            temperature_min DECIMAL(5, 2),
+            temperature_max DECIMAL(5, 2),
+            latitude DECIMAL(10, 6),
+            longitude DECIMAL(10, 6),
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+    'src_eurostat_integrated': """
+        CREATE TABLE src_eurostat_integrated (
+            eurostat_integrated_id BIGINT IDENTITY(1,1) PRIMARY KEY NONCLUSTERED,
+            country_code VARCHAR(5),
+            country_name VARCHAR(100),
+            year INT,
+            population BIGINT,
+            gdp_per_capita DECIMAL(15, 2),
+            electricity_price_avg DECIMAL(10, 2),
+            energy_intensity DECIMAL(15, 2),
+            unemployment_rate DECIMAL(5, 2),
+            poverty_by_degree_of_urbanization DECIMAL(5, 2),
+            service_sector_percentage DECIMAL(5, 2),
+            industry_sector_percentage DECIMAL(5, 2),
+            avg_household_size DECIMAL(5, 2),
+            energy_poverty_rate DECIMAL(5, 2),
+            primary_heating_type VARCHAR(50),
+            data_quality_score INT,
+            created_at DATETIME2 DEFAULT GETDATE()
+        )
+    """,
+}
+
+# Kolumny ładowane z tabel staging do wymiarów
+DIMENSION_COLUMNS = {
+    'dim_date': ['full_date', 'day_of_week', 'day_of_month', 'month', 'month_name',
+                 'quarter', 'year', 'season', 'is_holiday', 'holiday_name',
+                 'holiday_type', 'is_school_day', 'is_weekend'],
+    'dim_time': ['hour', 'minute', 'day_period', 'is_peak_hour'],
+    'dim_bidding_zone': ['bidding_zone_code', 'bidding_zone_name', 'primary_country',
+                         'secondary_countries', 'control_area', 'timezone', 'population',
+                         'gdp_per_capita', 'energy_intensity', 'electricity_price_avg', 'year'],
+    'dim_weather_zone': ['weather_zone_name', 'bidding_zone_id', 'climate_zone',
+                         'elevation_avg', 'coastal_proximity', 'urbanization_level'],
+    'dim_generation_type': ['entso_code', 'generation_category', 'generation_type',
+                            'is_intermittent', 'fuel_source'],
+    'dim_weather_condition': ['condition_type', 'condition_severity',
+                              'is_extreme_weather', 'extreme_weather_type'],
+    'dim_socioeconomic_profile': ['bidding_zone_code', 'country_code', 'country_name',
+                                  'year', 'avg_income_level', 'unemployment_rate',
+                                  'urbanization_rate', 'service_sector_percentage',
+                                  'industry_sector_percentage', 'energy_poverty_rate',
+                                  'residential_percentage', 'commercial_percentage',
+                                  'industrial_percentage', 'avg_household_size',
+                                  'primary_heating_type', 'population'],
+}
+
+# Flagi wymiarów przechowywane jako BIT - staging dostarcza 'Yes'/'No'
+DIMENSION_FLAG_COLUMNS = frozenset({
+    'is_holiday', 'is_school_day', 'is_weekend', 'is_peak_hour',
+    'is_intermittent', 'is_extreme_weather',
+})
+
+# Klucze biznesowe wymiarów - dopasowanie wierszy staging przy MERGE
+DIMENSION_BUSINESS_KEYS = {
+    'dim_date': ('full_date',),
+    'dim_time': ('hour', 'minute'),
+    'dim_bidding_zone': ('bidding_zone_code', 'year'),
+    'dim_weather_zone': ('weather_zone_name',),
+    'dim_generation_type': ('entso_code',),
+    'dim_weather_condition': ('condition_type', 'condition_severity'),
+    'dim_socioeconomic_profile': ('bidding_zone_code', 'country_code', 'year'),
+}
+
+# Tabela robocza ładowania faktów - przełączana do pustej fact_energy_weather
+FACT_LOAD_TABLE = 'fact_energy_weather_load'
+
+# Indeksy kluczy obcych tabeli faktów: (nazwa, kolumna, kolumny INCLUDE);
+# date_id prowadzi indeks klastrowy CIX_fact, więc nie ma osobnego indeksu
+# Tworzone po załadowaniu faktów, żeby INSERT nie utrzymywał B-drzew wiersz po wierszu
+FACT_INDEXES = (
+    ('IX_fact_time', 'time_id', ()),
+    ('IX_fact_bz', 'bidding_zone_id', ('actual_consumption', 'generation_amount')),
+    ('IX_fact_weather_zone', 'weather_zone_id', ()),
+    ('IX_fact_generation_type', 'generation_type_id', ()),
+    ('IX_fact_weather_condition', 'weather_condition_id', ()),
+    ('IX_fact_socioeconomic_profile', 'socioeconomic_profile_id', ()),
+)
+
+# Domyślne rekordy wymiarów (ID=0) - wartości przekazywane jako parametry
+DEFAULT_DIMENSION_RECORDS = {
+    'dim_date': {
+        'date_id': 0, 'full_date': '1900-01-01', 'day_of_week': 'Unknown', 'day_of_month': 0,
+        'month': 0, 'month_name': 'Unknown', 'quarter': 0, 'year': 0, 'season': 'Unknown',
+        'is_holiday': 0, 'holiday_name': 'None', 'holiday_type': 'None',
+        'is_school_day': 0, 'is_weekend': 0,
+    },
+    'dim_time': {
+        'time_id': 0, 'hour': 0, 'minute': 0, 'day_period': 'Unknown', 'is_peak_hour': 0,
+    },
+    'dim_bidding_zone': {
+        'bidding_zone_id': 0, 'bidding_zone_code': 'UNKNOWN', 'bidding_zone_name': 'Unknown',
+        'primary_country': 'UNK', 'secondary_countries': 'None', 'control_area': 'Unknown',
+        'timezone': 'UTC', 'population': 0, 'gdp_per_capita': 0.0, 'energy_intensity': 0.0,
+        'electricity_price_avg': 0.0, 'year': 0,
+    },
+    'dim_weather_zone': {
+        'weather_zone_id': 0, 'weather_zone_name': 'Unknown', 'bidding_zone_id': 0,
+        'climate_zone': 'Unknown', 'elevation_avg': 0.0, 'coastal_proximity': 'Unknown',
+        'urbanization_level': 'Unknown',
+    },
+    'dim_generation_type': {
+        'generation_type_id': 0, 'entso_code': 'B20', 'generation_category': 'Unknown',
+        'generation_type': 'Unknown', 'is_intermittent': 0, 'fuel_source': 'Unknown',
+    },
+    'dim_weather_condition': {
+        'weather_condition_id': 0, 'condition_type': 'Unknown', 'condition_severity': 'None',
+        'is_extreme_weather': 0, 'extreme_weather_type': 'None',
+    },
+    'dim_socioeconomic_profile': {
+        'socioeconomic_profile_id': 0, 'bidding_zone_code': 'UNKNOWN', 'country_code': 'UNK',
+        'country_name': 'Unknown', 'year': 0, 'avg_income_level': 0.0, 'unemployment_rate': 0.0,
+        'urbanization_rate': 0.0, 'service_sector_percentage': 0.0, 'industry_sector_percentage': 0.0,
+        'energy_poverty_rate': 0.0, 'residential_percentage': 0.0, 'commercial_percentage': 0.0,
+        'industrial_percentage': 0.0, 'avg_household_size': 0.0, 'primary_heating_type': 'Unknown',
+        'population': 0,
+    },
+}
 
 class WarehouseBuilder:
     """Klasa do przebudowy hurtowni danych"""
     
-    def __init__(self, connection_string: str):
+    def __init__(self, connection_string: str, packet_size: int = DEFAULT_PACKET_SIZE,
+                 load_batch_size: Optional[int] = None):
         """
         Inicjalizacja
         
         Args:
             connection_string: String połączenia z bazą danych
+            packet_size: Rozmiar pakietu TDS w bajtach
+            load_batch_size: Rozmiar partii ładowania tabel źródłowych i faktów
+                (None - jedna instrukcja na tabelę); partie tabel źródłowych są
+                commitowane osobno, partie faktów należą do jednej transakcji
         """
         self.connection_string = connection_string
+        self.packet_size = packet_size
+        self.load_batch_size = load_batch_size
         
         # Konfiguracja logowania
         logging.basicConfig(level=logging.INFO)
@@ -30,7 +401,7 @@ class WarehouseBuilder:
         # Lista tabel do usunięcia
         self.tables_to_drop = [
             # Tabele faktów
-            'fact_energy_weather',
+            FACT_LOAD_TABLE, 'fact_energy_weather',
             # Tabele wymiarów
             'dim_date', 'dim_time', 'dim_bidding_zone', 'dim_weather_zone',
             'dim_generation_type', 'dim_weather_condition', 'dim_socioeconomic_profile',
@@ -39,6 +410,124 @@ class WarehouseBuilder:
             'src_weather_data', 'src_climate_data', 'src_eurostat_integrated'
         ]
         
+        # Wspólne połączenie dla wszystkich etapów przebudowy
+        self._conn: Optional[pyodbc.Connection] = None
+        
+        # Liczba wierszy załadowanych w tej przebudowie (z cursor.rowcount, bez COUNT(*))
+        self._table_counts: Dict[str, int] = {}
+        
+        # Kolumny tabel z INFORMATION_SCHEMA (jedno zapytanie na ładowanie)
+        self._schema_cache: Optional[Dict[str, List[str]]] = None
+        self._identity_cache: Dict[str, str] = {}
+        
+    def _connect(self) -> pyodbc.Connection:
+        """
+        Nowe połączenie z bazą danych
+        
+        Returns:
+            Połączenie pyodbc
+        """
+        return pyodbc.connect(
+            self.connection_string,
+            attrs_before={SQL_ATTR_PACKET_SIZE: self.packet_size}
+        )
+    
+    def _get_conn(self) -> pyodbc.Connection:
+        """
+        Wspólne połączenie, otwierane przy pierwszym użyciu
+        
+        Returns:
+            Połączenie pyodbc
+        """
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+    
+    def close(self):
+        """Zamknięcie wspólnego połączenia"""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            finally:
+                self._conn = None
+    
+    def _rollback(self):
+        """Wycofanie niezatwierdzonej fazy na wspólnym połączeniu"""
+        if self._conn is not None:
+            try:
+                self._conn.rollback()
+            except pyodbc.Error as e:
+                self.logger.warning(f"Rollback failed: {str(e)}")
+    
+    def _cursor(self, conn):
+        """
+        Kursor z włączonym fast_executemany (tablice parametrów ODBC)
+        
+        Args:
+            conn: Połączenie z bazą danych
+            
+        Returns:
+            Kursor pyodbc
+        """
+        cursor = conn.cursor()
+        cursor.fast_executemany = True
+        return cursor
+    
+    def _load_schema_cache(self, cursor):
+        """
+        Odczyt kolumn wszystkich tabel jednym zapytaniem do INFORMATION_SCHEMA
+        
+        Args:
+            cursor: Kursor bazy danych
+        """
+        cursor.execute("""
+            SELECT
+                TABLE_NAME,
+                COLUMN_NAME,
+                COLUMNPROPERTY(OBJECT_ID(TABLE_SCHEMA + '.' + TABLE_NAME), COLUMN_NAME, 'IsIdentity') AS is_identity
+            FROM INFORMATION_SCHEMA.COLUMNS
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """)
+        
+        schema: Dict[str, List[str]] = {}
+        identity: Dict[str, str] = {}
+        for row in cursor.fetchall():
+            schema.setdefault(row.TABLE_NAME, []).append(row.COLUMN_NAME)
+            if row.is_identity == 1:
+                identity[row.TABLE_NAME] = row.COLUMN_NAME
+        self._schema_cache = schema
+        self._identity_cache = identity
+    
+    def _get_table_columns(self, cursor, table_name: str) -> List[str]:
+        """
+        Kolumny tabeli z cache schematu
+        
+        Args:
+            cursor: Kursor bazy danych
+            table_name: Nazwa tabeli
+            
+        Returns:
+            Lista kolumn w kolejności definicji (pusta dla nieistniejącej tabeli)
+        """
+        if self._schema_cache is None:
+            self._load_schema_cache(cursor)
+        return self._schema_cache.get(table_name, [])
+    
+    def _get_identity_column(self, cursor, table_name: str) -> Optional[str]:
+        """
+        Kolumna IDENTITY tabeli z cache schematu
+        
+        Args:
+            cursor: Kursor bazy danych
+            table_name: Nazwa tabeli
+            
+        Returns:
+            Nazwa kolumny IDENTITY (None gdy tabela jej nie ma)
+        """
+        if self._schema_cache is None:
+            self._load_schema_cache(cursor)
+        return self._identity_cache.get(table_name)
+    
     def drop_tables(self) -> bool:
         """
         Usuwanie istniejących tabel
@@ -49,8 +538,8 @@ class WarehouseBuilder:
         self.logger.info("Dropping existing tables")
         
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            conn = self._get_conn()
+            cursor = self._cursor(conn)
             
             # Najpierw usuń ograniczenia kluczy obcych
             self.logger.info("Dropping foreign key constraints")
@@ -76,26 +565,22 @@ class WarehouseBuilder:
                 
                 self.logger.info(f"Dropping foreign key {fk_name} from {table_name}")
                 cursor.execute(f"ALTER TABLE {table_name} DROP CONSTRAINT {fk_name}")
-                conn.commit()
             
-            # Teraz usuń tabele
+            # Teraz usuń tabele - cała faza w jednej transakcji
             for table in self.tables_to_drop:
-                try:
-                    cursor.execute(f"""
-                        IF OBJECT_ID('{table}', 'U') IS NOT NULL
-                            DROP TABLE {table}
-                    """)
-                    conn.commit()
-                    self.logger.info(f"Dropped table {table}")
-                except Exception as e:
-                    self.logger.error(f"Error dropping table {table}: {str(e)}")
-                    conn.rollback()
+                cursor.execute(f"""
+                    IF OBJECT_ID('{table}', 'U') IS NOT NULL
+                        DROP TABLE {table}
+                """)
+                self.logger.info(f"Dropped table {table}")
+            
+            conn.commit()
             
-            conn.close()
             return True
             
         except Exception as e:
             self.logger.error(f"Error dropping tables: {str(e)}")
+            self._rollback()
             return False
     
     def create_dimension_tables(self) -> bool:
@@ -108,143 +593,25 @@ class WarehouseBuilder:
         self.logger.info("Creating dimension tables")
         
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
-            
-            # Tabela wymiaru Date
-            self.logger.info("Creating dim_date table")
-            cursor.execute("""
-                CREATE TABLE dim_date (
-                    date_id INT IDENTITY(0,1) PRIMARY KEY,
-                    full_date DATE NOT NULL,
-                    day_of_week VARCHAR(10),
-                    day_of_month INT,
-                    month INT,
-                    month_name VARCHAR(20),
-                    quarter INT,
-                    year INT,
-                    season VARCHAR(20),
-                    is_holiday VARCHAR(3),
-                    holiday_name VARCHAR(100),
-                    holiday_type VARCHAR(50),
-                    is_school_day VARCHAR(3),
-                    is_weekend VARCHAR(3),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
-            
-            # Tabela wymiaru Time
-            self.logger.info("Creating dim_time table")
-            cursor.execute("""
-                CREATE TABLE dim_time (
-                    time_id INT IDENTITY(0,1) PRIMARY KEY,
-                    hour INT,
-                    minute INT,
-                    day_period VARCHAR(10),
-                    is_peak_hour VARCHAR(3),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
-            
-            # Tabela wymiaru Bidding Zone
-            self.logger.info("Creating dim_bidding_zone table")
-            cursor.execute("""
-                CREATE TABLE dim_bidding_zone (
-                    bidding_zone_id INT IDENTITY(0,1) PRIMARY KEY,
-                    bidding_zone_code VARCHAR(50),
-                    bidding_zone_name VARCHAR(100),
-                    primary_country VARCHAR(50),
-                    secondary_countries VARCHAR(100),
-                    control_area VARCHAR(50),
-                    timezone VARCHAR(50),
-                    population BIGINT,
-                    gdp_per_capita DECIMAL(15, 2),
-                    energy_intensity DECIMAL(15, 2),
-                    electricity_price_avg DECIMAL(10, 2),
-                    year INT,
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
-            
-            # Tabela wymiaru Weather Zone
-            self.logger.info("Creating dim_weather_zone table")
-            cursor.execute("""
-                CREATE TABLE dim_weather_zone (
-                    weather_zone_id INT IDENTITY(0,1) PRIMARY KEY,
-                    weather_zone_name VARCHAR(100),
-                    bidding_zone_id INT,
-                    climate_zone VARCHAR(50),
-                    elevation_avg DECIMAL(8, 2),
-                    coastal_proximity VARCHAR(20),
-                    urbanization_level VARCHAR(20),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
-            
-            # Tabela wymiaru Generation Type
-            self.logger.info("Creating dim_generation_type table")
-            cursor.execute("""
-                CREATE TABLE dim_generation_type (
-                    generation_type_id INT IDENTITY(0,1) PRIMARY KEY,
-                    entso_code VARCHAR(5),
-                    generation_category VARCHAR(50),
-                    generation_type VARCHAR(50),
-                    is_intermittent VARCHAR(3),
-                    fuel_source VARCHAR(50),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
+            conn = self._get_conn()
+            cursor = self._cursor(conn)
             
-            # Tabela wymiaru Weather Condition
-            self.logger.info("Creating dim_weather_condition table")
-            cursor.execute("""
-                CREATE TABLE dim_weather_condition (
-                    weather_condition_id INT IDENTITY(0,1) PRIMARY KEY,
-                    condition_type VARCHAR(30),
-                    condition_severity VARCHAR(20),
-                    is_extreme_weather VARCHAR(3),
-                    extreme_weather_type VARCHAR(30),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
+            # Wszystkie CREATE TABLE w jednej paczce i jednej transakcji
+            self.logger.info(f"Creating tables: {', '.join(DIMENSION_TABLE_DDL)}")
+            cursor.execute(";\n".join(DIMENSION_TABLE_DDL.values()))
             
-            # Tabela wymiaru Socioeconomic Profile
-            self.logger.info("Creating dim_socioeconomic_profile table")
-            cursor.execute("""
-                CREATE TABLE dim_socioeconomic_profile (
-                    socioeconomic_profile_id INT IDENTITY(0,1) PRIMARY KEY,
-                    bidding_zone_code VARCHAR(50),
-                    country_code VARCHAR(5),
-                    country_name VARCHAR(100),
-                    year INT,
-                    avg_income_level DECIMAL(12, 2),
-                    unemployment_rate DECIMAL(5, 2),
-                    urbanization_rate DECIMAL(5, 2),
-                    service_sector_percentage DECIMAL(5, 2),
-                    industry_sector_percentage DECIMAL(5, 2),
-                    energy_poverty_rate DECIMAL(5, 2),
-                    residential_percentage DECIMAL(5, 2),
-                    commercial_percentage DECIMAL(5, 2),
-                    industrial_percentage DECIMAL(5, 2),
-                    avg_household_size DECIMAL(5, 2),
-                    primary_heating_type VARCHAR(50),
-                    population BIGINT,
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
+            # Indeksy kluczy biznesowych - MERGE przy ładowaniu wyszukuje zamiast skanować
+            cursor.execute(";\n".join(
+                f"CREATE NONCLUSTERED INDEX IX_{dim}_business_key ON {dim} ({', '.join(keys)})"
+                for dim, keys in DIMENSION_BUSINESS_KEYS.items()
+            ))
             conn.commit()
             
-            conn.close()
             return True
             
         except Exception as e:
             self.logger.error(f"Error creating dimension tables: {str(e)}")
+            self._rollback()
             return False
     
     def create_fact_table(self) -> bool:
@@ -257,56 +624,18 @@ class WarehouseBuilder:
         self.logger.info("Creating fact table")
         
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            conn = self._get_conn()
+            cursor = self._cursor(conn)
             
             # Tabela faktów Energy Weather
-            cursor.execute("""
-                CREATE TABLE fact_energy_weather (
-                    energy_weather_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    date_id INT NOT NULL,
-                    time_id INT NOT NULL,
-                    bidding_zone_id INT NOT NULL,
-                    weather_zone_id INT NOT NULL,
-                    generation_type_id INT,
-                    weather_condition_id INT,
-                    socioeconomic_profile_id INT,
-                    actual_consumption DECIMAL(18, 2),
-                    forecasted_consumption DECIMAL(18, 2),
-                    consumption_deviation DECIMAL(10, 2),
-                    generation_amount DECIMAL(18, 2),
-                    capacity_factor DECIMAL(5, 2),
-                    renewable_percentage DECIMAL(5, 2),
-                    per_capita_consumption DECIMAL(18, 6),
-                    temperature_avg DECIMAL(5, 2),
-                    temperature_min DECIMAL(5, 2),
-                    temperature_max DECIMAL(5, 2),
-                    humidity DECIMAL(5, 2),
-                    precipitation DECIMAL(8, 2),
-                    wind_speed DECIMAL(5, 2),
-                    wind_direction INT,
-                    cloud_cover DECIMAL(5, 2),
-                    solar_radiation DECIMAL(8, 2),
-                    air_pressure DECIMAL(8, 2),
-                    heating_degree_days DECIMAL(5, 2),
-                    cooling_degree_days DECIMAL(5, 2),
-                    created_at DATETIME2 DEFAULT GETDATE(),
-                    CONSTRAINT FK_fact_date FOREIGN KEY (date_id) REFERENCES dim_date(date_id),
-                    CONSTRAINT FK_fact_time FOREIGN KEY (time_id) REFERENCES dim_time(time_id),
-                    CONSTRAINT FK_fact_bidding_zone FOREIGN KEY (bidding_zone_id) REFERENCES dim_bidding_zone(bidding_zone_id),
-                    CONSTRAINT FK_fact_weather_zone FOREIGN KEY (weather_zone_id) REFERENCES dim_weather_zone(weather_zone_id),
-                    CONSTRAINT FK_fact_generation_type FOREIGN KEY (generation_type_id) REFERENCES dim_generation_type(generation_type_id),
-                    CONSTRAINT FK_fact_weather_condition FOREIGN KEY (weather_condition_id) REFERENCES dim_weather_condition(weather_condition_id),
-                    CONSTRAINT FK_fact_socioeconomic_profile FOREIGN KEY (socioeconomic_profile_id) REFERENCES dim_socioeconomic_profile(socioeconomic_profile_id)
-                )
-            """)
+            cursor.execute(";\n".join(FACT_TABLE_DDL.values()))
             conn.commit()
             
-            conn.close()
             return True
             
         except Exception as e:
             self.logger.error(f"Error creating fact table: {str(e)}")
+            self._rollback()
             return False
     
     def create_source_tables(self) -> bool:
@@ -319,132 +648,26 @@ class WarehouseBuilder:
         self.logger.info("Creating source tables")
         
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
-            
-            # Tabela ENTSO-E Load
-            cursor.execute("""
-                CREATE TABLE src_entso_actual_load (
-                    entso_actual_load_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    timestamp DATETIME2,
-                    quantity DECIMAL(15, 2),
-                    bidding_zone VARCHAR(50),
-                    zone_code VARCHAR(50),
-                    country VARCHAR(5),
-                    data_type VARCHAR(20),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
-            
-            # Tabela ENTSO-E Generation
-            cursor.execute("""
-                CREATE TABLE src_entso_generation (
-                    entso_generation_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    timestamp DATETIME2,
-                    quantity DECIMAL(15, 2),
-                    bidding_zone VARCHAR(50),
-                    zone_code VARCHAR(50),
-                    country VARCHAR(5),
-                    generation_type VARCHAR(5),
-                    data_type VARCHAR(20),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
-            
-            # Tabela ENTSO-E Forecast
-            cursor.execute("""
-                CREATE TABLE src_entso_forecast (
-                    entso_forecast_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    timestamp DATETIME2,
-                    quantity DECIMAL(15, 2),
-                    bidding_zone VARCHAR(50),
-                    zone_code VARCHAR(50),
-                    country VARCHAR(5),
-                    data_type VARCHAR(20),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
-            
-            # Tabela Weather Data
-            cursor.execute("""
-                CREATE TABLE src_weather_data (
-                    weather_data_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    timestamp DATETIME2,
-                    subzone_code VARCHAR(10),
-                    subzone_name VARCHAR(100),
-                    country_code VARCHAR(5),
-                    zone_name VARCHAR(100),
-                    temperature_avg DECIMAL(5, 2),
-                    temperature_min DECIMAL(5, 2),
-                    temperature_max DECIMAL(5, 2),
-                    humidity DECIMAL(5, 2),
-                    precipitation DECIMAL(5, 2),
-                    wind_speed DECIMAL(5, 2),
-                    wind_direction INT,
-                    air_pressure DECIMAL(8, 2),
-                    cloud_cover DECIMAL(5, 2),
-                    solar_radiation DECIMAL(8, 2),
-                    weather_condition VARCHAR(30),
-                    latitude DECIMAL(10, 6),
-                    longitude DECIMAL(10, 6),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
+            conn = self._get_conn()
+            cursor = self._cursor(conn)
             
-            # Tabela Climate Data
-            cursor.execute("""
-                CREATE TABLE src_climate_data (
-                    climate_data_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    date DATE,
-                    subzone_code VARCHAR(10),
-                    subzone_name VARCHAR(100),
-                    country_code VARCHAR(5),
-                    zone_name VARCHAR(100),
-                    heating_degree_days DECIMAL(5, 2),
-                    cooling_degree_days DECIMAL(5, 2),
-                    temperature_mean DECIMAL(5, 2),
-                    temperature_min DECIMAL(5, 2),
-                    temperature_max DECIMAL(5, 2),
-                    latitude DECIMAL(10, 6),
-                    longitude DECIMAL(10, 6),
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
-            conn.commit()
+            # Wszystkie CREATE TABLE w jednej paczce i jednej transakcji
+            self.logger.info(f"Creating tables: {', '.join(SOURCE_TABLE_DDL)}")
+            cursor.execute(";\n".join(SOURCE_TABLE_DDL.values()))
             
-            # Tabela Eurostat Integrated
-            cursor.execute("""
-                CREATE TABLE src_eurostat_integrated (
-                    eurostat_integrated_id BIGINT IDENTITY(1,1) PRIMARY KEY,
-                    country_code VARCHAR(5),
-                    country_name VARCHAR(100),
-                    year INT,
-                    population BIGINT,
-                    gdp_per_capita DECIMAL(15, 2),
-                    electricity_price_avg DECIMAL(10, 2),
-                    energy_intensity DECIMAL(15, 2),
-                    unemployment_rate DECIMAL(5, 2),
-                    poverty_by_degree_of_urbanization DECIMAL(5, 2),
-                    service_sector_percentage DECIMAL(5, 2),
-                    industry_sector_percentage DECIMAL(5, 2),
-                    avg_household_size DECIMAL(5, 2),
-                    energy_poverty_rate DECIMAL(5, 2),
-                    primary_heating_type VARCHAR(50),
-                    data_quality_score INT,
-                    created_at DATETIME2 DEFAULT GETDATE()
-                )
-            """)
+            # Klastrowe indeksy columnstore - szerokie tabele numeryczne skanowane
+            # agregatami: kompresja kolumn i wykonanie w trybie wsadowym
+            cursor.execute(";\n".join(
+                f"CREATE CLUSTERED COLUMNSTORE INDEX CCI_{table} ON {table}"
+                for table in SOURCE_TABLE_DDL
+            ))
             conn.commit()
             
-            conn.close()
             return True
             
         except Exception as e:
             self.logger.error(f"Error creating source tables: {str(e)}")
+            self._rollback()
             return False
     
     def insert_default_dimension_records(self) -> bool:
@@ -457,287 +680,363 @@ class WarehouseBuilder:
         self.logger.info("Inserting default dimension records")
         
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
-            
-            # Domyślny rekord dla dim_date
-            self.logger.info("Inserting default record for dim_date")
-            cursor.execute("""
-                SET IDENTITY_INSERT dim_date ON;
-                INSERT INTO dim_date (date_id, full_date, day_of_week, day_of_month, month, month_name, quarter, year, season, is_holiday, holiday_name, holiday_type, is_school_day, is_weekend)
-                VALUES (0, '1900-01-01', 'Unknown', 0, 0, 'Unknown', 0, 0, 'Unknown', 'No', 'None', 'None', 'No', 'No');
-                SET IDENTITY_INSERT dim_date OFF;
-            """)
-            conn.commit()
-            
-            # Domyślny rekord dla dim_time
-            self.logger.info("Inserting default record for dim_time")
-            cursor.execute("""
-                SET IDENTITY_INSERT dim_time ON;
-                INSERT INTO dim_time (time_id, hour, minute, day_period, is_peak_hour)
-                VALUES (0, 0, 0, 'Unknown', 'No');
-                SET IDENTITY_INSERT dim_time OFF;
-            """)
-            conn.commit()
-            
-            # Domyślny rekord dla dim_bidding_zone
-            self.logger.info("Inserting default record for dim_bidding_zone")
-            cursor.execute("""
-                SET IDENTITY_INSERT dim_bidding_zone ON;
-                INSERT INTO dim_bidding_zone (bidding_zone_id, bidding_zone_code, bidding_zone_name, primary_country, secondary_countries, control_area, timezone, population, gdp_per_capita, energy_intensity, electricity_price_avg, year)
-                VALUES (0, 'UNKNOWN', 'Unknown', 'UNK', 'None', 'Unknown', 'UTC', 0, 0.0, 0.0, 0.0, 0);
-                SET IDENTITY_INSERT dim_bidding_zone OFF;
-            """)
-            conn.commit()
-            
-            # Domyślny rekord dla dim_weather_zone
-            self.logger.info("Inserting default record for dim_weather_zone")
-            cursor.execute("""
-                SET IDENTITY_INSERT dim_weather_zone ON;
-                INSERT INTO dim_weather_zone (weather_zone_id, weather_zone_name, bidding_zone_id, climate_zone, elevation_avg, coastal_proximity, urbanization_level)
-                VALUES (0, 'Unknown', 0, 'Unknown', 0.0, 'Unknown', 'Unknown');
-                SET IDENTITY_INSERT dim_weather_zone OFF;
-            """)
-            conn.commit()
-            
-            # Domyślny rekord dla dim_generation_type
-            self.logger.info("Inserting default record for dim_generation_type")
-            cursor.execute("""
-                SET IDENTITY_INSERT dim_generation_type ON;
-                INSERT INTO dim_generation_type (generation_type_id, entso_code, generation_category, generation_type, is_intermittent, fuel_source)
-                VALUES (0, 'B20', 'Unknown', 'Unknown', 'No', 'Unknown');
-                SET IDENTITY_INSERT dim_generation_type OFF;
-            """)
-            conn.commit()
+            conn = self._get_conn()
+            cursor = self._cursor(conn)
             
-            # Domyślny rekord dla dim_weather_condition
-            self.logger.info("Inserting default record for dim_weather_condition")
-            cursor.execute("""
-                SET IDENTITY_INSERT dim_weather_condition ON;
-                INSERT INTO dim_weather_condition (weather_condition_id, condition_type, condition_severity, is_extreme_weather, extreme_weather_type)
-                VALUES (0, 'Unknown', 'None', 'No', 'None');
-                SET IDENTITY_INSERT dim_weather_condition OFF;
-            """)
-            conn.commit()
+            # Jeden skrypt dla wszystkich wymiarów - jedna podróż do serwera i jeden commit
+            statements = []
+            params = []
+            for dim_table, record in DEFAULT_DIMENSION_RECORDS.items():
+                # MERGE po ID=0 - ponowne uruchomienie nie narusza klucza głównego
+                id_column = next(iter(record))
+                statements.append(f"""
+                    SET IDENTITY_INSERT {dim_table} ON;
+                    MERGE {dim_table} AS tgt
+                    USING (VALUES ({', '.join('?' for _ in record)})) AS src ({', '.join(record)})
+                    ON tgt.{id_column} = src.{id_column}
+                    WHEN NOT MATCHED THEN
+                        INSERT ({', '.join(record)})
+                        VALUES ({', '.join(f"src.{col}" for col in record)});
+                    SET IDENTITY_INSERT {dim_table} OFF;
+                """)
+                params.extend(record.values())
             
-            # Domyślny rekord dla dim_socioeconomic_profile
-            self.logger.info("Inserting default record for dim_socioeconomic_profile")
-            cursor.execute("""
-                SET IDENTITY_INSERT dim_socioeconomic_profile ON;
-                INSERT INTO dim_socioeconomic_profile (socioeconomic_profile_id, bidding_zone_code, country_code, country_name, year, avg_income_level, unemployment_rate, urbanization_rate, service_sector_percentage, industry_sector_percentage, energy_poverty_rate, residential_percentage, commercial_percentage, industrial_percentage, avg_household_size, primary_heating_type, population)
-                VALUES (0, 'UNKNOWN', 'UNK', 'Unknown', 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 'Unknown', 0);
-                SET IDENTITY_INSERT dim_socioeconomic_profile OFF;
-            """)
+            self.logger.info(f"Inserting default records for: {', '.join(DEFAULT_DIMENSION_RECORDS)}")
+            cursor.execute("".join(statements), *params)
             conn.commit()
             
-            conn.close()
             return True
             
         except Exception as e:
             self.logger.error(f"Error inserting default dimension records: {str(e)}")
+            self._rollback()
             return False
     
     def load_data_from_staging(self) -> bool:
         """
         Ładowanie danych z tabel staging do docelowych - zoptymalizowana wersja
         
+        Wymiary i tabele źródłowe są od siebie niezależne, więc ładują się
+        równolegle na osobnych połączeniach. Fakty są ładowane dopiero po
+        wymiarach, bo ponowne włączenie kluczy obcych sprawdza ich istnienie.
+        
         Returns:
             True jeśli sukces, False w przeciwnym razie
         """
         self.logger.info("Loading data from staging")
         
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            conn = self._get_conn()
+            cursor = self._cursor(conn)
             
-            # Najpierw załaduj fakty, żeby nie czekać na nie na końcu
-            self.logger.info("Loading fact data first (optimized)")
-            self._load_fact_data(conn)
-            
-            # Ładowanie danych wymiarów - równolegle
-            dimensions = [
-                'dim_date', 'dim_time', 'dim_bidding_zone', 'dim_weather_zone',
-                'dim_generation_type', 'dim_weather_condition', 'dim_socioeconomic_profile'
-            ]
+            # Schemat po przebudowie - jedno zapytanie zamiast dwóch na tabelę;
+            # wątki tylko czytają gotowy cache
+            self._load_schema_cache(cursor)
+            self._table_counts.clear()
             
-            for dim in dimensions:
-                staging_table = f"staging_{dim}"
-                
-                # Sprawdź czy tabela staging istnieje i ma dane
-                cursor.execute(f"""
-                    IF OBJECT_ID('{staging_table}', 'U') IS NOT NULL
-                        SELECT COUNT(*) FROM {staging_table}
-                    ELSE
-                        SELECT 0
-                """)
-                
-                staging_count = cursor.fetchone()[0]
-                
-                if staging_count > 0:
-                    self.logger.info(f"Loading {staging_count} records from {staging_table} to {dim}")
-                    
-                    # Zoptymalizowane wstawianie - określ bezpośrednio potrzebne kolumny
-                    # zamiast znajdowania ich dynamicznie
-                    
-                    # Typowe kolumny dla każdego wymiaru
-                    dimension_columns = {
-                        'dim_date': ['full_date', 'day_of_week', 'day_of_month', 'month', 'month_name', 
-                                    'quarter', 'year', 'season', 'is_holiday', 'holiday_name', 
-                                    'holiday_type', 'is_school_day', 'is_weekend'],
-                        'dim_time': ['hour', 'minute', 'day_period', 'is_peak_hour'],
-                        'dim_bidding_zone': ['bidding_zone_code', 'bidding_zone_name', 'primary_country', 
-                                           'secondary_countries', 'control_area', 'timezone', 'population', 
-                                           'gdp_per_capita', 'energy_intensity', 'electricity_price_avg', 'year'],
-                        'dim_weather_zone': ['weather_zone_name', 'bidding_zone_id', 'climate_zone', 
-                                           'elevation_avg', 'coastal_proximity', 'urbanization_level'],
-                        'dim_generation_type': ['entso_code', 'generation_category', 'generation_type', 
-                                              'is_intermittent', 'fuel_source'],
-                        'dim_weather_condition': ['condition_type', 'condition_severity', 
-                                                'is_extreme_weather', 'extreme_weather_type'],
-                        'dim_socioeconomic_profile': ['bidding_zone_code', 'country_code', 'country_name', 
-                                                    'year', 'avg_income_level', 'unemployment_rate', 
-                                                    'urbanization_rate', 'service_sector_percentage', 
-                                                    'industry_sector_percentage', 'energy_poverty_rate', 
-                                                    'residential_percentage', 'commercial_percentage', 
-                                                    'industrial_percentage', 'avg_household_size', 
-                                                    'primary_heating_type', 'population']
-                    }
-                    
-                    # Pobierz kolumny z tabeli staging
-                    cursor.execute(f"""
-                        SELECT COLUMN_NAME 
-                        FROM INFORMATION_SCHEMA.COLUMNS
-                        WHERE TABLE_NAME = '{staging_table}'
-                        AND COLUMN_NAME <> 'id'
-                        AND COLUMN_NAME <> 'created_at'
-                    """)
-                    
-                    staging_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                    
-                    # Znajdź wspólne kolumny
-                    expected_columns = dimension_columns.get(dim, [])
-                    common_columns = [col for col in expected_columns if col in staging_columns]
-                    
-                    if common_columns:
-                        # Wstaw dane w jednej transakcji
-                        insert_sql = f"""
-                        INSERT INTO {dim} ({', '.join(common_columns)})
-                        SELECT {', '.join(common_columns)}
-                        FROM {staging_table}
-                        """
-                        
-                        cursor.execute(insert_sql)
-                        conn.commit()
-                        
-                        # Sprawdź liczbę wstawionych rekordów
-                        cursor.execute(f"SELECT COUNT(*) FROM {dim}")
-                        record_count = cursor.fetchone()[0]
-                        
-                        self.logger.info(f"Successfully loaded {record_count - 1} records to {dim}")
-                    else:
-                        self.logger.warning(f"No common columns found between {staging_table} and {dim}")
-                else:
-                    self.logger.warning(f"No data in {staging_table}, skipping {dim}")
+            # Ładowanie danych wymiarów i źródłowych - równolegle
+            with ThreadPoolExecutor(max_workers=len(DIMENSION_COLUMNS)) as executor:
+                list(executor.map(self._load_one_dim, DIMENSION_COLUMNS))
             
-            # Ładowanie danych źródłowych - zoptymalizowane
             source_tables = [
                 'src_entso_actual_load', 'src_entso_generation', 'src_entso_forecast',
                 'src_weather_data', 'src_climate_data', 'src_eurostat_integrated'
             ]
             
-            for src_table in source_tables:
-                staging_table = f"staging_{src_table.replace('src_', '')}"
-                
-                # Sprawdź czy tabela staging istnieje i ma dane
-                cursor.execute(f"""
-                    IF OBJECT_ID('{staging_table}', 'U') IS NOT NULL
-                        SELECT COUNT(*) FROM {staging_table}
-                    ELSE
-                        SELECT 0
-                """)
-                
-                staging_count = cursor.fetchone()[0]
-                
-                if staging_count > 0:
-                    self.logger.info(f"Loading {staging_count} records from {staging_table} to {src_table}")
-                    
-                    # Pobierz kolumny z tabeli docelowej (bez _id i created_at)
-                    cursor.execute(f"""
-                        SELECT COLUMN_NAME 
-                        FROM INFORMATION_SCHEMA.COLUMNS
-                        WHERE TABLE_NAME = '{src_table}'
-                        AND COLUMN_NAME NOT LIKE '%_id'
-                        AND COLUMN_NAME <> 'created_at'
-                    """)
-                    
-                    target_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                    
-                    # Pobierz kolumny z tabeli staging
-                    cursor.execute(f"""
-                        SELECT COLUMN_NAME 
-                        FROM INFORMATION_SCHEMA.COLUMNS
-                        WHERE TABLE_NAME = '{staging_table}'
-                        AND COLUMN_NAME <> 'id'
-                        AND COLUMN_NAME <> 'created_at'
-                    """)
-                    
-                    staging_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
-                    
-                    # Znajdź wspólne kolumny
-                    common_columns = [col for col in staging_columns if col in target_columns]
-                    
-                    if common_columns:
-                        # Zastosuj zoptymalizowane wstawianie partiami dla dużych tabel
-                        if staging_count > 10000:
-                            self.logger.info(f"Using batch insert for large table {src_table}")
-                            
-                            batch_size = 10000
-                            batch_count = (staging_count + batch_size - 1) // batch_size
-                            
-                            for i in range(batch_count):
-                                start_offset = i * batch_size
-                                
-                                # Wstaw partię danych
-                                batch_insert_sql = f"""
-                                INSERT INTO {src_table} ({', '.join(common_columns)})
-                                SELECT TOP {batch_size} {', '.join(common_columns)}
-                                FROM {staging_table}
-                                ORDER BY (SELECT NULL)
-                                OFFSET {start_offset} ROWS
-                                """
-                                
-                                cursor.execute(batch_insert_sql)
-                                conn.commit()
-                                
-                                self.logger.info(f"Inserted batch {i+1}/{batch_count} for {src_table}")
-                        else:
-                            # Dla mniejszych tabel wstaw wszystko na raz
-                            insert_sql = f"""
-                            INSERT INTO {src_table} ({', '.join(common_columns)})
-                            SELECT {', '.join(common_columns)}
-                            FROM {staging_table}
-                            """
-                            
-                            cursor.execute(insert_sql)
-                            conn.commit()
-                        
-                        # Sprawdź liczbę wstawionych rekordów
-                        cursor.execute(f"SELECT COUNT(*) FROM {src_table}")
-                        record_count = cursor.fetchone()[0]
-                        
-                        self.logger.info(f"Successfully loaded {record_count} records to {src_table}")
-                    else:
-                        self.logger.warning(f"No common columns found between {staging_table} and {src_table}")
-                else:
-                    self.logger.warning(f"No data in {staging_table}, skipping {src_table}")
+            with ThreadPoolExecutor(max_workers=len(source_tables)) as executor:
+                list(executor.map(self._load_one_source, source_tables))
+            
+            # Fakty po załadowaniu wszystkich wymiarów
+            self._load_fact_data(conn)
+            
+            # Podsumowanie z liczników ładowania - bez COUNT(*) na tabelach docelowych
+            for table_name, row_count in sorted(self._table_counts.items()):
+                self.logger.info(f"Loaded {row_count} records into {table_name}")
+            self.logger.info(
+                f"Loaded {sum(self._table_counts.values())} records into {len(self._table_counts)} tables"
+            )
             
-            conn.close()
             return True
             
         except Exception as e:
             self.logger.error(f"Error loading data from staging: {str(e)}")
+            self._rollback()
             return False
     
+    def _load_one_dim(self, dim: str):
+        """
+        Ładowanie jednego wymiaru z tabeli staging (wywoływane w wątku roboczym)
+        
+        Args:
+            dim: Nazwa tabeli wymiaru
+        """
+        staging_table = f"staging_{dim}"
+        conn = self._connect()
+        
+        try:
+            cursor = self._cursor(conn)
+            
+            # Liczba wierszy staging z metadanych (0 dla nieistniejącej tabeli)
+            staging_count = self._fast_count(cursor, staging_table)
+            
+            if staging_count == 0:
+                self.logger.warning(f"No data in {staging_table}, skipping {dim}")
+                return
+            
+            self.logger.info(f"Loading {staging_count} records from {staging_table} to {dim}")
+            
+            # Kolumny tabeli staging z cache schematu
+            staging_columns = [
+                col for col in self._get_table_columns(cursor, staging_table)
+                if col not in ('id', 'created_at')
+            ]
+            
+            # Znajdź wspólne kolumny
+            common_columns = [col for col in DIMENSION_COLUMNS[dim] if col in staging_columns]
+            
+            if not common_columns:
+                self.logger.warning(f"No common columns found between {staging_table} and {dim}")
+                return
+            
+            business_keys = DIMENSION_BUSINESS_KEYS.get(dim, ())
+            has_business_keys = bool(business_keys) and all(key in common_columns for key in business_keys)
+            
+            # Flagi 'Yes'/'No' z tabeli staging zamieniane na BIT
+            select_list = ', '.join(
+                f"CASE WHEN CAST({col} AS VARCHAR(5)) IN ('Yes', 'Y', '1', 'True') THEN 1 ELSE 0 END AS {col}"
+                if col in DIMENSION_FLAG_COLUMNS else col
+                for col in common_columns
+            )
+            
+            # Pusty wymiar (tylko rekord ID=0) - nie ma czego dopasowywać, więc zamiast
+            # MERGE jedno INSERT z TABLOCK (ładowanie masowe do pustej tabeli)
+            target_is_empty = self._fast_count(cursor, dim) <= 1
+            
+            if has_business_keys and target_is_empty:
+                load_sql = f"""
+                INSERT INTO {dim} WITH (TABLOCK) ({', '.join(common_columns)})
+                SELECT {', '.join(common_columns)}
+                FROM (
+                    SELECT {select_list},
+                           ROW_NUMBER() OVER (PARTITION BY {', '.join(business_keys)} ORDER BY (SELECT NULL)) AS rn
+                    FROM {staging_table}
+                ) AS deduplicated
+                WHERE rn = 1
+                """
+            elif has_business_keys:
+                # MERGE po kluczu biznesowym (indeks IX_<wymiar>_business_key) - ponowne
+                # uruchomienie nie duplikuje wierszy; duplikaty klucza w staging odrzucone
+                column_list = ', '.join(common_columns)
+                load_sql = f"""
+                MERGE {dim} WITH (TABLOCK) AS tgt
+                USING (
+                    SELECT {column_list}
+                    FROM (
+                        SELECT {select_list},
+                               ROW_NUMBER() OVER (PARTITION BY {', '.join(business_keys)} ORDER BY (SELECT NULL)) AS rn
+                        FROM {staging_table}
+                    ) AS deduplicated
+                    WHERE rn = 1
+                ) AS src
+                ON {' AND '.join(f"tgt.{key} = src.{key}" for key in business_keys)}
+                WHEN NOT MATCHED BY TARGET THEN
+                    INSERT ({column_list})
+                    VALUES ({', '.join(f"src.{col}" for col in common_columns)});
+                """
+            else:
+                load_sql = f"""
+                INSERT INTO {dim} WITH (TABLOCK) ({', '.join(common_columns)})
+                SELECT {select_list}
+                FROM {staging_table}
+                """
+            
+            cursor.execute(load_sql)
+            record_count = cursor.rowcount
+            conn.commit()
+            
+            self._count_loaded(dim, record_count)
+            
+            self.logger.info(f"Successfully loaded {record_count} new records to {dim}")
+        finally:
+            conn.close()
+    
+    def _load_one_source(self, src_table: str):
+        """
+        Ładowanie jednej tabeli źródłowej z tabeli staging (wywoływane w wątku roboczym)
+        
+        Args:
+            src_table: Nazwa tabeli źródłowej
+        """
+        staging_table = f"staging_{src_table.replace('src_', '')}"
+        conn = self._connect()
+        
+        try:
+            cursor = self._cursor(conn)
+            
+            # Liczba wierszy staging z metadanych (0 dla nieistniejącej tabeli)
+            staging_count = self._fast_count(cursor, staging_table)
+            
+            if staging_count == 0:
+                self.logger.warning(f"No data in {staging_table}, skipping {src_table}")
+                return
+            
+            self.logger.info(f"Loading {staging_count} records from {staging_table} to {src_table}")
+            
+            # Kolumny docelowe (bez _id i created_at) i staging z cache schematu
+            target_columns = {
+                col for col in self._get_table_columns(cursor, src_table)
+                if not col.endswith('_id') and col != 'created_at'
+            }
+            staging_columns = [
+                col for col in self._get_table_columns(cursor, staging_table)
+                if col not in ('id', 'created_at')
+            ]
+            
+            # Znajdź wspólne kolumny
+            common_columns = [col for col in staging_columns if col in target_columns]
+            
+            if not common_columns:
+                self.logger.warning(f"No common columns found between {staging_table} and {src_table}")
+                return
+            
+            # Jedna instrukcja z TABLOCK - ładowanie masowe, minimalnie
+            # logowane w modelu BULK_LOGGED/SIMPLE, bez partii OFFSET
+            insert_sql = f"""
+            INSERT INTO {src_table} WITH (TABLOCK) ({', '.join(common_columns)})
+            SELECT {', '.join(common_columns)}
+            FROM {staging_table}
+            """
+            
+            # Tabele src_* to clustered columnstore z nieklastrowym PK - nie mają
+            # indeksów do wyłączenia na czas ładowania
+            started = datetime.now()
+            key_column = self._get_identity_column(cursor, staging_table)
+            if self.load_batch_size and key_column:
+                # Partie po kluczu IDENTITY staging (wyszukanie zakresu zamiast OFFSET),
+                # commit po każdej partii ogranicza rozrost dziennika; nie mniej niż
+                # rowgroup columnstore, żeby partie nie trafiały do delta store
+                record_count = self._insert_keyset_batches(
+                    cursor, staging_table, key_column, insert_sql,
+                    max(self.load_batch_size, COLUMNSTORE_MIN_BATCH_SIZE), commit_batches=True
+                )
+            else:
+                cursor.execute(insert_sql)
+                record_count = cursor.rowcount
+            
+            conn.commit()
+            
+            elapsed = max((datetime.now() - started).total_seconds(), 0.001)
+            self.logger.info(
+                f"Bulk loaded {src_table} in {elapsed:.1f}s "
+                f"({staging_count / elapsed:,.0f} rows/s)"
+            )
+            
+            self._count_loaded(src_table, record_count)
+            self.logger.info(f"Successfully loaded {record_count} records to {src_table}")
+        finally:
+            conn.close()
+    
+    def _insert_keyset_batches(self, cursor, staging_table: str, key_column: str, insert_sql: str,
+                               batch_size: int, commit_batches: bool = False) -> int:
+        """
+        Wykonanie INSERT ... SELECT partiami zakresów kolumny IDENTITY tabeli staging
+        
+        Bez commit_batches partie należą do transakcji wywołującego - ograniczają
+        rozmiar pojedynczej instrukcji, ale nie rozrost dziennika transakcji.
+        
+        Args:
+            cursor: Kursor bazy danych
+            staging_table: Nazwa tabeli staging
+            key_column: Kolumna IDENTITY tabeli staging
+            insert_sql: Instrukcja INSERT ... SELECT ... FROM staging_table
+            batch_size: Liczba wartości klucza w partii
+            commit_batches: Commit po każdej partii (tylko gdy tabela docelowa nie ma
+                wyłączonych indeksów ani ograniczeń NOCHECK)
+            
+        Returns:
+            Liczba wstawionych wierszy
+        """
+        cursor.execute(f"SELECT MIN({key_column}), MAX({key_column}) FROM {staging_table}")
+        low_id, high_id = cursor.fetchone()
+        if low_id is None:
+            return 0
+        
+        batch_sql = f"{insert_sql} WHERE {key_column} BETWEEN ? AND ?"
+        record_count = 0
+        
+        for start in range(low_id, high_id + 1, batch_size):
+            cursor.execute(batch_sql, start, start + batch_size - 1)
+            record_count += cursor.rowcount
+            if commit_batches:
+                cursor.connection.commit()
+        
+        self.logger.info(f"Inserted {record_count} records from {staging_table} in batches of {batch_size}")
+        return record_count
+    
+    def stage_dataframe(self, df: pd.DataFrame, table_name: str, batch_size: int = 100000) -> int:
+        """
+        Ładowanie DataFrame do tabeli staging metodą masową
+        
+        Gdy kolumny DataFrame odpowiadają kolumnom tabeli, dane idą przez plik CSV
+        i BULK INSERT (katalog tymczasowy musi być widoczny dla serwera SQL).
+        W pozostałych przypadkach, albo gdy serwer nie widzi pliku, wiersze są
+        wysyłane tablicami parametrów (fast_executemany) w partiach batch_size.
+        
+        Args:
+            df: Dane do załadowania
+            table_name: Nazwa tabeli staging
+            batch_size: Liczba wierszy na partię
+            
+        Returns:
+            Liczba załadowanych wierszy
+        """
+        if df.empty:
+            return 0
+        
+        conn = self._get_conn()
+        cursor = self._cursor(conn)
+        columns = list(df.columns)
+        
+        if columns == self._get_table_columns(cursor, table_name):
+            path = None
+            try:
+                with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, newline='', encoding='utf-8') as handle:
+                    path = handle.name
+                    df.to_csv(handle, index=False)
+                
+                cursor.execute(f"""
+                    BULK INSERT {table_name}
+                    FROM '{path.replace("'", "''")}'
+                    WITH (FORMAT = 'CSV', FIRSTROW = 2, CODEPAGE = '65001', KEEPNULLS,
+                          TABLOCK, BATCHSIZE = {int(batch_size)})
+                """)
+                loaded_count = cursor.rowcount
+                conn.commit()
+                
+                self.logger.info(f"Bulk inserted {loaded_count} records into {table_name}")
+                return loaded_count
+            except pyodbc.Error as e:
+                conn.rollback()
+                self.logger.warning(f"BULK INSERT into {table_name} failed, using fast_executemany: {str(e)}")
+            finally:
+                if path and os.path.exists(path):
+                    os.remove(path)
+        
+        insert_sql = f"""
+            INSERT INTO {table_name} WITH (TABLOCK) ({', '.join(columns)})
+            VALUES ({', '.join('?' for _ in columns)})
+        """
+        
+        # NaN/NaT -> NULL, jedna konwersja dla całej ramki
+        rows = list(df.astype(object).where(pd.notna(df), None).itertuples(index=False, name=None))
+        
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(insert_sql, rows[start:start + batch_size])
+        conn.commit()
+        
+        self.logger.info(f"Inserted {len(rows)} records into {table_name} with fast_executemany")
+        return len(rows)
+    
     def _load_fact_data(self, conn):
         """
         Ładowanie danych faktów - zoptymalizowana wersja
@@ -745,17 +1044,10 @@ class WarehouseBuilder:
         Args:
             conn: Połączenie z bazą danych
         """
-        cursor = conn.cursor()
+        cursor = self._cursor(conn)
         
-        # Sprawdź czy tabela staging faktów istnieje i ma dane
-        cursor.execute("""
-            IF OBJECT_ID('staging_fact_energy_weather', 'U') IS NOT NULL
-                SELECT COUNT(*) FROM staging_fact_energy_weather
-            ELSE
-                SELECT 0
-        """)
-        
-        staging_count = cursor.fetchone()[0]
+        # Liczba wierszy staging z metadanych (0 dla nieistniejącej tabeli)
+        staging_count = self._fast_count(cursor, 'staging_fact_energy_weather')
         
         if staging_count > 0:
             self.logger.info(f"Loading {staging_count} records from staging_fact_energy_weather to fact_energy_weather")
@@ -773,13 +1065,7 @@ class WarehouseBuilder:
             ]
             
             # Wybierz tylko kolumny, które istnieją w tabeli staging
-            cursor.execute("""
-                SELECT COLUMN_NAME
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_NAME = 'staging_fact_energy_weather'
-            """)
-            
-            staging_columns = [row.COLUMN_NAME for row in cursor.fetchall()]
+            staging_columns = set(self._get_table_columns(cursor, 'staging_fact_energy_weather'))
             existing_columns = [col for col in fact_columns if col in staging_columns]
             
             # Dla kluczy obcych, zastąp NULL-e zerami (referencja do domyślnych rekordów)
@@ -793,101 +1079,224 @@ class WarehouseBuilder:
                 else:
                     select_columns.append(col)
             
-            # Zoptymalizowane wstawianie - użyj bulk insert z ograniczoną transakcją
-            # i zwiększoną wydajnością
-            
-            # Tymczasowo wyłącz ograniczenia kluczy obcych
-            self.logger.info("Temporarily disabling foreign key constraints")
-            cursor.execute("""
-                ALTER TABLE fact_energy_weather NOCHECK CONSTRAINT ALL
-            """)
-            conn.commit()
-            
-            # Użyj tabelarycznego podejścia do wstawiania dla lepszej wydajności
-            batch_size = 50000  # Zwiększony rozmiar wsadu
-            
-            self.logger.info(f"Starting optimized batch insert with batch size {batch_size}")
-            
-            # Pobierz całkowitą liczbę rekordów
-            cursor.execute("SELECT COUNT(*) FROM staging_fact_energy_weather")
-            total_records = cursor.fetchone()[0]
-            batch_count = (total_records + batch_size - 1) // batch_size
-            
-            for i in range(batch_count):
-                start_offset = i * batch_size
-                
-                self.logger.info(f"Processing batch {i+1}/{batch_count} (offset {start_offset})")
-                
-                # Wstaw partię danych
-                batch_insert_sql = f"""
-                INSERT INTO fact_energy_weather ({', '.join(existing_columns)})
-                SELECT TOP {batch_size} {', '.join(select_columns)}
-                FROM staging_fact_energy_weather
-                ORDER BY (SELECT NULL)
-                OFFSET {start_offset} ROWS
-                """
-                
-                cursor.execute(batch_insert_sql)
-                conn.commit()
-                
-                self.logger.info(f"Inserted batch {i+1}/{batch_count}")
+            if self._fast_count(cursor, 'fact_energy_weather') == 0:
+                # Pusta tabela faktów (pełna przebudowa) - ładowanie do tabeli roboczej
+                # i przełączenie jej danych operacją na metadanych
+                record_count = self._load_fact_via_switch(cursor, existing_columns, select_columns)
+            else:
+                # Indeksy kluczy obcych budowane od nowa po załadowaniu
+                self._drop_fact_indexes(cursor)
+                record_count = self._bulk_insert_fact(
+                    cursor, 'fact_energy_weather', existing_columns, select_columns
+                )
+                self._create_fact_indexes(cursor)
             
-            # Włącz ponownie ograniczenia kluczy obcych
-            self.logger.info("Re-enabling foreign key constraints")
-            cursor.execute("""
-                ALTER TABLE fact_energy_weather WITH CHECK CHECK CONSTRAINT ALL
-            """)
+            # Jeden commit dla całego ładowania faktów
             conn.commit()
             
-            # Sprawdź liczbę wstawionych rekordów
-            cursor.execute("SELECT COUNT(*) FROM fact_energy_weather")
-            record_count = cursor.fetchone()[0]
-            
+            self._count_loaded('fact_energy_weather', record_count)
             self.logger.info(f"Successfully loaded {record_count} records to fact_energy_weather")
         else:
             self.logger.warning("No data in staging_fact_energy_weather, skipping fact table")
+            self._create_fact_indexes(cursor)
+            conn.commit()
     
-    def run_full_rebuild(self) -> bool:
+    def _bulk_insert_fact(self, cursor, table_name: str, existing_columns: List[str],
+                          select_columns: List[str]) -> int:
         """
-        Przeprowadzenie pełnej przebudowy hurtowni
+        Jedno INSERT ... SELECT ze staging faktów z wyłączonymi kluczami obcymi
+        
+        Staging jest czytany raz, zamiast ponownego skanowania pomijanych wierszy
+        w każdej partii OFFSET; klucze obce są potem sprawdzane jednym przebiegiem.
         
+        Args:
+            cursor: Kursor bazy danych
+            table_name: Tabela docelowa o strukturze fact_energy_weather
+            existing_columns: Kolumny docelowe
+            select_columns: Wyrażenia SELECT odpowiadające kolumnom docelowym
+            
         Returns:
-            True jeśli sukces, False w przeciwnym razie
+            Liczba wstawionych wierszy
         """
-        self.logger.info("Starting full warehouse rebuild")
+        # Tymczasowo wyłącz ograniczenia kluczy obcych
+        self.logger.info(f"Temporarily disabling foreign key constraints on {table_name}")
+        cursor.execute(f"ALTER TABLE {table_name} NOCHECK CONSTRAINT ALL")
         
-        # 1. Usunięcie istniejących tabel
-        if not self.drop_tables():
-            self.logger.error("Failed to drop existing tables")
-            return False
+        insert_sql = f"""
+            INSERT INTO {table_name} WITH (TABLOCK) ({', '.join(existing_columns)})
+            SELECT {', '.join(select_columns)}
+            FROM staging_fact_energy_weather
+        """
         
-        # 2. Utworzenie tabel wymiarowych
-        if not self.create_dimension_tables():
-            self.logger.error("Failed to create dimension tables")
-            return False
+        key_column = self._get_identity_column(cursor, 'staging_fact_energy_weather')
+        if self.load_batch_size and key_column:
+            # Partie po kluczu IDENTITY staging (fact_id) - wyszukanie zakresu zamiast
+            # OFFSET; bez commitów, całe ładowanie faktów to jedna transakcja
+            self.logger.info(f"Starting keyset-batched insert into {table_name}")
+            record_count = self._insert_keyset_batches(
+                cursor, 'staging_fact_energy_weather', key_column, insert_sql, self.load_batch_size
+            )
+        else:
+            self.logger.info(f"Starting single-pass bulk insert into {table_name}")
+            cursor.execute(f"{insert_sql} OPTION (MAXDOP 0)")
+            record_count = cursor.rowcount
         
-        # 3. Wstawienie domyślnych rekordów wymiarowych
-        if not self.insert_default_dimension_records():
-            self.logger.error("Failed to insert default dimension records")
-            return False
+        # Włącz ponownie ograniczenia kluczy obcych (zaufane - wymagane też przy SWITCH)
+        self.logger.info(f"Re-enabling foreign key constraints on {table_name}")
+        cursor.execute(f"ALTER TABLE {table_name} WITH CHECK CHECK CONSTRAINT ALL")
         
-        # 4. Utworzenie tabel źródłowych
-        if not self.create_source_tables():
-            self.logger.error("Failed to create source tables")
-            return False
+        return record_count
+    
+    def _load_fact_via_switch(self, cursor, existing_columns: List[str], select_columns: List[str]) -> int:
+        """
+        Ładowanie faktów do tabeli roboczej i ALTER TABLE ... SWITCH do pustej tabeli faktów
         
-        # 5. Utworzenie tabeli faktów
-        if not self.create_fact_table():
-            self.logger.error("Failed to create fact table")
-            return False
+        Tabela robocza ma tę samą definicję, indeksy i zaufane klucze obce, więc
+        przełączenie jest operacją na metadanych niezależną od liczby wierszy.
         
-        # 6. Załadowanie danych z tabel staging
-        if not self.load_data_from_staging():
-            self.logger.error("Failed to load data from staging")
-            return False
+        Args:
+            cursor: Kursor bazy danych
+            existing_columns: Kolumny docelowe
+            select_columns: Wyrażenia SELECT odpowiadające kolumnom docelowym
+            
+        Returns:
+            Liczba załadowanych wierszy
+        """
+        work_table = FACT_LOAD_TABLE
+        
+        # Ta sama definicja co fact_energy_weather, z własnymi nazwami ograniczeń
+        work_ddl = (
+            FACT_TABLE_DDL['fact_energy_weather']
+            .replace('CREATE TABLE fact_energy_weather', f'CREATE TABLE {work_table}')
+            .replace('CONSTRAINT PK_fact ', 'CONSTRAINT PK_fact_load ')
+            .replace('CONSTRAINT FK_fact_', 'CONSTRAINT FK_fact_load_')
+        )
+        cursor.execute(f"DROP TABLE IF EXISTS {work_table};\n{work_ddl}")
+        
+        record_count = self._bulk_insert_fact(cursor, work_table, existing_columns, select_columns)
+        
+        # Indeksy muszą być identyczne po obu stronach przełączenia
+        self._create_fact_indexes(cursor, work_table)
+        self._create_fact_indexes(cursor)
+        
+        cursor.execute(f"""
+            ALTER TABLE {work_table} SWITCH TO fact_energy_weather;
+            DROP TABLE {work_table};
+            DBCC CHECKIDENT ('fact_energy_weather') WITH NO_INFOMSGS;
+        """)
+        self.logger.info(f"Switched {record_count} records from {work_table} into fact_energy_weather")
+        
+        return record_count
+    
+    def _fast_count(self, cursor, table_name: str) -> int:
+        """
+        Liczba wierszy tabeli z sys.partitions - bez skanowania tabeli
+        
+        Nazwa tabeli idzie jako parametr, więc plan zapytania jest wspólny dla
+        wszystkich tabel.
+        
+        Args:
+            cursor: Kursor bazy danych
+            table_name: Nazwa tabeli
+            
+        Returns:
+            Liczba wierszy (0 jeśli tabela nie istnieje)
+        """
+        cursor.execute("""
+            SELECT ISNULL(SUM(rows), 0)
+            FROM sys.partitions
+            WHERE object_id = OBJECT_ID(?, 'U')
+            AND index_id IN (0, 1)
+        """, table_name)
+        return cursor.fetchone()[0]
+    
+    def _count_loaded(self, table_name: str, row_count: int):
+        """
+        Dopisanie liczby załadowanych wierszy do licznika tabeli
+        
+        Args:
+            table_name: Nazwa tabeli
+            row_count: Liczba wierszy z cursor.rowcount
+        """
+        self._table_counts[table_name] = self._table_counts.get(table_name, 0) + max(row_count, 0)
+    
+    def _drop_fact_indexes(self, cursor, table_name: str = 'fact_energy_weather'):
+        """
+        Usunięcie indeksów kluczy obcych tabeli faktów przed ładowaniem
+        
+        Args:
+            cursor: Kursor bazy danych
+            table_name: Tabela o strukturze fact_energy_weather
+        """
+        cursor.execute(";\n".join(
+            f"DROP INDEX IF EXISTS {name} ON {table_name}" for name, _, _ in FACT_INDEXES
+        ))
+    
+    def _create_fact_indexes(self, cursor, table_name: str = 'fact_energy_weather'):
+        """
+        Utworzenie indeksów kluczy obcych tabeli faktów (jedno sortowanie na indeks)
+        
+        Args:
+            cursor: Kursor bazy danych
+            table_name: Tabela o strukturze fact_energy_weather
+        """
+        statements = []
+        for name, column, include in FACT_INDEXES:
+            include_clause = f" INCLUDE ({', '.join(include)})" if include else ""
+            statements.append(
+                f"IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{name}' "
+                f"AND object_id = OBJECT_ID('{table_name}')) "
+                f"CREATE NONCLUSTERED INDEX {name} ON {table_name} ({column}){include_clause} "
+                f"WITH (SORT_IN_TEMPDB = ON, MAXDOP = 0)"
+            )
+        
+        cursor.execute(";\n".join(statements))
+        self.logger.info(f"Created {len(statements)} foreign key indexes on {table_name}")
+    
+    def run_full_rebuild(self) -> bool:
+        """
+        Przeprowadzenie pełnej przebudowy hurtowni
+        
+        Returns:
+            True jeśli sukces, False w przeciwnym razie
+        """
+        self.logger.info("Starting full warehouse rebuild")
         
-        self.logger.info("Warehouse rebuild completed successfully")
-        return True
+        try:
+            # 1. Usunięcie istniejących tabel
+            if not self.drop_tables():
+                self.logger.error("Failed to drop existing tables")
+                return False
+            
+            # 2. Utworzenie tabel wymiarowych
+            if not self.create_dimension_tables():
+                self.logger.error("Failed to create dimension tables")
+                return False
+            
+            # 3. Wstawienie domyślnych rekordów wymiarowych
+            if not self.insert_default_dimension_records():
+                self.logger.error("Failed to insert default dimension records")
+                return False
+            
+            # 4. Utworzenie tabel źródłowych
+            if not self.create_source_tables():
+                self.logger.error("Failed to create source tables")
+                return False
+            
+            # 5. Utworzenie tabeli faktów
+            if not self.create_fact_table():
+                self.logger.error("Failed to create fact table")
+                return False
+            
+            # 6. Załadowanie danych z tabel staging
+            if not self.load_data_from_staging():
+                self.logger.error("Failed to load data from staging")
+                return False
+            
+            self.logger.info("Warehouse rebuild completed successfully")
+            return True
+        finally:
+            self.close()
 
 def main():
     """Główna funkcja wywoływana z konsoli"""
@@ -451,37 +451,40 @@ class DimensionProcessor:
         
         self.logger.info(f"Created staging table: {table_name}")
     
-    def _bulk_insert_dimension_data(self, conn, table_name: str, df: pd.DataFrame):
-        """Bulk insert danych wymiaru"""
+    def _bulk_insert_dimension_data(self, conn, table_name: str, df: pd.DataFrame, batch_size: int = 10000):
+        """Bulk insert danych wymiaru - tablice parametrów (fast_executemany) w partiach"""
+        if df.empty:
+            return
+        
         cursor = conn.cursor()
+        cursor.fast_executemany = True
         
         columns = list(df.columns)
+        placeholders = ', '.join(['?' for _ in columns])
+        insert_sql = f"""
+            INSERT INTO {table_name} 
+            ({', '.join(columns)}) 
+            VALUES ({placeholders})
+        """
         
-        for _, row in df.iterrows():
-            values = []
-            for col in columns:
-                value = row[col]
-                if pd.isna(value):
-                    values.append(None)
-                elif isinstance(value, (date, datetime)):
-                    # Konwersja dat na stringi w formacie ISO, które SQL Server może zrozumieć
-                    values.append(value.isoformat())
-                else:
-                    values.append(value)
-            
-            placeholders = ', '.join(['?' for _ in values])
-            insert_sql = f"""
-                INSERT INTO {table_name} 
-                ({', '.join(columns)}) 
-                VALUES ({placeholders})
-            """
-            
+        # Konwersja raz dla całej ramki: daty na stringi ISO, które SQL Server
+        # może zrozumieć, NaN/NaT -> None
+        data = df.astype(object)
+        for col in columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                data[col] = df[col].dt.strftime('%Y-%m-%dT%H:%M:%S')
+            elif df[col].dtype == object:
+                data[col] = df[col].map(lambda value: value.isoformat() if isinstance(value, (date, datetime)) else value)
+        rows = list(data.where(df.notna(), None).itertuples(index=False, name=None))
+        
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
             try:
-                cursor.execute(insert_sql, values)
+                cursor.executemany(insert_sql, batch)
             except Exception as e:
-                self.logger.error(f"Error inserting row into {table_name}: {str(e)}")
+                self.logger.error(f"Error inserting rows {start}-{start + len(batch) - 1} into {table_name}: {str(e)}")
                 self.logger.error(f"SQL: {insert_sql}")
-                self.logger.error(f"Values: {values}")
+                self.logger.error(f"First values: {batch[0]}")
                 raise
     
     def update_dimensions_with_scd2(self) -> bool: